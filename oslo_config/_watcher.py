@@ -0,0 +1,336 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Watching config files for ConfigOpts.start_file_watcher()."""
+
+import errno
+import logging
+import os
+import struct
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING
+
+# Avoid circular import
+import oslo_config.cfg
+
+if TYPE_CHECKING:
+    from oslo_config import cfg
+
+LOG = logging.getLogger(__name__)
+
+
+class Inotify:
+    """A minimal ctypes binding of the Linux inotify API.
+
+    Watches directories for changes to given entries, and files for
+    changes to their content. Raises OSError if inotify is unavailable.
+    """
+
+    _IN_MODIFY = 0x2
+    _IN_ATTRIB = 0x4
+    _IN_CLOSE_WRITE = 0x8
+    _IN_MOVED_FROM = 0x40
+    _IN_MOVED_TO = 0x80
+    _IN_CREATE = 0x100
+    _IN_DELETE = 0x200
+    _IN_DELETE_SELF = 0x400
+    _IN_MOVE_SELF = 0x800
+    _IN_Q_OVERFLOW = 0x4000
+    _IN_IGNORED = 0x8000
+    _IN_NONBLOCK = os.O_NONBLOCK
+    _IN_CLOEXEC = 0o2000000
+
+    _SELF_MASK = _IN_DELETE_SELF | _IN_MOVE_SELF
+    _FILE_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _SELF_MASK
+    _DIR_MASK = (
+        _IN_ATTRIB
+        | _IN_CLOSE_WRITE
+        | _IN_MOVED_FROM
+        | _IN_MOVED_TO
+        | _IN_CREATE
+        | _IN_DELETE
+        | _SELF_MASK
+    )
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, 'inotify is only available on Linux')
+        import ctypes
+        import ctypes.util
+
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            self._add_watch = libc.inotify_add_watch
+        except (OSError, AttributeError) as e:
+            raise OSError(errno.ENOSYS, f'inotify is unavailable: {e}')
+        self._add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        self._get_errno = ctypes.get_errno
+        self.fd = libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        # watch descriptor -> the entry names which matter, or None for
+        # any entry, for directories; True for files.
+        self._watches: dict[int, set[str] | None | bool] = {}
+
+    def watch(self, path: str, names: set[str] | None = None) -> None:
+        """Watch a file, or the given entries or all entries of a dir."""
+        is_dir = os.path.isdir(path)
+        mask = self._DIR_MASK if is_dir else self._FILE_MASK
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            # NOTE: Missing paths are only picked up by stat polling.
+            return
+        if not is_dir:
+            self._watches[wd] = True
+        elif wd in self._watches:
+            current = self._watches[wd]
+            if current is None or names is None:
+                self._watches[wd] = None
+            elif isinstance(current, set):
+                current.update(names)
+        else:
+            self._watches[wd] = None if names is None else set(names)
+
+    def read(self) -> bool:
+        """Read pending events, returning whether any of them matter."""
+        changed = False
+        while True:
+            try:
+                buf = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _cookie, length = struct.unpack_from(
+                    'iIII', buf, offset
+                )
+                offset += 16
+                name = os.fsdecode(buf[offset : offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & (self._IN_Q_OVERFLOW | self._IN_IGNORED):
+                    changed = True
+                    continue
+                names = self._watches.get(wd)
+                if names is True or mask & self._SELF_MASK:
+                    changed = True
+                elif names is None:
+                    changed = changed or (
+                        name.endswith('.conf') and not name.startswith('.')
+                    )
+                elif names:
+                    changed = changed or name in names
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class ConfigFileWatcher:
+    """Runs mutate_config_files once per burst of config file changes.
+
+    The config files and config dirs of a ConfigOpts are watched from a
+    daemon thread, with inotify where available and otherwise by comparing
+    stat results every interval. A reload happens once no further change
+    has been seen for the debounce delay. The watched paths are determined
+    when the watcher starts and after every reload.
+    """
+
+    def __init__(
+        self,
+        conf: 'cfg.ConfigOpts',
+        debounce: float,
+        interval: float,
+        use_inotify: bool,
+    ) -> None:
+        if debounce < 0:
+            raise ValueError('debounce must not be negative')
+        if interval <= 0:
+            raise ValueError('interval must be positive')
+        self._conf = conf
+        self._debounce = debounce
+        self._interval = interval
+        self._use_inotify = use_inotify
+        self._inotify: Inotify | None = None
+        self._snapshot: dict[str, tuple[int, ...] | None] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Guards the wake pipe, which the thread closes when it exits.
+        self._lock = threading.Lock()
+        self._wake_r, self._wake_w = -1, -1
+        self.backend = 'poll'
+        self.reloads = 0
+        self.failures = 0
+        self.last_duration = 0.0
+        self.total_duration = 0.0
+
+    def _paths(self) -> tuple[list[str], list[str]]:
+        """Return the config files and config dirs to watch."""
+        conf = self._conf
+        if conf._namespace is None:
+            return [], []
+        files = [oslo_config.cfg._fixpath(f) for f in conf.config_file or []]
+        dirs = [
+            oslo_config.cfg._fixpath(d)
+            for d in conf.config_dirs or conf.default_config_dirs
+        ]
+        return files, dirs
+
+    def _take_snapshot(self) -> dict[str, tuple[int, ...] | None]:
+        files, dirs = self._paths()
+        for d in dirs:
+            files.extend(oslo_config.cfg._list_config_dir(d) or [])
+        snapshot: dict[str, tuple[int, ...] | None] = {}
+        for path in files + dirs:
+            try:
+                st = os.stat(path)
+            except OSError:
+                snapshot[path] = None
+            else:
+                snapshot[path] = (
+                    st.st_mtime_ns,
+                    st.st_size,
+                    st.st_ino,
+                    st.st_dev,
+                )
+        return snapshot
+
+    def _setup_inotify(self) -> None:
+        inotify = Inotify()
+        files, dirs = self._paths()
+        for path in files:
+            inotify.watch(path)
+            parent, name = os.path.split(path)
+            inotify.watch(parent, {name})
+        for d in dirs:
+            inotify.watch(d)
+        if self._inotify is not None:
+            self._inotify.close()
+        self._inotify = inotify
+
+    def _refresh(self) -> None:
+        """Determine the watched paths again and take their state."""
+        if self._inotify is not None:
+            try:
+                self._setup_inotify()
+            except OSError:
+                LOG.exception('Failed to watch config files with inotify')
+        self._snapshot = self._take_snapshot()
+
+    def _wait(self, timeout: float) -> bool:
+        """Wait for up to timeout, returning whether anything changed."""
+        import select
+
+        if self._inotify is None:
+            if self._stop.wait(timeout):
+                return False
+            snapshot = self._take_snapshot()
+            changed = snapshot != self._snapshot
+            self._snapshot = snapshot
+            return changed
+
+        ready, _, _ = select.select(
+            [self._inotify.fd, self._wake_r], [], [], timeout
+        )
+        return self._inotify.fd in ready and self._inotify.read()
+
+    def _reload(self) -> None:
+        self._refresh()
+        start = time.monotonic()
+        try:
+            self._conf.mutate_config_files()
+        except Exception:
+            self.failures += 1
+            LOG.exception('Failed to reload config files')
+        else:
+            self.reloads += 1
+        self.last_duration = time.monotonic() - start
+        self.total_duration += self.last_duration
+
+    def _run(self) -> None:
+        try:
+            self._watch()
+        finally:
+            self._close()
+
+    def _watch(self) -> None:
+        last_change: float | None = None
+        while not self._stop.is_set():
+            timeout = self._interval
+            if last_change is not None:
+                timeout = max(
+                    0.0, last_change + self._debounce - time.monotonic()
+                )
+            if self._wait(timeout):
+                last_change = time.monotonic()
+            elif last_change is not None and not self._stop.is_set():
+                if time.monotonic() - last_change >= self._debounce:
+                    last_change = None
+                    self._reload()
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+            for fd in (self._wake_r, self._wake_w):
+                if fd >= 0:
+                    os.close(fd)
+            self._wake_r, self._wake_w = -1, -1
+
+    def start(self) -> None:
+        self._inotify = None
+        self.backend = 'poll'
+        if self._use_inotify:
+            try:
+                self._setup_inotify()
+            except OSError as e:
+                LOG.debug('Polling config files, inotify unavailable: %s', e)
+            else:
+                self.backend = 'inotify'
+                self._wake_r, self._wake_w = os.pipe()
+        self._snapshot = self._take_snapshot()
+        self._thread = threading.Thread(
+            target=self._run, name='oslo.config-file-watcher', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop watching, waiting up to timeout for the thread to exit.
+
+        The thread releases the inotify and wake pipe descriptors when it
+        exits, so they are released even if it outlives the timeout.
+        """
+        self._stop.set()
+        with self._lock:
+            if self._wake_w >= 0:
+                os.write(self._wake_w, b'\0')
+        thread = self._thread
+        if thread is None:
+            self._close()
+        elif thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def info(self) -> 'cfg.FileWatcherInfo':
+        return oslo_config.cfg.FileWatcherInfo(
+            self._thread is not None and self._thread.is_alive(),
+            self.backend,
+            self.reloads,
+            self.failures,
+            self.last_duration,
+            self.total_duration,
+        )
@@ -16,19 +16,28 @@
 
 import argparse
 import collections
-from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from collections.abc import (
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Sequence,
+)
 import copy
 import enum
 import errno
+import fnmatch
 import functools
-import glob
-import inspect
 import itertools
 import logging
 import os
-import pickle
+import stat
 import string
 import sys
+import threading
+import time
+import weakref
 from typing import IO, Any, Protocol, TypedDict, cast
 
 # NOTE(bnemec): oslo.log depends on oslo.config, so we can't
@@ -39,6 +48,7 @@ try:
 except ImportError:
     oslo_log = None  # type: ignore[assignment]
 
+from oslo_config import _watcher
 from oslo_config import iniparser
 from oslo_config import sources
 
@@ -46,8 +56,6 @@ from oslo_config import sources
 import oslo_config.sources._environment as _environment
 from oslo_config import types
 
-import stevedore
-
 LOG = logging.getLogger(__name__)
 
 _CONFIG_OPTS_STATE_VERSION = 1
@@ -92,6 +100,30 @@ class Locations(enum.Enum):
 
 LocationInfo = collections.namedtuple('LocationInfo', ['location', 'detail'])
 
+ConversionCacheInfo = collections.namedtuple(
+    'ConversionCacheInfo', ['hits', 'misses', 'maxsize', 'currsize']
+)
+
+MutateHookResult = collections.namedtuple(
+    'MutateHookResult', ['hook', 'duration', 'exception', 'timed_out']
+)
+
+MutateReport = collections.namedtuple(
+    'MutateReport', ['changed', 'duration', 'hooks']
+)
+
+FileWatcherInfo = collections.namedtuple(
+    'FileWatcherInfo',
+    [
+        'running',
+        'backend',
+        'reloads',
+        'failures',
+        'last_duration',
+        'total_duration',
+    ],
+)
+
 
 class Error(Exception):
     """Base class for cfg exceptions."""
@@ -274,9 +306,21 @@ def _get_config_dirs(project: str | None = None) -> list[str]:
       ~/
       /etc/
     """
-    snap = os.environ.get('SNAP')
-    snap_c = os.environ.get('SNAP_COMMON')
+    return list(
+        _config_dirs(
+            project,
+            os.environ.get('HOME'),
+            os.environ.get('SNAP'),
+            os.environ.get('SNAP_COMMON'),
+        )
+    )
+
 
+@functools.lru_cache(maxsize=32)
+def _config_dirs(
+    project: str | None, home: str | None, snap: str | None, snap_c: str | None
+) -> tuple[str, ...]:
+    """Return the directories for _get_config_dirs, given the environment."""
     cfg_dirs: list[str | None] = [
         _fixpath(os.path.join('~', '.' + project)) if project else None,
         _fixpath('~'),
@@ -285,11 +329,156 @@ def _get_config_dirs(project: str | None = None) -> list[str]:
         os.path.join(snap_c, "etc", project) if snap_c and project else None,
         os.path.join(snap, "etc", project) if snap and project else None,
     ]
-    return [x for x in cfg_dirs if x]
+    return tuple(x for x in cfg_dirs if x)
+
+
+class _DirListing:
+    """The entries of a directory, as listed when it had a given mtime."""
+
+    __slots__ = ('mtime_ns', 'names', 'symlinks', 'config_names')
+
+    def __init__(
+        self, mtime_ns: int, names: frozenset[str], symlinks: frozenset[str]
+    ) -> None:
+        self.mtime_ns = mtime_ns
+        self.names = names
+        self.symlinks = symlinks
+        # The *.conf files, as glob would match them.
+        self.config_names = sorted(
+            name
+            for name in fnmatch.filter(names, '*.conf')
+            if not name.startswith('.')
+        )
+
+    def exists(self, directory: str, name: str) -> bool:
+        """Check whether the entry called name exists."""
+        if name not in self.names:
+            return False
+        # NOTE: The target of a symlink may come and go without the
+        # directory changing, so symlinks are always checked.
+        return name not in self.symlinks or os.path.exists(
+            os.path.join(directory, name)
+        )
+
+    def config_files(self, directory: str) -> list[str]:
+        """Return the sorted paths of the *.conf files."""
+        return [os.path.join(directory, name) for name in self.config_names]
+
+
+_EMPTY_DIR_LISTING = _DirListing(0, frozenset(), frozenset())
+
+# Directory listings, keyed by absolute path. Listings of directories
+# modified in the last _DIR_LISTING_RACY_NS are not cached, since files
+# could still be added to them without their mtime changing.
+_dir_listings: dict[str, _DirListing] = {}
+_DIR_LISTING_RACY_NS = 2 * 10**9
+
+
+def _stat_dir(directory: str) -> os.stat_result | None:
+    """Stat a directory, returning None if the path does not exist."""
+    try:
+        return os.stat(directory)
+    except (OSError, ValueError):
+        return None
+
+
+def _get_dir_listing(
+    directory: str, st: os.stat_result, scan_recent: bool = True
+) -> _DirListing | None:
+    """List a directory, reusing the last listing if it is unmodified.
+
+    :param directory: the path of the directory
+    :param st: the stat result of the directory
+    :param scan_recent: whether to list a directory modified too recently
+        for its listing to be cached, rather than returning None
+    :returns: the listing, empty if the path is not a directory, or None if
+        the directory cannot be listed, as may be the case for a directory
+        whose entries can be accessed but not read
+    """
+    if not stat.S_ISDIR(st.st_mode):
+        return _EMPTY_DIR_LISTING
+
+    key = directory if os.path.isabs(directory) else os.path.abspath(directory)
+    listing = _dir_listings.get(key)
+    if listing is not None and listing.mtime_ns == st.st_mtime_ns:
+        return listing
+
+    cacheable = time.time_ns() - st.st_mtime_ns > _DIR_LISTING_RACY_NS
+    if not cacheable and not scan_recent:
+        return None
+    names = set()
+    symlinks = set()
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                names.add(entry.name)
+                if entry.is_symlink():
+                    symlinks.add(entry.name)
+    except OSError:
+        return None
+    listing = _DirListing(
+        st.st_mtime_ns, frozenset(names), frozenset(symlinks)
+    )
+    if cacheable:
+        _dir_listings[key] = listing
+    else:
+        _dir_listings.pop(key, None)
+    return listing
+
+
+def _dir_has_entry(directory: str, name: str) -> bool:
+    """Check whether a directory has an existing entry called name."""
+    st = _stat_dir(directory)
+    if st is None:
+        return False
+    # NOTE: Looking up a single name does not warrant listing a directory
+    # whose listing cannot be cached yet. A directory that cannot be listed
+    # may still give access to the entry, so it is checked directly.
+    listing = _get_dir_listing(directory, st, scan_recent=False)
+    if listing is None:
+        return os.path.exists(os.path.join(directory, name))
+    return listing.exists(directory, name)
+
+
+def _list_config_dir(config_dir: str) -> list[str] | None:
+    """Return the sorted paths of the *.conf files in a directory.
+
+    :param config_dir: the path of the directory
+    :returns: the paths, or None if the directory does not exist
+    """
+    st = _stat_dir(config_dir)
+    if st is None:
+        return None
+    listing = _get_dir_listing(config_dir, st)
+    if listing is None:
+        # NOTE: Like glob, find no files in a directory that cannot be read.
+        return []
+    return listing.config_files(config_dir)
+
+
+def invalidate_dir_cache(directory: str | None = None) -> None:
+    """Forget cached directory listings.
+
+    Config directories and the directories searched for config files are
+    listed once and the listings are reused for as long as the mtime of
+    the directories is unchanged. This forgets the listing of a given
+    directory, or of all directories, for the rare case where a directory
+    is changed without its mtime changing, for example by a tool which
+    restores mtimes.
+
+    :param directory: the path of the directory, or None for all
+        directories
+
+    .. versionadded:: 10.4.0
+    """
+    if directory is None:
+        _dir_listings.clear()
+    else:
+        _dir_listings.pop(os.path.abspath(directory), None)
 
 
 def _search_dirs(
-    dirs: list[str], basename: str, extension: str = ""
+    dirs: Sequence[str], basename: str, extension: str = ""
 ) -> str | None:
     """Search a list of directories for a given filename or directory name.
 
@@ -301,10 +490,20 @@ def _search_dirs(
     :param extension: the file extension, for example '.conf'
     :returns: the path to a matching file or directory, or None
     """
+    name = f'{basename}{extension}'
+    # NOTE: Names which are not a single directory entry, such as
+    # 'subdir/policy.json', are looked up directly.
+    if name in ('', os.curdir, os.pardir) or any(
+        sep in name for sep in (os.sep, os.altsep) if sep
+    ):
+        for d in dirs:
+            path = os.path.join(d, name)
+            if os.path.exists(path):
+                return path
+        return None
     for d in dirs:
-        path = os.path.join(d, f'{basename}{extension}')
-        if os.path.exists(path):
-            return path
+        if _dir_has_entry(d, name):
+            return os.path.join(d, name)
     return None
 
 
@@ -406,7 +605,8 @@ def _is_opt_registered(opts: 'dict[str, _OptInfo]', opt: 'Opt') -> bool:
     :raises: DuplicateOptError if a naming conflict is detected
     """
     if opt.dest in opts:
-        if opts[opt.dest]['opt'] != opt:
+        registered = opts[opt.dest]['opt']
+        if registered is not opt and registered != opt:
             raise DuplicateOptError(opt.name)
         return True
     else:
@@ -424,20 +624,161 @@ def _get_caller_detail(n: int = 2) -> str | None:
     """
     if not _show_caller_details:
         return None
-    s = inspect.stack()[: n + 1]
+    # NOTE: Only the code object of the frame is needed, so look it up
+    # directly instead of building inspect.stack(), which resolves every
+    # frame of the stack and reads source lines for each of them.
     try:
-        frame = s[n]
-        try:
-            return frame[1]
-            # WARNING(dhellmann): Using frame.lineno to include the
-            # line number in the return value causes some sort of
-            # memory or stack corruption that manifests in values not
-            # being cleaned up in the cfgfilter tests.
-            # return '%s:%s' % (frame[1], frame[2])
-        finally:
-            del frame
-    finally:
-        del s
+        return sys._getframe(n).f_code.co_filename
+    except ValueError:
+        # The stack is not that deep.
+        return None
+
+
+class _TemplateRef(
+    collections.namedtuple('_TemplateRef', ['key', 'group', 'name', 'text'])
+):
+    """A ``$name`` or ``${group.name}`` reference found in a template.
+
+    ``key`` is the full reference, ``group`` and ``name`` are the result of
+    splitting it on the first dot (``group`` is None for undotted keys) and
+    ``text`` is the original template text, kept for unresolved references.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_key(cls, key: str, text: str = '') -> '_TemplateRef':
+        group, sep, name = key.partition('.')
+        if not sep:
+            return cls(key, None, key, text)
+        return cls(key, group, name, text)
+
+
+class _UnresolvedReference(Exception):
+    """Raised when a template refers to an opt not resolved yet.
+
+    This is internal control flow for :meth:`ConfigOpts._resolve`, which
+    catches it, resolves the referenced opt and then retries.
+    """
+
+    def __init__(
+        self,
+        key: tuple[str | None, str],
+        name: str,
+        group: 'str | OptGroup | None',
+    ) -> None:
+        self.key = key
+        self.name = name
+        self.group = group
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_template(
+    template_cls: type[string.Template], value: str
+) -> 'str | tuple[str | _TemplateRef, ...]':
+    """Parse a template string into literal text and references.
+
+    Returns the fully unescaped string if the value contains no references,
+    otherwise a tuple of literal strings and :class:`_TemplateRef` items
+    which matches what ``template_cls(value).safe_substitute()`` would do.
+    """
+    # Treat a backslash followed by the dollar sign "\$" the same as the
+    # string template escape "$$" as it is a bit more natural for users
+    value = value.replace(r'\$', '$$')
+
+    parts: list[str | _TemplateRef] = []
+    literal: list[str] = []
+    pos = 0
+    for mo in template_cls.pattern.finditer(value):
+        literal.append(value[pos : mo.start()])
+        pos = mo.end()
+        named = mo.group('named') or mo.group('braced')
+        if named is not None:
+            if literal:
+                parts.append(''.join(literal))
+                literal = []
+            parts.append(_TemplateRef.from_key(named, mo.group()))
+        elif mo.group('escaped') is not None:
+            literal.append(template_cls.delimiter)
+        else:
+            literal.append(mo.group())
+    literal.append(value[pos:])
+
+    if not parts:
+        return ''.join(literal)
+    parts.append(''.join(literal))
+    return tuple(p for p in parts if p != '')
+
+
+class _ConversionCache:
+    """A bounded LRU memo of type conversions keyed by raw string value.
+
+    Entries are keyed by the identity of the type object and the raw value.
+    Each entry keeps a reference to its type so the identity cannot be
+    reused while the entry exists. Lists and dicts are copied on the way
+    out so callers cannot modify the memoized value.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize <= 0:
+            raise ValueError('maxsize must be a positive integer')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # (id(type), raw value) -> (type, converted value)
+        self._data: collections.OrderedDict[
+            tuple[int, str], tuple[Any, Any]
+        ] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def convert(self, type_: Callable[[Any], Any], value: Any) -> Any:
+        if not isinstance(value, str):
+            return type_(value)
+        key = (id(type_), value)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] is type_:
+                self._data.move_to_end(key)
+                self.hits += 1
+            else:
+                entry = None
+                self.misses += 1
+        if entry is None:
+            result = type_(value)
+            with self._lock:
+                self._data[key] = (type_, result)
+                if len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        else:
+            result = entry[1]
+        if isinstance(result, (list, dict)):
+            return self._copy(result)
+        return result
+
+    @classmethod
+    def _copy(cls, value: Any) -> Any:
+        # List and Dict only ever nest further lists and dicts around
+        # immutable items, so these are the only containers to copy.
+        if isinstance(value, list):
+            return [
+                cls._copy(v) if isinstance(v, (list, dict)) else v
+                for v in value
+            ]
+        if isinstance(value, dict):
+            return {
+                k: cls._copy(v) if isinstance(v, (list, dict)) else v
+                for k, v in value.items()
+            }
+        return value
+
+    def info(self) -> ConversionCacheInfo:
+        return ConversionCacheInfo(
+            self.hits, self.misses, self.maxsize, len(self._data)
+        )
+
+
+# Shared by every opt whose definition site is not being recorded.
+_OPT_DEFAULT_LOCATION = LocationInfo(Locations.opt_default, None)
 
 
 def set_defaults(opts: Sequence['Opt'], **kwargs: Any) -> None:
@@ -449,6 +790,57 @@ def set_defaults(opts: Sequence['Opt'], **kwargs: Any) -> None:
             )
 
 
+_defer_default_checks = bool(
+    os.environ.get('OSLO_CONFIG_DEFER_DEFAULT_CHECKS')
+)
+# Opts created while default checks were deferred and not checked since.
+_unchecked_defaults: 'weakref.WeakSet[Opt]' = weakref.WeakSet()
+
+
+def defer_default_checks(defer: bool = True) -> None:
+    """Defer checking the default values of options created from now on.
+
+    Opts normally check that their default is valid for their type when
+    they are created, which costs time while importing the modules that
+    declare them. Once deferred, these checks are instead made as a batch
+    by :func:`check_default_values`, which ConfigOpts calls when invoked
+    with ``validate_default_values=True``. Setting the
+    ``OSLO_CONFIG_DEFER_DEFAULT_CHECKS`` environment variable defers the
+    checks from the start.
+
+    :param defer: whether to defer the checks
+
+    .. versionadded:: 10.4.0
+    """
+    global _defer_default_checks
+    _defer_default_checks = defer
+
+
+def check_default_values(opts: Iterable['Opt']) -> None:
+    """Check the default values of opts against their types.
+
+    Every opt is checked before reporting, so that all the invalid
+    defaults are reported at once.
+
+    :param opts: the opts to check
+    :raises: DefaultValueError
+
+    .. versionadded:: 10.4.0
+    """
+    errors = []
+    for opt in opts:
+        try:
+            opt._check_default()
+        except DefaultValueError as e:
+            errors.append(f'{opt.name}: {e}')
+        else:
+            _unchecked_defaults.discard(opt)
+    if errors:
+        raise DefaultValueError(
+            'Invalid default values: ' + '; '.join(sorted(errors))
+        )
+
+
 def _normalize_group_name(group_name: str) -> str:
     if group_name == 'DEFAULT':
         return group_name
@@ -643,10 +1035,11 @@ class Opt:
             stack_depth = 2  # someone instantiated Opt directly
         else:
             stack_depth = 3  # skip the call to the child class constructor
-        self._set_location = LocationInfo(
-            Locations.opt_default,
-            _get_caller_detail(stack_depth),
-        )
+        detail = _get_caller_detail(stack_depth)
+        if detail is None:
+            self._set_location = _OPT_DEFAULT_LOCATION
+        else:
+            self._set_location = LocationInfo(Locations.opt_default, detail)
 
         self.deprecated_opts: list[DeprecatedOpt] = (
             list(copy.deepcopy(deprecated_opts)) if deprecated_opts else []
@@ -667,7 +1060,10 @@ class Opt:
                         group=deprecated_group,
                     )
                 )
-        self._check_default()
+        if _defer_default_checks:
+            _unchecked_defaults.add(self)
+        else:
+            self._check_default()
 
         self.mutable = mutable
         self.advanced = advanced
@@ -705,15 +1101,26 @@ class Opt:
 
         return v
 
+    def _equals(self, another: 'Opt') -> bool:
+        if self is another:
+            return True
+        # NOTE: Unless code locations are being recorded, opts usually
+        # have equal locations, in which case their instance variables can
+        # be compared without copying them to leave the location out.
+        mine, theirs = vars(self), vars(another)
+        if mine.get('_set_location') == theirs.get('_set_location'):
+            return mine == theirs
+        return self._vars_for_cmp() == another._vars_for_cmp()
+
     def __ne__(self, another: object) -> bool:
         if not isinstance(another, Opt):
             return NotImplemented
-        return self._vars_for_cmp() != another._vars_for_cmp()
+        return not self._equals(another)
 
     def __eq__(self, another: object) -> bool:
         if not isinstance(another, Opt):
             return NotImplemented
-        return self._vars_for_cmp() == another._vars_for_cmp()
+        return self._equals(another)
 
     __hash__ = object.__hash__
 
@@ -1236,10 +1643,15 @@ class ListOpt(Opt):
     :param name: the option's name
     :param item_type: type of items (see :class:`oslo_config.types`)
     :param bounds: if True the value should be inside "[" and "]" pair
+    :param strict: if True, only split items on commas which are neither
+                   quoted nor bracketed (see :class:`oslo_config.types.List`)
     :param \*\*kwargs: arbitrary keyword arguments passed to :class:`Opt`
 
     .. versionchanged:: 2.5
        Added *item_type* and *bounds* parameters.
+
+    .. versionchanged:: 10.4.0
+       Added *strict* parameter.
     """
 
     def __init__(
@@ -1247,11 +1659,14 @@ class ListOpt(Opt):
         name: str,
         item_type: types.ConfigType | None = None,
         bounds: bool | None = None,
+        strict: bool = False,
         **kwargs: Any,
     ) -> None:
         super().__init__(
             name,
-            type=types.List(item_type=item_type, bounds=bounds or False),
+            type=types.List(
+                item_type=item_type, bounds=bounds or False, strict=strict
+            ),
             **kwargs,
         )
 
@@ -1576,12 +1991,17 @@ class _ConfigFileOpt(Opt):
             """
             assert isinstance(values, str)
             assert isinstance(namespace, _Namespace)
-            if getattr(namespace, self.dest, None) is None:
-                setattr(namespace, self.dest, [])
-            items = getattr(namespace, self.dest)
-            items.append(values)
+            namespace._run_cli_action(self.load, self.dest, values)
+
+        @staticmethod
+        def load(namespace: '_Namespace', dest: str, config_file: str) -> None:
+            """Add config_file to the namespace and parse it."""
+            if getattr(namespace, dest, None) is None:
+                setattr(namespace, dest, [])
+            items = getattr(namespace, dest)
+            items.append(config_file)
 
-            ConfigParser._parse_file(values, namespace)
+            ConfigParser._parse_file(config_file, namespace)
 
     def __init__(self, name: str, **kwargs: Any) -> None:
         super().__init__(name, cast(types.ConfigType, _identity), **kwargs)
@@ -1633,17 +2053,21 @@ class _ConfigDirOpt(Opt):
             """
             assert isinstance(values, str)
             assert isinstance(namespace, _Namespace)
-            namespace._config_dirs.append(values)
-            setattr(namespace, self.dest, values)
+            namespace._run_cli_action(self.load, self.dest, values)
 
-            values = os.path.expanduser(values)
+        @staticmethod
+        def load(namespace: '_Namespace', dest: str, config_dir: str) -> None:
+            """Set config_dir on the namespace and parse the files in it."""
+            namespace._config_dirs.append(config_dir)
+            setattr(namespace, dest, config_dir)
 
-            if not os.path.exists(values):
-                raise ConfigDirNotFoundError(values)
+            values = os.path.expanduser(config_dir)
 
-            config_dir_glob = os.path.join(values, '*.conf')
+            config_files = _list_config_dir(values)
+            if config_files is None:
+                raise ConfigDirNotFoundError(values)
 
-            for config_file in sorted(glob.glob(config_dir_glob)):
+            for config_file in config_files:
                 ConfigParser._parse_file(config_file, namespace)
 
     def __init__(self, name: str, **kwargs: Any) -> None:
@@ -1658,19 +2082,85 @@ class _ConfigDirOpt(Opt):
         return kwargs
 
 
-class _OptInfoRequired(TypedDict):
-    """Required fields for option info dicts stored in _opts."""
+# Marks the fields of an _OptInfo that have not been set.
+_UNSET: Any = object()
 
-    opt: Opt
-    cli: bool
+_OPT_INFO_FIELDS = ('opt', 'cli', 'location', 'override', 'default')
 
 
-class _OptInfo(_OptInfoRequired, total=False):
-    """Full option info dict stored in _opts (opt and cli are required)."""
+class _OptInfo(MutableMapping[str, Any]):
+    """Option info record stored in _opts.
 
-    location: LocationInfo
-    override: Any
-    default: Any
+    opt and cli are always set; location, override and default only once
+    an override or default has been set. The record is a mapping of those
+    keys, like the dicts it replaces, while storing its fields in slots, as
+    one is kept for every registered option. Any other keys are kept in a
+    dict created when the first one is set. Internally the fields are read
+    as attributes, which hold _UNSET while they are not set.
+    """
+
+    __slots__ = _OPT_INFO_FIELDS + ('extra',)
+
+    def __init__(self, opt: Opt, cli: bool) -> None:
+        self.opt = opt
+        self.cli = cli
+        self.location: LocationInfo = _UNSET
+        self.override: Any = _UNSET
+        self.default: Any = _UNSET
+        self.extra: dict[str, Any] | None = None
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _OPT_INFO_FIELDS:
+            value = getattr(self, key)
+            if value is not _UNSET:
+                return value
+        elif self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _OPT_INFO_FIELDS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _OPT_INFO_FIELDS:
+            if getattr(self, key) is _UNSET:
+                raise KeyError(key)
+            setattr(self, key, _UNSET)
+        elif self.extra is not None:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in _OPT_INFO_FIELDS:
+            return getattr(self, key) is not _UNSET
+        return self.extra is not None and key in self.extra
+
+    def __iter__(self) -> Iterator[str]:
+        for key in _OPT_INFO_FIELDS:
+            if getattr(self, key) is not _UNSET:
+                yield key
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def __getstate__(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.location = self.override = self.default = _UNSET
+        self.extra = None
+        self.update(state)
 
 
 class _OptGroupState(TypedDict):
@@ -1773,7 +2263,7 @@ class OptGroup:
         if _is_opt_registered(self._opts, opt):
             return False
 
-        self._opts[opt.dest] = {'opt': opt, 'cli': cli}
+        self._opts[opt.dest] = _OptInfo(opt, cli)
 
         return True
 
@@ -1817,17 +2307,24 @@ class _CliOptEntry(TypedDict):
     group: OptGroup | None
 
 
+# A module to import, or an oslo.config.opts entry point whose opts are
+# registered, when a lazily registered group or opt is first looked up.
+_LazySource = collections.namedtuple(
+    '_LazySource', ['module_str', 'namespace']
+)
+
+
+def _raise_load_failure(manager: Any, ep: Any, exc: BaseException) -> None:
+    raise exc
+
+
 def _copy_opt_info(info: _OptInfo) -> _OptInfo:
-    copied: _OptInfo = {
-        'opt': info['opt'],
-        'cli': info['cli'],
-    }
-    if 'location' in info:
-        copied['location'] = info['location']
-    if 'override' in info:
-        copied['override'] = info['override']
-    if 'default' in info:
-        copied['default'] = info['default']
+    copied = _OptInfo(info.opt, info.cli)
+    copied.location = info.location
+    copied.override = info.override
+    copied.default = info.default
+    if info.extra is not None:
+        copied.extra = dict(info.extra)
     return copied
 
 
@@ -1985,6 +2482,13 @@ class ConfigParser(iniparser.BaseParser):
         )
 
 
+# The load() function of the --config-file and --config-dir actions.
+_CliAction = Callable[['_Namespace', str, Any], None]
+# A value set from the command line, as (None, dest, value), or a
+# --config-file or --config-dir action, as (action, dest, value).
+_CliJournalEntry = tuple[_CliAction | None, str, Any]
+
+
 class _Namespace(argparse.Namespace):
     """An argparse namespace which also stores config file values.
 
@@ -2014,6 +2518,66 @@ class _Namespace(argparse.Namespace):
         self._files_permission_denied: list[str] = []
         self._config_dirs: list[str] = []
         self._sections_to_file: dict[str, str] = {}
+        # While set, attributes set from the command line are recorded,
+        # along with the --config-file and --config-dir actions, so that
+        # _replay_cli_journal() can apply them again without argparse.
+        self._cli_journal: list[_CliJournalEntry] | None = None
+        self._in_cli_action = False
+        # CLI opt dests set from config file values.
+        self._file_cli_dests: set[str] = set()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        journal = self.__dict__.get('_cli_journal')
+        if (
+            journal is not None
+            and not self._in_cli_action
+            and not name.startswith('_')
+        ):
+            # NOTE: Multi opt values from later config files are appended
+            # to the list in place, so record the list as it is now.
+            journal.append(
+                (None, name, list(value) if isinstance(value, list) else value)
+            )
+        super().__setattr__(name, value)
+
+    def _run_cli_action(
+        self,
+        action: _CliAction,
+        dest: str,
+        value: Any,
+    ) -> None:
+        """Run a --config-file or --config-dir action, recording it."""
+        if self._cli_journal is not None:
+            self._cli_journal.append((action, dest, value))
+        self._in_cli_action = True
+        try:
+            action(self, dest, value)
+        finally:
+            self._in_cli_action = False
+
+    def _replay_cli_journal(
+        self, journal: list['_CliJournalEntry']
+    ) -> set[str]:
+        """Apply the command line recorded by another namespace.
+
+        Values given on the command line are set as they were parsed, and
+        config files and directories are parsed again.
+
+        :returns: the dests of the CLI opts whose values need validating
+        """
+        dests = set()
+        for action, dest, value in journal:
+            if action is not None:
+                action(self, dest, value)
+                continue
+            if isinstance(value, list):
+                value = list(value)
+                if any('$' in v for v in value if isinstance(v, str)):
+                    dests.add(dest)
+            elif isinstance(value, str) and '$' in value:
+                dests.add(dest)
+            setattr(self, dest, value)
+        return dests | self._file_cli_dests
 
     def _parse_cli_opts_from_config_file(
         self,
@@ -2061,6 +2625,7 @@ class _Namespace(argparse.Namespace):
             else:
                 dest = group_name + '_' + opt.dest
 
+            self._file_cli_dests.add(dest)
             if opt.multi:
                 if getattr(self, dest, None) is None:
                     setattr(self, dest, [])
@@ -2267,6 +2832,10 @@ class _Namespace(argparse.Namespace):
             yield from sections
 
 
+# The attributes of a _Namespace which do not hold CLI values.
+_NAMESPACE_ATTRS = frozenset(vars(_Namespace(cast('ConfigOpts', None))))
+
+
 class _CachedArgEntry(TypedDict):
     """One argument entry cached by _CachedArgumentParser."""
 
@@ -2343,11 +2912,43 @@ class _CachedArgumentParser(argparse.ArgumentParser):
         super().print_usage(file)
 
 
+class _OptionStringCollector:
+    """Stands in for a _CachedArgumentParser to check CLI option strings.
+
+    Opts add their arguments to it as they would to the parser, and adding
+    an option string twice raises DuplicateOptError, as building the parser
+    would. It does not support sub-command opts.
+    """
+
+    def __init__(self, version: str | None) -> None:
+        self._option_strings = {'-h', '--help'}
+        if version is not None:
+            self._option_strings.add('--version')
+
+    def add_argument_group(
+        self, title: str | None = None, description: str | None = None
+    ) -> '_OptionStringCollector':
+        return self
+
+    def add_parser_argument(
+        self, container: Any, *args: Any, **kwargs: Any
+    ) -> None:
+        for arg in args:
+            if arg in self._option_strings:
+                raise DuplicateOptError(','.join(args))
+            self._option_strings.add(arg)
+
+
 # Type alias for hooks passed to register_mutate_hook / mutate_config_files.
 # The second argument is the dict of changed (group, optname) -> (old, new).
 _MutationHook = Callable[
     ['ConfigOpts', dict[tuple[str | None, str], tuple[Any, Any]]], None
 ]
+# Type alias for callbacks passed to subscribe. They are called with the
+# ConfigOpts, the changed (group, optname) and its old and new values.
+_Subscriber = Callable[['ConfigOpts', tuple[str | None, str], Any, Any], None]
+# An option as (group, optname), or a group, given to subscribe.
+_SubscriptionKey = tuple[str | OptGroup | None, str] | str | OptGroup | None
 
 
 class ConfigOpts(Mapping[str, Any]):
@@ -2409,16 +3010,60 @@ class ConfigOpts(Mapping[str, Any]):
         self._args: list[str] | None = None
 
         self._oparser: _CachedArgumentParser | None = None
+        # The parser metadata given to __call__, and the last parser built
+        # along with the metadata and CLI opts it was built from.
+        self._oparser_setup: tuple[Any, ...] = ()
+        self._oparser_cache: (
+            tuple[tuple[Any, ...], _CachedArgumentParser] | None
+        ) = None
+        # The parser metadata and CLI opts last checked for duplicate option
+        # strings without building the parser.
+        self._cli_opts_checked: tuple[Any, ...] | None = None
+        # What parsing self._args did to the namespace, replayed on reload.
+        self._cli_journal: list[_CliJournalEntry] | None = None
         self._namespace: _Namespace | None = None
         self._mutable_ns: _Namespace | None = None
         self._mutate_hooks: set[_MutationHook] = set()
+        # (max_workers, timeout) when mutate hooks run concurrently.
+        self._concurrent_mutate_hooks: (
+            tuple[int | None, float | None] | None
+        ) = None
+        self._mutate_report: MutateReport | None = None
+        # (group, optname) -> subscribers, with optname None for a group.
+        self._subscribers: dict[
+            tuple[str | None, str | None], list[_Subscriber]
+        ] = {}
+        # The last generation, and the generation each (group, dest) and
+        # (group, None) was last changed at. Anything older than
+        # _generation_floor has been discarded by clear().
+        self._generation = 0
+        self._generation_floor = 0
+        self._generations: dict[tuple[str | None, str | None], int] = {}
         self.__cache: dict[tuple[str | None, str], Any] = {}
+        # The memo of the lookup _resolve() is running in each thread, so
+        # that lookups from several threads do not see each other's.
+        self._resolving = threading.local()
         self.__drivers_cache: dict[
             tuple[str | None, str], tuple[Any, LocationInfo | None]
         ] = {}
         self._config_opts: list[Opt] = []
         self._cli_opts: collections.deque[_CliOptEntry] = collections.deque()
+        # _cli_opts entries keyed by (group, dest), to find duplicates
+        # without comparing against every registered CLI opt.
+        self._cli_opts_index: dict[
+            tuple[OptGroup | None, str], list[_CliOptEntry]
+        ] = {}
         self._validate_default_values: bool = False
+        self._conversion_cache: _ConversionCache | None = None
+        self._file_watcher: _watcher.ConfigFileWatcher | None = None
+        # Converters compiled for each opt, with the type they were compiled
+        # for.
+        self._converters: dict[Opt, tuple[Any, Callable[[Any], Any]]] = {}
+        # Sources not loaded yet, keyed by group name and then opt name. The
+        # opt name is None for sources registering a whole group.
+        self._lazy_sources: dict[
+            str | None, dict[str | None, list[_LazySource]]
+        ] = {}
         self._sources: list[sources.ConfigurationSource] = []
         self._ext_mgr: Any = None
         # Though the env_driver is a Source, we load it by default.
@@ -2534,6 +3179,11 @@ class ConfigOpts(Mapping[str, Any]):
                 for item in self._cli_opts
             ],
             'validate_default_values': self._validate_default_values,
+            'lazy_sources': {
+                (group_name, name): list(lazy_sources)
+                for group_name, pending in self._lazy_sources.items()
+                for name, lazy_sources in pending.items()
+            },
             'use_env': self._use_env,
             'setup_attrs': {
                 name: getattr(self, name)
@@ -2553,6 +3203,8 @@ class ConfigOpts(Mapping[str, Any]):
 
     @staticmethod
     def _assert_serializable(state: Mapping[str, Any]) -> None:
+        import pickle
+
         try:
             pickle.dumps(state)
         except Exception as exc:
@@ -2583,10 +3235,21 @@ class ConfigOpts(Mapping[str, Any]):
         )
         self._args = state['args']
         self._oparser = None
+        self._oparser_setup = ()
+        self._oparser_cache = None
+        self._cli_opts_checked = None
+        self._cli_journal = None
         self._namespace = _import_namespace(self, state['namespace'])
         self._mutable_ns = _import_namespace(self, state['mutable_ns'])
         self._mutate_hooks = set()
+        self._concurrent_mutate_hooks = None
+        self._mutate_report = None
+        self._subscribers = {}
+        self._generation = 0
+        self._generation_floor = 0
+        self._generations = {}
         self.__cache = {}
+        self._resolving = threading.local()
         self.__drivers_cache = {}
         self._config_opts = state['config_opts']
         self._cli_opts = collections.deque(
@@ -2598,7 +3261,22 @@ class ConfigOpts(Mapping[str, Any]):
             }
             for opt, group_name in state['cli_opts']
         )
+        self._cli_opts_index = {}
+        for item in self._cli_opts:
+            self._cli_opts_index.setdefault(
+                (item['group'], item['opt'].dest), []
+            ).append(item)
         self._validate_default_values = state['validate_default_values']
+        self._conversion_cache = None
+        self._file_watcher = None
+        self._converters = {}
+        self._lazy_sources = {}
+        for (group_name, name), lazy_sources in state.get(
+            'lazy_sources', {}
+        ).items():
+            self._lazy_sources.setdefault(group_name, {})[name] = list(
+                lazy_sources
+            )
         self._sources = []
         self._ext_mgr = None
         self._use_env = state['use_env']
@@ -2636,16 +3314,25 @@ class ConfigOpts(Mapping[str, Any]):
         if default_config_dirs is None:
             default_config_dirs = find_config_dirs(project, prog)
 
-        self._oparser = _CachedArgumentParser(
+        self._oparser_setup = (prog, usage, description, epilog, version)
+        cached = self._oparser_cache
+        if cached is not None and cached[0][0] == self._oparser_setup:
+            self._oparser = cached[1]
+        else:
+            self._oparser = self._new_oparser()
+
+        return prog, default_config_files, default_config_dirs
+
+    def _new_oparser(self) -> _CachedArgumentParser:
+        prog, usage, description, epilog, version = self._oparser_setup
+        parser = _CachedArgumentParser(
             prog=prog, usage=usage, description=description, epilog=epilog
         )
-
         if version is not None:
-            self._oparser.add_parser_argument(
-                self._oparser, '--version', action='version', version=version
+            parser.add_parser_argument(
+                parser, '--version', action='version', version=version
             )
-
-        return prog, default_config_files, default_config_dirs
+        return parser
 
     @staticmethod
     def _make_config_options(
@@ -2779,12 +3466,14 @@ class ConfigOpts(Mapping[str, Any]):
         :param epilog: Text following the argument descriptions
         :param default_config_files: config files to use by default
         :param default_config_dirs: config dirs to use by default
-        :param validate_default_values: whether to validate the default values
+        :param validate_default_values: whether to validate the default values,
+            including those of opts whose default checks were deferred by
+            :func:`defer_default_checks`
         :param use_env: If True (the default) look in the environment as one
                         source of option values.
         :raises: SystemExit, ConfigFilesNotFoundError, ConfigFileParseError,
                  ConfigFilesPermissionDeniedError,
-                 RequiredOptError, DuplicateOptError
+                 RequiredOptError, DuplicateOptError, DefaultValueError
         .. versionchanged:: 9.5.0
         Added shell-completion option for generate a shell completion script.
         """
@@ -2837,6 +3526,13 @@ class ConfigOpts(Mapping[str, Any]):
 
         self._load_alternative_sources()
 
+        if validate_default_values and _unchecked_defaults:
+            check_default_values(
+                info['opt']
+                for info, group in self._all_opt_infos()
+                if info['opt'] in _unchecked_defaults
+            )
+
         self._check_required_opts()
 
     def _print_shell_completion(self, shell: str) -> None:
@@ -3060,6 +3756,8 @@ class ConfigOpts(Mapping[str, Any]):
 
     def _open_source_from_opt_group(self, group_name: str) -> Any:
         if not self._ext_mgr:
+            import stevedore
+
             self._ext_mgr = stevedore.ExtensionManager(
                 "oslo.config.driver", invoke_on_load=True
             )
@@ -3110,11 +3808,11 @@ class ConfigOpts(Mapping[str, Any]):
 
         :param name: the opt name (or 'dest', more precisely)
         :returns: the option value (after string substitution) or a GroupAttr
-        :raises: ValueError or NoSuchOptError
+        :raises: ValueError, NoSuchOptError or TemplateSubstitutionError
         """
         try:
             return self._get(name)
-        except ValueError:
+        except (ValueError, TemplateSubstitutionError):
             raise
         except Exception:
             raise NoSuchOptError(name)
@@ -3125,16 +3823,23 @@ class ConfigOpts(Mapping[str, Any]):
 
     def __contains__(self, key: object) -> bool:
         """Return True if key is the name of a registered opt or group."""
+        if key in self._opts or key in self._groups:
+            return True
+        if self._lazy_sources and isinstance(key, str):
+            self._load_lazy(key)
+            self._load_lazy(None, key)
         return key in self._opts or key in self._groups
 
     def __iter__(self) -> Iterator[str]:
         """Iterate over all registered opt and group names."""
+        self.load_lazy_opts()
         yield from itertools.chain(
             list(self._opts.keys()), list(self._groups.keys())
         )
 
     def __len__(self) -> int:
         """Return the number of options and option groups."""
+        self.load_lazy_opts()
         return len(self._opts) + len(self._groups)
 
     def reset(self) -> None:
@@ -3154,6 +3859,7 @@ class ConfigOpts(Mapping[str, Any]):
         """
         self._args = None
         self._oparser = None
+        self._cli_journal = None
         self._namespace = None
         self._mutable_ns = None
         # Keep _mutate_hooks
@@ -3161,14 +3867,19 @@ class ConfigOpts(Mapping[str, Any]):
         self.unregister_opts(self._config_opts)
         for group in self._groups.values():
             group._clear()
+        self._bump_all_generations()
 
     def _add_cli_opt(self, opt: Opt, group: OptGroup | None) -> None:
-        if {'opt': opt, 'group': group} in self._cli_opts:
-            return
+        entries = self._cli_opts_index.setdefault((group, opt.dest), [])
+        for item in entries:
+            if item['opt'] is opt or item['opt'] == opt:
+                return
+        item = {'opt': opt, 'group': group}
+        entries.append(item)
         if opt.positional:
-            self._cli_opts.append({'opt': opt, 'group': group})
+            self._cli_opts.append(item)
         else:
-            self._cli_opts.appendleft({'opt': opt, 'group': group})
+            self._cli_opts.appendleft(item)
 
     def _track_deprecated_opts(
         self, opt: Opt, group: OptGroup | None = None
@@ -3208,7 +3919,10 @@ class ConfigOpts(Mapping[str, Any]):
             if cli:
                 self._add_cli_opt(opt, group)
             self._track_deprecated_opts(opt, group=group)
-            return group._register_opt(opt, cli)
+            if not group._register_opt(opt, cli):
+                return False
+            self._bump_generation(group.name, opt.dest)
+            return True
 
         # NOTE(gcb) We can't use some names which are same with attributes of
         # Opts in default group. They includes project, prog, version, usage,
@@ -3225,8 +3939,9 @@ class ConfigOpts(Mapping[str, Any]):
         if _is_opt_registered(self._opts, opt):
             return False
 
-        self._opts[opt.dest] = {'opt': opt, 'cli': cli}
+        self._opts[opt.dest] = _OptInfo(opt, cli)
         self._track_deprecated_opts(opt)
+        self._bump_generation(None, opt.dest)
         return True
 
     @__clear_cache
@@ -3279,6 +3994,7 @@ class ConfigOpts(Mapping[str, Any]):
             return
 
         self._groups[group.name] = copy.copy(group)
+        self._bump_generation(group.name)
 
     @__clear_cache
     def unregister_opt(
@@ -3306,11 +4022,21 @@ class ConfigOpts(Mapping[str, Any]):
                 break
         if remitem is not None:
             self._cli_opts.remove(remitem)
+            key = (remitem['group'], remitem['opt'].dest)
+            entries = self._cli_opts_index[key]
+            entries.remove(remitem)
+            if not entries:
+                del self._cli_opts_index[key]
 
         if group is not None:
-            self._get_group(group)._unregister_opt(opt)
+            group = self._get_group(group)
+            if opt.dest in group._opts:
+                group._unregister_opt(opt)
+                self._bump_generation(group.name, opt.dest)
         elif opt.dest in self._opts:
             del self._opts[opt.dest]
+            self._bump_generation(None, opt.dest)
+        self._converters.pop(opt, None)
 
     @__clear_cache
     def unregister_opts(
@@ -3359,6 +4085,152 @@ class ConfigOpts(Mapping[str, Any]):
         __import__(module_str)
         self._get_group(group)
 
+    def register_lazy_opt(
+        self,
+        name: str,
+        module_str: str | None = None,
+        group: str | OptGroup | None = None,
+        namespace: str | None = None,
+    ) -> None:
+        """Declare where an option is registered, without registering it.
+
+        The first time the option is looked up and found missing, the
+        module is imported or the options listed by the ``oslo.config.opts``
+        entry point named by namespace are registered. Exactly one of
+        module_str and namespace must be given.
+
+        An imported module must register its options on this ConfigOpts
+        object, which usually means the global cfg.CONF. Lazily registered
+        options must not be CLI options, since those have to be registered
+        before the command line is parsed, and they are not checked by
+        :meth:`__call__` for required values until they are loaded.
+
+        :param name: the name/dest of the opt
+        :param module_str: the name of a module to import
+        :param group: an option OptGroup object or group name
+        :param namespace: the name of an ``oslo.config.opts`` entry point
+        :raises: ValueError
+
+        .. versionadded:: 10.4.0
+        """
+        group_name = group.name if isinstance(group, OptGroup) else group
+        if group_name == 'DEFAULT':
+            group_name = None
+        self._add_lazy_source(group_name, name, module_str, namespace)
+
+    def register_lazy_group(
+        self,
+        group: str | OptGroup,
+        module_str: str | None = None,
+        namespace: str | None = None,
+    ) -> None:
+        """Declare where an option group is registered, without loading it.
+
+        The first time the group, or an option missing from it, is looked
+        up, the module is imported or the options listed by the
+        ``oslo.config.opts`` entry point named by namespace are registered.
+        Exactly one of module_str and namespace must be given. The
+        restrictions documented for :meth:`register_lazy_opt` apply.
+
+        :param group: an option OptGroup object or group name
+        :param module_str: the name of a module to import
+        :param namespace: the name of an ``oslo.config.opts`` entry point
+        :raises: ValueError
+
+        .. versionadded:: 10.4.0
+        """
+        group_name = group.name if isinstance(group, OptGroup) else group
+        self._add_lazy_source(group_name, None, module_str, namespace)
+
+    def _add_lazy_source(
+        self,
+        group_name: str | None,
+        name: str | None,
+        module_str: str | None,
+        namespace: str | None,
+    ) -> None:
+        if (module_str is None) == (namespace is None):
+            raise ValueError(
+                'exactly one of module_str and namespace must be given'
+            )
+        source = _LazySource(module_str, namespace)
+        pending = self._lazy_sources.setdefault(group_name, {}).setdefault(
+            name, []
+        )
+        if source not in pending:
+            pending.append(source)
+
+    def load_lazy_opts(self) -> None:
+        """Load every source declared with the register_lazy_* methods.
+
+        Iterating over this object and :meth:`log_opt_values` do this
+        first, so that they cover every option.
+
+        :raises: ImportError
+
+        .. versionadded:: 10.4.0
+        """
+        while self._lazy_sources:
+            group_name, pending = next(iter(self._lazy_sources.items()))
+            self._load_lazy_sources(
+                self._pop_lazy_sources(group_name, next(iter(pending)))
+            )
+
+    def _load_lazy(
+        self, group_name: str | None, opt_name: str | None = None
+    ) -> None:
+        """Load the sources for a group or for an opt of a group.
+
+        With no opt_name, every source registering the group or any of its
+        opts is loaded.
+        """
+        pending = self._lazy_sources.get(group_name)
+        if not pending:
+            return
+        if opt_name is None:
+            names = list(pending)
+        else:
+            names = [name for name in (None, opt_name) if name in pending]
+        for name in names:
+            # Sources are removed before loading, so lookups made while a
+            # module is being imported do not load it again.
+            lazy_sources = self._pop_lazy_sources(group_name, name)
+            if lazy_sources:
+                self._load_lazy_sources(lazy_sources)
+
+    def _pop_lazy_sources(
+        self, group_name: str | None, name: str | None
+    ) -> list[_LazySource]:
+        pending = self._lazy_sources.get(group_name)
+        if pending is None:
+            return []
+        lazy_sources = pending.pop(name, [])
+        if not pending:
+            del self._lazy_sources[group_name]
+        return lazy_sources
+
+    def _load_lazy_sources(self, lazy_sources: list[_LazySource]) -> None:
+        for source in lazy_sources:
+            if source.module_str is not None:
+                __import__(source.module_str)
+                continue
+
+            import stevedore.named
+
+            mgr = stevedore.named.NamedExtensionManager(
+                'oslo.config.opts',
+                names=[source.namespace],
+                invoke_on_load=False,
+                on_load_failure_callback=_raise_load_failure,
+            )
+            for ext in mgr:
+                for group, opts in ext.plugin():
+                    if isinstance(group, OptGroup):
+                        self.register_group(group)
+                    elif group == 'DEFAULT':
+                        group = None
+                    self.register_opts(opts, group=group)
+
     @__clear_cache
     def set_override(
         self, name: str, override: Any, group: str | OptGroup | None = None
@@ -3374,11 +4246,12 @@ class ConfigOpts(Mapping[str, Any]):
 
         :raises: NoSuchOptError, NoSuchGroupError
         """
-        opt_info = self._get_opt_info(name, group)
-        opt_info['override'] = self._get_enforced_type_value(
-            opt_info['opt'], override
-        )
-        opt_info['location'] = LocationInfo(
+        group_name, opt_info = self._locate_opt(name, group)
+        override = self._get_enforced_type_value(opt_info.opt, override)
+        if opt_info.override is _UNSET or opt_info.override != override:
+            self._bump_generation(group_name, opt_info.opt.dest)
+        opt_info.override = override
+        opt_info.location = LocationInfo(
             Locations.set_override,
             _get_caller_detail(3),  # this function has a decorator to skip
         )
@@ -3398,11 +4271,12 @@ class ConfigOpts(Mapping[str, Any]):
 
         :raises: NoSuchOptError, NoSuchGroupError
         """
-        opt_info = self._get_opt_info(name, group)
-        opt_info['default'] = self._get_enforced_type_value(
-            opt_info['opt'], default
-        )
-        opt_info['location'] = LocationInfo(
+        group_name, opt_info = self._locate_opt(name, group)
+        default = self._get_enforced_type_value(opt_info.opt, default)
+        if opt_info.default is _UNSET or opt_info.default != default:
+            self._bump_generation(group_name, opt_info.opt.dest)
+        opt_info.default = default
+        opt_info.location = LocationInfo(
             Locations.set_default,
             _get_caller_detail(3),  # this function has a decorator to skip
         )
@@ -3426,8 +4300,10 @@ class ConfigOpts(Mapping[str, Any]):
         :param group: an option OptGroup object or group name
         :raises: NoSuchOptError, NoSuchGroupError
         """
-        opt_info = self._get_opt_info(name, group)
-        opt_info.pop('override', None)
+        group_name, opt_info = self._locate_opt(name, group)
+        if opt_info.override is not _UNSET:
+            opt_info.override = _UNSET
+            self._bump_generation(group_name, opt_info.opt.dest)
 
     @__clear_cache
     def clear_default(
@@ -3441,8 +4317,10 @@ class ConfigOpts(Mapping[str, Any]):
         :param group: an option OptGroup object or group name
         :raises: NoSuchOptError, NoSuchGroupError
         """
-        opt_info = self._get_opt_info(name, group)
-        opt_info.pop('default', None)
+        group_name, opt_info = self._locate_opt(name, group)
+        if opt_info.default is not _UNSET:
+            opt_info.default = _UNSET
+            self._bump_generation(group_name, opt_info.opt.dest)
 
     def _all_opt_infos(
         self,
@@ -3464,8 +4342,7 @@ class ConfigOpts(Mapping[str, Any]):
     def _unset_defaults_and_overrides(self) -> None:
         """Unset any default or override on all options."""
         for info, group in self._all_opt_infos():
-            info.pop('default', None)
-            info.pop('override', None)
+            info.default = info.override = _UNSET
 
     @property
     def config_dirs(self) -> list[str]:
@@ -3515,6 +4392,8 @@ class ConfigOpts(Mapping[str, Any]):
         :param lvl: the log level (for example logging.DEBUG) arg to
                     logger.log()
         """
+        self.load_lazy_opts()
+
         logger.log(lvl, "*" * 80)
         logger.log(lvl, "Configuration options gathered from:")
         logger.log(lvl, "command line args: %s", self._args)
@@ -3530,7 +4409,7 @@ class ConfigOpts(Mapping[str, Any]):
             return value if not opt.secret else '*' * 4
 
         for opt_name in sorted(self._opts):
-            opt = self._get_opt_info(opt_name)['opt']
+            opt = self._get_opt_info(opt_name).opt
             logger.log(
                 lvl,
                 "%-30s = %s",
@@ -3541,7 +4420,7 @@ class ConfigOpts(Mapping[str, Any]):
         for group_name in list(self._groups):
             group_attr = self.GroupAttr(self, self._get_group(group_name))
             for opt_name in sorted(self._groups[group_name]._opts):
-                opt = self._get_opt_info(opt_name, group_name)['opt']
+                opt = self._get_opt_info(opt_name, group_name).opt
                 logger.log(
                     lvl,
                     "%-30s = %s",
@@ -3563,7 +4442,7 @@ class ConfigOpts(Mapping[str, Any]):
         """
         if not self._oparser:
             raise NotInitializedError()
-        self._oparser.print_usage(file)
+        self._build_oparser().print_usage(file)
 
     def print_help(self, file: IO[str] | None = None) -> None:
         """Print the help message for the current program.
@@ -3577,7 +4456,7 @@ class ConfigOpts(Mapping[str, Any]):
         """
         if not self._oparser:
             raise NotInitializedError()
-        self._oparser.print_help(file)
+        self._build_oparser().print_help(file)
 
     def _get(
         self,
@@ -3595,8 +4474,95 @@ class ConfigOpts(Mapping[str, Any]):
                 return self.__cache[key]
             except KeyError:  # nosec: Valid control flow instruction
                 pass
-        value, loc = self._do_get(name, group, namespace)
-        self.__cache[key] = value
+        return self._resolve(key, name, group, namespace)
+
+    def _resolve(
+        self,
+        key: tuple[str | None, str],
+        name: str,
+        group: str | OptGroup | None,
+        namespace: '_Namespace | None',
+    ) -> Any:
+        """Look up an opt value along with the opts its templates refer to.
+
+        Rather than recursing through _do_get() for every link of a chain of
+        template references, references which have not been resolved yet
+        raise _UnresolvedReference. The referenced opt is pushed on an
+        explicit stack, resolved, and the referring opt is then retried.
+        Results, including errors, are memoized for the duration of this
+        top-level lookup so each opt is resolved once, and an opt which is
+        referenced while it is still being resolved is reported as a cycle.
+
+        :raises: TemplateSubstitutionError if the references form a cycle
+        """
+        resolving = self._resolving
+        saved = getattr(resolving, 'memo', None)
+        resolved: dict[tuple[str | None, str], Any] = {}
+        resolving.memo = resolved
+        stack: list[tuple[tuple[str | None, str], str, Any]] = [
+            (key, name, group)
+        ]
+        visiting = {key}
+        try:
+            while True:
+                key, name, group = stack[-1]
+                try:
+                    value, loc = self._do_get(name, group, namespace)
+                except _UnresolvedReference as ref:
+                    if ref.key in visiting:
+                        path = [k for k, n, g in stack] + [ref.key]
+                        raise TemplateSubstitutionError(
+                            'circular reference detected: '
+                            + ' -> '.join(
+                                n if g is None else f'{g}.{n}' for g, n in path
+                            )
+                        )
+                    stack.append((ref.key, ref.name, ref.group))
+                    visiting.add(ref.key)
+                    continue
+                except Exception as exc:
+                    if len(stack) == 1:
+                        raise
+                    resolved[key] = exc
+                else:
+                    resolved[key] = value
+                    if namespace is None:
+                        self.__cache[key] = value
+                stack.pop()
+                visiting.discard(key)
+                if not stack:
+                    return value
+        finally:
+            resolving.memo = saved
+
+    def _get_reference(
+        self,
+        name: str,
+        group: str | OptGroup | None,
+        namespace: '_Namespace | None',
+    ) -> Any:
+        """Look up the value of an opt referred to by a template.
+
+        Within a lookup started by _resolve() this only returns opts which
+        have already been resolved and raises _UnresolvedReference for the
+        others.
+        """
+        resolved = getattr(self._resolving, 'memo', None)
+        if resolved is None:
+            return self._get(name, group, namespace)
+        key: tuple[str | None, str]
+        if isinstance(group, OptGroup):
+            key = (group.name, name)
+        else:
+            key = (group, name)
+        if namespace is None and key in self.__cache:
+            return self.__cache[key]
+        try:
+            value = resolved[key]
+        except KeyError:
+            raise _UnresolvedReference(key, name, group)
+        if isinstance(value, Exception):
+            raise value
         return value
 
     def _do_get(
@@ -3615,14 +4581,17 @@ class ConfigOpts(Mapping[str, Any]):
         :raises: NoSuchOptError, NoSuchGroupError, ConfigFileValueError,
                  TemplateSubstitutionError
         """
+        if group is None and self._lazy_sources:
+            if name not in self._groups and name not in self._opts:
+                self._load_lazy(name)
+
         if group is None and name in self._groups:
             return (self.GroupAttr(self, self._get_group(name)), None)
 
         info = self._get_opt_info(name, group)
-        opt = info['opt']
-        if 'location' in info:
-            loc = info['location']
-        else:
+        opt = info.opt
+        loc = info.location
+        if loc is _UNSET:
             loc = opt._set_location
 
         if isinstance(opt, SubCommandOpt):
@@ -3634,8 +4603,8 @@ class ConfigOpts(Mapping[str, Any]):
                 None,
             )
 
-        if 'override' in info:
-            return (self._substitute(info['override']), loc)
+        if info.override is not _UNSET:
+            return (self._substitute(info.override), loc)
 
         def convert(value: Any) -> Any:
             return self._convert_value(
@@ -3707,8 +4676,8 @@ class ConfigOpts(Mapping[str, Any]):
                 self.__drivers_cache[key] = result
                 return result
 
-        if 'default' in info:
-            return (self._substitute(info['default']), loc)
+        if info.default is not _UNSET:
+            return (self._substitute(info.default), loc)
 
         if self._validate_default_values:
             if opt.default is not None:
@@ -3742,25 +4711,15 @@ class ConfigOpts(Mapping[str, Any]):
                           value from
         :returns: the substituted string(s)
         """
-        if isinstance(value, list):
+        if isinstance(value, str):
+            return self._substitute_str(value, group, namespace)
+        elif isinstance(value, list):
             return [
-                self._substitute(i, group=group, namespace=namespace)
+                self._substitute_str(i, group, namespace)
+                if isinstance(i, str)
+                else self._substitute(i, group=group, namespace=namespace)
                 for i in value
             ]
-        elif isinstance(value, str):
-            # Treat a backslash followed by the dollar sign "\$"
-            # the same as the string template escape "$$" as it is
-            # a bit more natural for users
-            if r'\$' in value:
-                value = value.replace(r'\$', '$$')
-            tmpl = self.Template(value)
-            ret = tmpl.safe_substitute(
-                cast(
-                    Mapping[str, str],
-                    self.StrSubWrapper(self, group=group, namespace=namespace),
-                )
-            )
-            return ret
         elif isinstance(value, dict):
             # Substitute template variables in both key and value
             return {
@@ -3772,6 +4731,35 @@ class ConfigOpts(Mapping[str, Any]):
         else:
             return value
 
+    def _substitute_str(
+        self,
+        value: str,
+        group: str | OptGroup | None,
+        namespace: '_Namespace | None',
+    ) -> str:
+        """Perform string template substitution on a single string.
+
+        Strings without a ``$`` are returned untouched. Other strings are
+        parsed once by :func:`_parse_template` and the parsed form is reused
+        for every later substitution of the same raw string.
+        """
+        if '$' not in value:
+            return value
+        parts = _parse_template(self.Template, value)
+        if isinstance(parts, str):
+            return parts
+        wrapper = self.StrSubWrapper(self, group=group, namespace=namespace)
+        result = []
+        for part in parts:
+            if isinstance(part, str):
+                result.append(part)
+                continue
+            try:
+                result.append(str(wrapper._lookup(part)))
+            except KeyError:
+                result.append(part.text)
+        return ''.join(result)
+
     class Template(string.Template):
         idpattern = r'[_a-z][\._a-z0-9]*'
 
@@ -3785,10 +4773,120 @@ class ConfigOpts(Mapping[str, Any]):
         :param opt: option definition (instance of Opt class or its subclasses)
         :returns: converted value
         """
+        cache = self._conversion_cache
+        if cache is not None:
+            if opt.multi:
+                return [cache.convert(opt.type, v) for v in value]
+            return cache.convert(opt.type, value)
+        type_ = opt.type
+        try:
+            compiled_type, convert = self._converters[opt]
+        except KeyError:
+            compiled_type = None
+        if compiled_type is not type_:
+            compile = getattr(type_, '_compile', None)
+            convert = compile() if compile is not None else type_
+            self._converters[opt] = (type_, convert)
         if opt.multi:
-            return [opt.type(v) for v in value]
+            return [convert(v) for v in value]
         else:
-            return opt.type(value)
+            return convert(value)
+
+    def enable_conversion_cache(self, maxsize: int = 1024) -> None:
+        """Memoize option type conversions.
+
+        Converted values are normally thrown away whenever the value cache
+        is cleared, for example by ``set_override`` or a reload, and are
+        converted again on the next lookup. With the conversion cache
+        enabled, up to *maxsize* results of converting a raw string with a
+        given type instance are remembered, least recently used first out,
+        and shared between all options using that type instance.
+
+        Only enable this if all option types are pure functions of their
+        input. Calling this again replaces the cache with an empty one.
+
+        :param maxsize: the maximum number of conversions to remember
+        :raises: ValueError if maxsize is not a positive integer
+        """
+        self._conversion_cache = _ConversionCache(maxsize)
+
+    def disable_conversion_cache(self) -> None:
+        """Stop memoizing option type conversions."""
+        self._conversion_cache = None
+
+    def conversion_cache_info(self) -> ConversionCacheInfo | None:
+        """Return statistics about the conversion cache.
+
+        :returns: a ConversionCacheInfo named tuple of (hits, misses, maxsize,
+                  currsize), or None if the cache is not enabled
+        """
+        if self._conversion_cache is None:
+            return None
+        return self._conversion_cache.info()
+
+    def start_file_watcher(
+        self,
+        debounce: float = 1.0,
+        interval: float = 1.0,
+        use_inotify: bool = True,
+    ) -> None:
+        """Reload the config files when they change.
+
+        The config files and config dirs which were parsed are watched from
+        a background thread, using inotify where available and otherwise
+        checking their stat results every *interval* seconds. Changes are
+        coalesced until none has been seen for *debounce* seconds, and then
+        mutate_config_files() is called once, so mutable options change
+        and mutate hooks are called as on SIGHUP. Errors from reloading are
+        logged and counted. Calling this again restarts the watcher.
+
+        mutate_config_files() then runs on the watcher thread. The mutate
+        hooks and the functions passed to subscribe() are called from that
+        thread, possibly while other threads read options. They must be
+        safe to call from any thread.
+
+        :param debounce: how long in seconds the files must be left
+                         unchanged before reloading them
+        :param interval: how often in seconds to check the files when
+                         polling
+        :param use_inotify: whether to use inotify where available
+        :raises: NotInitializedError, ValueError
+
+        .. versionadded:: 10.4.0
+        """
+        if self._namespace is None:
+            raise NotInitializedError()
+        watcher = _watcher.ConfigFileWatcher(
+            self, debounce, interval, use_inotify
+        )
+        self.stop_file_watcher()
+        self._file_watcher = watcher
+        watcher.start()
+
+    def stop_file_watcher(self, timeout: float | None = None) -> None:
+        """Stop reloading the config files when they change.
+
+        :param timeout: how long in seconds to wait for a reload in
+                        progress to finish, or None to wait until it does
+
+        .. versionadded:: 10.4.0
+        """
+        if self._file_watcher is not None:
+            self._file_watcher.stop(timeout)
+
+    def file_watcher_info(self) -> FileWatcherInfo | None:
+        """Return statistics about the file watcher.
+
+        :returns: a FileWatcherInfo named tuple of (running, backend,
+                  reloads, failures, last_duration, total_duration), where
+                  backend is 'inotify' or 'poll' and durations are in
+                  seconds, or None if the watcher was never started
+
+        .. versionadded:: 10.4.0
+        """
+        if self._file_watcher is None:
+            return None
+        return self._file_watcher.info()
 
     def _get_group(
         self, group_or_name: str | OptGroup, autocreate: bool = False
@@ -3817,6 +4915,10 @@ class ConfigOpts(Mapping[str, Any]):
             group = None
             group_name = group_or_name
 
+        if group_name not in self._groups and self._lazy_sources:
+            if not autocreate:
+                self._load_lazy(group_name)
+
         if group_name not in self._groups:
             if not autocreate:
                 raise NoSuchGroupError(group_name)
@@ -3854,6 +4956,23 @@ class ConfigOpts(Mapping[str, Any]):
     ) -> _OptInfo:
         """Return the (opt, override, default) dict for an opt.
 
+        :param opt_name: an opt name/dest
+        :param group: an optional group name or OptGroup object
+        :raises: NoSuchOptError, NoSuchGroupError
+        """
+        return self._locate_opt(opt_name, group)[1]
+
+    def _locate_opt(
+        self,
+        opt_name: str,
+        group: str | OptGroup | None = None,
+    ) -> tuple[str | None, _OptInfo]:
+        """Return the group name and the opt info for an opt.
+
+        Unlike _get_opt_info(), the name of the group the opt is registered
+        in is returned as well, which differs from the group passed if the
+        opt is looked up with a deprecated name.
+
         :param opt_name: an opt name/dest
         :param group: an optional group name or OptGroup object
         :raises: NoSuchOptError, NoSuchGroupError
@@ -3864,6 +4983,11 @@ class ConfigOpts(Mapping[str, Any]):
             group = self._get_group(group)
             opts = group._opts
 
+        if opt_name not in opts and self._lazy_sources:
+            self._load_lazy(
+                group.name if group is not None else None, opt_name
+            )
+
         if opt_name not in opts:
             real_opt_name, real_group_name = self._find_deprecated_opts(
                 opt_name, group=group
@@ -3890,7 +5014,7 @@ class ConfigOpts(Mapping[str, Any]):
                 group = self._get_group(real_group_name)
                 opts = group._opts
 
-        return opts[opt_name]
+        return (group.name if group is not None else None), opts[opt_name]
 
     def _check_required_opts(
         self, namespace: '_Namespace | None' = None
@@ -3923,11 +5047,112 @@ class ConfigOpts(Mapping[str, Any]):
 
         """
         self._args = list(args)
+        self._cli_journal = None
+        return self._parse_config_files()
+
+    def _build_oparser(self) -> _CachedArgumentParser:
+        """Add the CLI opts to the parser, unless this was already done."""
         assert self._oparser is not None
-        for opt, group in self._all_cli_opts():
+        # NOTE: Building the parser means adding, sorting and initializing
+        # an argparse argument for every CLI opt, so the last parser is
+        # reused as long as it would be built from the same metadata and
+        # CLI opt settings.
+        cli_opts = tuple(self._all_cli_opts())
+        key = self._oparser_key(cli_opts)
+        cached = self._oparser_cache
+        if cached is not None and cached[0] == key:
+            self._oparser = cached[1]
+            return self._oparser
+        if cached is not None and cached[1] is self._oparser:
+            self._oparser = self._new_oparser()
+            for opt_group in self._groups.values():
+                opt_group._clear()
+        for opt, group in cli_opts:
             opt._add_to_cli(self._oparser, group)
+        self._oparser.initialize_parser_arguments()
+        self._oparser_cache = (key, self._oparser)
+        return self._oparser
 
-        return self._parse_config_files()
+    def _oparser_key(
+        self, cli_opts: tuple[tuple[Opt, OptGroup | None], ...]
+    ) -> tuple[Any, ...]:
+        """Return what building the parser for cli_opts depends on.
+
+        Opt and group attributes are copied, so that changing them in place,
+        for example an opt's help or its type's choices, is noticed.
+        """
+        settings = []
+        for opt, group in cli_opts:
+            choices = getattr(opt.type, 'choices', None)
+            settings.append(
+                (
+                    opt,
+                    tuple(vars(opt).values()),
+                    tuple(choices) if choices is not None else None,
+                    group,
+                    (group.title, group.help) if group is not None else None,
+                )
+            )
+        return (self._oparser_setup, tuple(settings))
+
+    def _get_config_only_args(
+        self, args: Sequence[str]
+    ) -> list[tuple[_CliAction, str, str]] | None:
+        """Match args made only of --config-file and --config-dir options.
+
+        Such args, which most services are started with, are applied
+        without building the argparse parser. Anything else, including
+        abbreviated option names and values starting with '-', is left to
+        argparse, as are all args when positional or sub-command opts are
+        registered, since argparse then checks that they are given.
+
+        :returns: the --config-file and --config-dir actions, or None
+        :raises: DuplicateOptError
+        """
+        cli_opts = tuple(self._all_cli_opts())
+        for opt, group in cli_opts:
+            if opt.positional or isinstance(opt, SubCommandOpt):
+                return None
+        loaders = {
+            '--config-file': (
+                _ConfigFileOpt.ConfigFileAction.load,
+                'config_file',
+            ),
+            '--config-dir': (_ConfigDirOpt.ConfigDirAction.load, 'config_dir'),
+        }
+        actions: list[tuple[_CliAction, str, str]] = []
+        arg_iter = iter(args)
+        for arg in arg_iter:
+            name, sep, value = arg.partition('=')
+            if name not in loaders:
+                return None
+            if not sep:
+                next_arg = next(arg_iter, None)
+                if next_arg is None or next_arg.startswith('-'):
+                    return None
+                value = next_arg
+            load, dest = loaders[name]
+            actions.append((load, dest, value))
+
+        # NOTE: Building the parser would detect CLI opts adding the same
+        # option string, so look for those unless the current CLI opts were
+        # already checked.
+        key = self._oparser_key(cli_opts)
+        cached = self._oparser_cache
+        if key != self._cli_opts_checked and (
+            cached is None or cached[0] != key
+        ):
+            collector = _OptionStringCollector(self._oparser_setup[4])
+            try:
+                for opt, group in cli_opts:
+                    opt._add_to_cli(
+                        cast(_CachedArgumentParser, collector), group
+                    )
+            finally:
+                for group in self._groups.values():
+                    group._clear()
+            self._cli_opts_checked = key
+        return actions
 
     def _parse_config_files(self) -> '_Namespace':
         """Parse configure files options.
@@ -3958,24 +5183,55 @@ class ConfigOpts(Mapping[str, Any]):
                 # for the default config-dir directories we just continue
                 # if the directories do not exist. This is different to the
                 # case where --config-dir is given on the command line.
-                if not os.path.exists(config_dir):
+                config_files = _list_config_dir(config_dir)
+                if config_files is None:
                     continue
 
-                config_dir_glob = os.path.join(config_dir, '*.conf')
-
-                for config_file in sorted(glob.glob(config_dir_glob)):
+                for config_file in config_files:
                     ConfigParser._parse_file(config_file, namespace)
 
-        self._oparser.parse_args(self._args, namespace)
+        # NOTE: The arguments do not change once parsed, so when reloading
+        # the config files, the values parsed from them are set again
+        # without argparse and only the config files are parsed again.
+        if self._cli_journal is not None:
+            dests = namespace._replay_cli_journal(self._cli_journal)
+            self._validate_cli_options(namespace, dests)
+            return namespace
+
+        journal: list[_CliJournalEntry] = []
+        namespace._cli_journal = journal
+        try:
+            actions = self._get_config_only_args(self._args)
+            if actions is not None:
+                for load, dest, value in actions:
+                    namespace._run_cli_action(load, dest, value)
+            else:
+                self._build_oparser().parse_args(self._args, namespace)
+        finally:
+            namespace._cli_journal = None
 
         self._validate_cli_options(namespace)
+        self._cli_journal = journal
 
         return namespace
 
-    def _validate_cli_options(self, namespace: '_Namespace') -> None:
-        for opt, group in sorted(
-            self._all_cli_opts(), key=lambda x: x[0].name
-        ):
+    def _validate_cli_options(
+        self, namespace: '_Namespace', dests: set[str] | None = None
+    ) -> None:
+        """Check that the CLI opt values in namespace can be converted.
+
+        :param namespace: the namespace holding the values
+        :param dests: if given, only the CLI opts with these namespace dests
+        """
+        cli_opts: Iterable[tuple[Opt, OptGroup | None]] = self._all_cli_opts()
+        if dests is not None:
+            cli_opts = [
+                (opt, group)
+                for opt, group in cli_opts
+                if (opt.dest if group is None else f'{group.name}_{opt.dest}')
+                in dests
+            ]
+        for opt, group in sorted(cli_opts, key=lambda x: x[0].name):
             group_name = group.name if group else None
             try:
                 value, loc = opt._get_from_namespace(namespace, group_name)
@@ -4026,12 +5282,17 @@ class ConfigOpts(Mapping[str, Any]):
             )
             return False
         else:
+            old_namespace = self._namespace
             self._namespace = namespace
+            self._bump_generations(old_namespace, namespace)
             return True
 
     def register_mutate_hook(self, hook: Callable[..., Any]) -> None:
         """Registers a hook to be called by mutate_config_files.
 
+        Hooks are called on the thread calling mutate_config_files(), which
+        is the file watcher thread once start_file_watcher() is used.
+
         :param hook: a function accepting this ConfigOpts object and a dict of
                      config mutations, as returned by mutate_config_files.
         :return: None
@@ -4055,8 +5316,19 @@ class ConfigOpts(Mapping[str, Any]):
 
         old_mutate_ns = self._mutable_ns or self._namespace
         self._mutable_ns = self._reload_config_files()
-        self._warn_immutability()
-        fresh = self._diff_ns(old_mutate_ns, self._mutable_ns)
+        assert self._namespace is not None
+        self._warn_immutability(
+            self._changed_opt_infos(self._namespace, self._mutable_ns)
+        )
+        fresh = self._diff_ns(
+            old_mutate_ns,
+            self._mutable_ns,
+            self._changed_opt_infos(old_mutate_ns, self._mutable_ns)
+            if old_mutate_ns is not None
+            else None,
+        )
+        for group_name, name in fresh:
+            self._bump_generation(group_name, self._opt_dest(group_name, name))
 
         def key_fn(
             item: tuple[tuple[str | None, str], tuple[Any, Any]],
@@ -4079,19 +5351,498 @@ class ConfigOpts(Mapping[str, Any]):
                     'new_val': new,
                 },
             )
-        for hook in self._mutate_hooks:
-            hook(self, fresh)
+        if self._subscribers and old_mutate_ns is not None:
+            self._notify_subscribers(fresh, old_mutate_ns)
+        if self._concurrent_mutate_hooks is None:
+            self._run_mutate_hooks(fresh)
+        else:
+            self._run_mutate_hooks_concurrently(
+                fresh, *self._concurrent_mutate_hooks
+            )
         return fresh
 
-    def _warn_immutability(self) -> None:
+    @staticmethod
+    def _subscription_key(
+        key: _SubscriptionKey,
+    ) -> tuple[str | None, str | None]:
+        if isinstance(key, tuple):
+            group, name = key
+        else:
+            group, name = key, None
+        if isinstance(group, OptGroup):
+            group = group.name
+        return (None if group == 'DEFAULT' else group, name)
+
+    def subscribe(
+        self,
+        key: _SubscriptionKey,
+        callback: _Subscriber,
+    ) -> None:
+        """Call a function when an option or a group of options changes.
+
+        Once mutate_config_files() has found which mutable options changed,
+        each callback subscribed to one of them, or to its group, is called
+        with this ConfigOpts, the (group, optname) of the changed option,
+        with None as the group for the DEFAULT group, and its old and new
+        values, converted to the option type. Callbacks are called before
+        the mutate hooks, and only for the options which changed, on the
+        thread calling mutate_config_files(), which is the file watcher
+        thread once start_file_watcher() is used. Exceptions raised by
+        callbacks are logged rather than raised.
+
+        :param key: a (group, optname) tuple for an option, where the group
+                    is a group name, an OptGroup, or None or 'DEFAULT' for
+                    the DEFAULT group and the optname may also be the
+                    option's dest, or a group alone for all the options
+                    in it
+        :param callback: a function accepting the ConfigOpts, the changed
+                         (group, optname) and the old and new values
+
+        .. versionadded:: 10.4.0
+        """
+        subscribers = self._subscribers.setdefault(
+            self._subscription_key(key), []
+        )
+        if callback not in subscribers:
+            subscribers.append(callback)
+
+    def unsubscribe(
+        self,
+        key: _SubscriptionKey,
+        callback: _Subscriber,
+    ) -> None:
+        """Stop calling a function subscribed with subscribe().
+
+        :param key: the key the function was subscribed with
+        :param callback: the function
+
+        .. versionadded:: 10.4.0
+        """
+        subscription_key = self._subscription_key(key)
+        subscribers = self._subscribers.get(subscription_key, [])
+        if callback in subscribers:
+            subscribers.remove(callback)
+            if not subscribers:
+                del self._subscribers[subscription_key]
+
+    def _notify_subscribers(
+        self,
+        fresh: dict[tuple[str | None, str], tuple[Any, Any]],
+        old_ns: '_Namespace',
+    ) -> None:
+        """Call the subscribers of the options which changed."""
+        for key in fresh:
+            group_name, name = key
+            dest = self._opt_dest(group_name, name)
+            subscribers: list[_Subscriber] = []
+            # NOTE: Options may be subscribed to by name or by dest.
+            for subscription_key in (
+                key,
+                (group_name, dest),
+                (group_name, None),
+            ):
+                for subscriber in self._subscribers.get(subscription_key, ()):
+                    if subscriber not in subscribers:
+                        subscribers.append(subscriber)
+            if not subscribers:
+                continue
+            try:
+                old, _ = self._do_get(dest, group_name, old_ns)
+                new = self._get(dest, group_name)
+            except (ConfigFileValueError, TemplateSubstitutionError) as e:
+                LOG.error(
+                    'Not notifying subscribers of option %(group)s.%(option)s'
+                    ': %(error)s',
+                    {
+                        'group': group_name or 'DEFAULT',
+                        'option': name,
+                        'error': e,
+                    },
+                )
+                continue
+            if old == new:
+                # NOTE: The option differs between the namespaces but its
+                # value does not, as when it is overridden.
+                continue
+            for subscriber in subscribers:
+                try:
+                    subscriber(self, key, old, new)
+                except Exception:
+                    LOG.exception(
+                        'Subscriber %(subscriber)r failed for option '
+                        '%(group)s.%(option)s',
+                        {
+                            'subscriber': subscriber,
+                            'group': group_name or 'DEFAULT',
+                            'option': name,
+                        },
+                    )
+
+    def _bump_all_generations(self) -> None:
+        """Increase the generations of all the opts and groups."""
+        self._generation += 1
+        self._generation_floor = self._generation
+        self._generations.clear()
+
+    def _bump_generations(
+        self, old_ns: '_Namespace | None', new_ns: '_Namespace'
+    ) -> None:
+        """Increase the generations of the opts changed by a reload."""
+        if old_ns is None:
+            self._bump_all_generations()
+            return
+        for info, group in self._changed_opt_infos(old_ns, new_ns):
+            self._bump_generation(
+                group.name if group is not None else None, info['opt'].dest
+            )
+
+    def _opt_dest(self, group_name: str | None, name: str) -> str:
+        """Return the dest of a registered opt given its name."""
+        opts = (
+            self._opts
+            if group_name is None
+            else self._groups[group_name]._opts
+        )
+        dest = name.replace('-', '_')
+        if dest not in opts or opts[dest]['opt'].name != name:
+            dest = next(
+                d for d, info in opts.items() if info['opt'].name == name
+            )
+        return dest
+
+    def generation(
+        self,
+        group: str | OptGroup | None = None,
+        name: str | None = None,
+    ) -> int:
+        """Return a number which increases whenever options change.
+
+        Without arguments, the generation of the whole configuration is
+        returned. Given a group, the generation of the group and of all the
+        options in it is returned, and given an option name, the generation
+        of that option alone, so that something built from options need
+        only be rebuilt when the generation it was built at is no longer
+        the current one.
+
+        Generations are increased by setting or clearing overrides and
+        defaults, by registering or unregistering options and groups, by
+        reload_config_files() and mutate_config_files() for the options
+        whose values in the config files or on the command line changed,
+        and, for all options, by parsing the command line again, reset() and
+        clear(). Changes to the environment or to other configuration
+        sources are not tracked.
+
+        :param group: a group name or OptGroup object, or 'DEFAULT' for the
+                      DEFAULT group, or None for the DEFAULT group when an
+                      option name is given and for the whole configuration
+                      otherwise
+        :param name: the name/dest of an opt
+        :raises: NoSuchOptError, NoSuchGroupError
+
+        .. versionadded:: 10.4.0
+        """
+        if name is not None:
+            group_name, info = self._locate_opt(
+                name, None if group == 'DEFAULT' else group
+            )
+            key = (group_name, info['opt'].dest)
+        elif group == 'DEFAULT':
+            key = (None, None)
+        elif group is not None:
+            key = (self._get_group(group).name, None)
+        else:
+            return self._generation
+        return self._generations.get(key, self._generation_floor)
+
+    def _bump_generation(
+        self, group_name: str | None, dest: str | None = None
+    ) -> None:
+        """Increase the generation of an opt or of a group."""
+        self._generation += 1
+        if dest is not None:
+            self._generations[(group_name, dest)] = self._generation
+        self._generations[(group_name, None)] = self._generation
+
+    def _run_mutate_hooks(
+        self, fresh: dict[tuple[str | None, str], tuple[Any, Any]]
+    ) -> None:
+        """Call the mutate hooks one after the other.
+
+        An exception raised by a hook is recorded in the report and raised
+        again, without calling the remaining hooks.
+        """
+        results = []
+        start = time.monotonic()
+        try:
+            for hook in self._mutate_hooks:
+                hook_start = time.monotonic()
+                try:
+                    hook(self, fresh)
+                except Exception as e:
+                    results.append(
+                        MutateHookResult(
+                            hook, time.monotonic() - hook_start, e, False
+                        )
+                    )
+                    raise
+                results.append(
+                    MutateHookResult(
+                        hook, time.monotonic() - hook_start, None, False
+                    )
+                )
+        finally:
+            self._mutate_report = MutateReport(
+                fresh, time.monotonic() - start, results
+            )
+
+    def _run_mutate_hooks_concurrently(
+        self,
+        fresh: dict[tuple[str | None, str], tuple[Any, Any]],
+        max_workers: int | None,
+        timeout: float | None,
+    ) -> None:
+        """Call the mutate hooks on a pool of daemon threads.
+
+        Exceptions raised by hooks, and hooks still running *timeout*
+        seconds after they started, are logged and recorded in the report
+        rather than raised. The threads are daemon threads so that a hook
+        which never returns does not keep the interpreter from exiting, as
+        the workers of a concurrent.futures pool would. A thread left
+        running a hook which timed out is replaced, so that every hook is
+        called.
+        """
+        hooks = list(self._mutate_hooks)
+        if max_workers is None:
+            # The default of concurrent.futures.ThreadPoolExecutor.
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        queued = collections.deque(enumerate(hooks))
+        started = [threading.Event() for _ in hooks]
+        finished = [threading.Event() for _ in hooks]
+        # index -> start time, set before the hook is started
+        start_times: dict[int, float] = {}
+        # index -> (duration, exception), set before the hook is finished
+        outcomes: dict[int, tuple[float, Exception | None]] = {}
+        workers = itertools.count()
+
+        def run() -> None:
+            while True:
+                try:
+                    index, hook = queued.popleft()
+                except IndexError:
+                    return
+                hook_start = start_times[index] = time.monotonic()
+                started[index].set()
+                error = None
+                try:
+                    hook(self, fresh)
+                except Exception as e:
+                    error = e
+                outcomes[index] = (time.monotonic() - hook_start, error)
+                finished[index].set()
+
+        def start_worker() -> None:
+            threading.Thread(
+                target=run,
+                name=f'oslo.config-mutate_{next(workers)}',
+                daemon=True,
+            ).start()
+
+        results = []
+        start = time.monotonic()
+        for _ in range(min(max_workers, len(hooks))):
+            start_worker()
+        for index, hook in enumerate(hooks):
+            # NOTE: Hooks are started in order and the threads running
+            # earlier hooks have either finished them or been replaced, so
+            # this hook is started without waiting for its own timeout.
+            started[index].wait()
+            remaining = None
+            if timeout is not None:
+                remaining = max(
+                    0.0, start_times[index] + timeout - time.monotonic()
+                )
+            if not finished[index].wait(remaining):
+                LOG.error(
+                    'Mutate hook %(hook)r did not finish within '
+                    '%(timeout)s seconds',
+                    {'hook': hook, 'timeout': timeout},
+                )
+                results.append(MutateHookResult(hook, None, None, True))
+                # NOTE: The hook cannot be interrupted, so it is left to
+                # finish in the background on its thread.
+                if queued:
+                    start_worker()
+                continue
+            duration, error = outcomes[index]
+            if error is not None:
+                LOG.error(
+                    'Mutate hook %(hook)r failed: %(error)s',
+                    {'hook': hook, 'error': error},
+                    exc_info=error,
+                )
+            results.append(MutateHookResult(hook, duration, error, False))
+        self._mutate_report = MutateReport(
+            fresh, time.monotonic() - start, results
+        )
+
+    def enable_concurrent_mutate_hooks(
+        self, max_workers: int | None = None, timeout: float | None = None
+    ) -> None:
+        """Call the mutate hooks concurrently on a thread pool.
+
+        By default, mutate_config_files() calls the mutate hooks one after
+        the other, and an exception raised by a hook is raised to the
+        caller. Once this is called, the hooks are started together on a
+        thread pool and mutate_config_files() waits for each of them to
+        finish for up to *timeout* seconds from when it started. Exceptions
+        raised by hooks, and hooks still running after their timeout, are
+        logged and recorded in the mutate report rather than raised. Hooks
+        which time out are left to finish in the background, on daemon
+        threads which do not keep the process from exiting, and the hooks
+        queued behind them are still called.
+
+        :param max_workers: the maximum number of threads running hooks,
+                            by default as for
+                            concurrent.futures.ThreadPoolExecutor
+        :param timeout: how long in seconds to wait for each hook, or None
+                        to wait until they finish
+        :raises: ValueError if max_workers or timeout is not positive
+
+        .. versionadded:: 10.4.0
+        """
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError('max_workers must be a positive integer')
+        if timeout is not None and timeout <= 0:
+            raise ValueError('timeout must be positive')
+        self._concurrent_mutate_hooks = (max_workers, timeout)
+
+    def disable_concurrent_mutate_hooks(self) -> None:
+        """Call the mutate hooks one after the other again.
+
+        .. versionadded:: 10.4.0
+        """
+        self._concurrent_mutate_hooks = None
+
+    def mutate_report(self) -> MutateReport | None:
+        """Return a report of the last call of the mutate hooks.
+
+        :returns: a MutateReport named tuple of (changed, duration, hooks)
+                  where changed is the dict returned by
+                  mutate_config_files(), duration is how long in seconds
+                  the hooks took, and hooks is a list of MutateHookResult
+                  named tuples of (hook, duration, exception, timed_out),
+                  or None if the hooks have not been called
+
+        .. versionadded:: 10.4.0
+        """
+        return self._mutate_report
+
+    def _changed_opt_infos(
+        self, old_ns: '_Namespace', new_ns: '_Namespace'
+    ) -> list[tuple[_OptInfo, OptGroup | None]]:
+        """Return the opts whose values may differ between two namespaces.
+
+        Rather than looking up every opt in both namespaces, the config file
+        entries and CLI values which differ are found first, and only the
+        opts looked up with those names, including deprecated names, are
+        returned, in registration order.
+        """
+        keys: set[tuple[str, str]] = set()
+        old_files, new_files = old_ns._normalized, new_ns._normalized
+        if len(old_files) == len(new_files):
+            file_pairs = list(zip(old_files, new_files))
+        else:
+            # NOTE: Files were added or removed, so compare the values from
+            # all files for each entry.
+            merged: list[dict[str, dict[str, list[Any]]]] = [{}, {}]
+            for i, files in enumerate((old_files, new_files)):
+                for sections in files:
+                    for section, values in sections.items():
+                        merged_values = merged[i].setdefault(section, {})
+                        for name, value in values.items():
+                            merged_values.setdefault(name, []).append(value)
+            file_pairs = [(merged[0], merged[1])]
+        for old_sections, new_sections in file_pairs:
+            if old_sections == new_sections:
+                continue
+            for section in old_sections.keys() | new_sections.keys():
+                old_values = old_sections.get(section, {})
+                new_values = new_sections.get(section, {})
+                if old_values == new_values:
+                    continue
+                keys.update(
+                    (section, name)
+                    for name in old_values.keys() | new_values.keys()
+                    if old_values.get(name) != new_values.get(name)
+                )
+
+        old_attrs, new_attrs = vars(old_ns), vars(new_ns)
+        attrs = {
+            attr
+            for attr in (old_attrs.keys() | new_attrs.keys())
+            - _NAMESPACE_ATTRS
+            if old_attrs.get(attr) != new_attrs.get(attr)
+        }
+        if not keys and not attrs:
+            return []
+
+        # Look up the opts with these names, then the ones with these
+        # deprecated names, the way _get_from_namespace names them.
+        group_opts: dict[str, list[dict[str, _OptInfo]]] = {
+            'DEFAULT': [self._opts]
+        }
+        for opt_group in self._groups.values():
+            group_opts.setdefault(
+                _normalize_group_name(opt_group.name), []
+            ).append(opt_group._opts)
+        changed = set()
+        for section, name in keys:
+            for opts in group_opts.get(section, ()):
+                if name in opts:
+                    changed.add(id(opts[name]))
+        for attr in attrs:
+            if attr in self._opts:
+                changed.add(id(self._opts[attr]))
+            for i, c in enumerate(attr):
+                if c == '_' and attr[:i] in self._groups:
+                    opts = self._groups[attr[:i]]._opts
+                    if attr[i + 1 :] in opts:
+                        changed.add(id(opts[attr[i + 1 :]]))
+
+        opt_infos: list[tuple[_OptInfo, OptGroup | None]] = []
+        for info, group in self._all_opt_infos():
+            if id(info) in changed:
+                opt_infos.append((info, group))
+                continue
+            opt = info['opt']
+            for dopt in opt.deprecated_opts:
+                if not (dopt.name or dopt.group):
+                    continue
+                dgroup = dopt.group or (group.name if group else None)
+                dname = dopt.name or opt.dest
+                attr = dname if dgroup is None else f'{dgroup}_{dname}'
+                section = _normalize_group_name(dgroup or 'DEFAULT')
+                if (section, dname) in keys or attr in attrs:
+                    opt_infos.append((info, group))
+                    break
+        return opt_infos
+
+    def _warn_immutability(
+        self,
+        opt_infos: Iterable[tuple[_OptInfo, OptGroup | None]] | None = None,
+    ) -> None:
         """Check immutable opts have not changed.
 
         _do_get won't return the new values but presumably someone changed the
         config file expecting them to change so we should warn them they won't.
+
+        :param opt_infos: the opts to check, by default all of them
         """
         assert self._namespace is not None
         assert self._mutable_ns is not None
-        for info, group in self._all_opt_infos():
+        if opt_infos is None:
+            opt_infos = self._all_opt_infos()
+        for info, group in opt_infos:
             opt = info['opt']
             if opt.mutable:
                 continue
@@ -4114,15 +5865,19 @@ class ConfigOpts(Mapping[str, Any]):
         self,
         old_ns: '_Namespace | None',
         new_ns: '_Namespace',
+        opt_infos: Iterable[tuple[_OptInfo, OptGroup | None]] | None = None,
     ) -> dict[tuple[str | None, str], tuple[Any, Any]]:
         """Compare mutable option values between two namespaces.
 
         This can be used to only reconfigure stateful sessions when necessary.
 
+        :param opt_infos: the opts to compare, by default all of them
         :return {(None or 'group', 'optname'): (old_value, new_value), ... }
         """
         diff: dict[tuple[str | None, str], tuple[Any, Any]] = {}
-        for info, group in self._all_opt_infos():
+        if opt_infos is None:
+            opt_infos = self._all_opt_infos()
+        for info, group in opt_infos:
             opt = info['opt']
             if not opt.mutable:
                 continue
@@ -4201,14 +5956,20 @@ class ConfigOpts(Mapping[str, Any]):
 
         def __contains__(self, key: object) -> bool:
             """Return True if key is the name of a registered opt or group."""
+            if self._conf._lazy_sources:
+                self._conf._load_lazy(self._group.name)
             return key in self._group._opts
 
         def __iter__(self) -> Iterator[str]:
             """Iterate over all registered opt and group names."""
+            if self._conf._lazy_sources:
+                self._conf._load_lazy(self._group.name)
             yield from self._group._opts.keys()
 
         def __len__(self) -> int:
             """Return the number of options and option groups."""
+            if self._conf._lazy_sources:
+                self._conf._load_lazy(self._group.name)
             return len(self._group._opts)
 
     class SubCommandAttr:
@@ -4278,22 +6039,28 @@ class ConfigOpts(Mapping[str, Any]):
             :param key: an opt name
             :returns: an opt value
             """
-            try:
-                group_name, option = key.split(".", 1)
-            except ValueError:
+            return self._lookup(_TemplateRef.from_key(key))
+
+        def _lookup(self, ref: '_TemplateRef') -> Any:
+            """Look up the opt value for a pre-split template reference.
+
+            :param ref: a _TemplateRef returned by _parse_template
+            :returns: an opt value
+            """
+            group: str | OptGroup | None
+            if ref.group is None:
                 group = self.group
-                option = key
             else:
-                group = OptGroup(name=group_name)
+                group = ref.group
             try:
-                value = self.conf._get(
-                    option, group=group, namespace=self.namespace
+                value = self.conf._get_reference(
+                    ref.name, group, self.namespace
                 )
             except NoSuchOptError:
-                value = self.conf._get(key, namespace=self.namespace)
+                value = self.conf._get_reference(ref.key, None, self.namespace)
             if isinstance(value, self.conf.GroupAttr):
                 raise TemplateSubstitutionError(
-                    f'substituting group {key} not supported'
+                    f'substituting group {ref.key} not supported'
                 )
             if value is None:
                 return ''
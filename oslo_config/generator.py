@@ -49,7 +49,6 @@ import yaml
 
 from oslo_config import cfg
 from oslo_i18n import _message
-import stevedore.named  # noqa
 
 LOG = logging.getLogger(__name__)
 UPPER_CASE_GROUP_NAMES = ['DEFAULT']
@@ -517,6 +516,8 @@ def _get_raw_opts_loaders(namespaces: list[str]) -> list[Any]:
     :param namespaces: a list of namespaces registered under 'oslo.config.opts'
     :returns: a list of (namespace, [(group, [opt_1, opt_2])]) tuples
     """
+    import stevedore.named
+
     mgr = stevedore.named.NamedExtensionManager(
         'oslo.config.opts',
         names=namespaces,
@@ -529,6 +530,8 @@ def _get_raw_opts_loaders(namespaces: list[str]) -> list[Any]:
 def _get_driver_opts_loaders(
     namespaces: list[str], driver_option_name: str
 ) -> list[Any]:
+    import stevedore.named
+
     mgr = stevedore.named.NamedExtensionManager(
         namespace='oslo.config.opts.' + driver_option_name,
         names=namespaces,
@@ -559,6 +562,8 @@ def _get_driver_opts(
 
 
 def _get_opt_default_updaters(namespaces: list[str]) -> list[Any]:
+    import stevedore.named
+
     mgr = stevedore.named.NamedExtensionManager(
         'oslo.config.opts.defaults',
         names=namespaces,
@@ -13,6 +13,7 @@
 #    under the License.
 
 import argparse
+import copy
 import errno
 import functools
 import io
@@ -22,8 +23,11 @@ import os
 import pickle
 import queue
 import shutil
+import subprocess
 import sys
 import tempfile
+import threading
+import time
 from typing import Any, cast
 import unittest
 from unittest import mock
@@ -46,6 +50,64 @@ class _UnserializableType:
         return value
 
 
+class _FakePaths(fixtures.Fixture):
+    """Make the given paths the only ones found when searching dirs.
+
+    The paths are created under a temporary root directory, as directories
+    for names ending with '.d' and as files otherwise, and the os.stat,
+    os.scandir and os.path.exists calls of oslo_config.cfg are redirected
+    to that root. Lookups therefore list and stat real directories.
+    """
+
+    def __init__(self, paths):
+        super().__init__()
+        self.paths = paths
+
+    def _setUp(self):
+        root = self.useFixture(fixtures.TempDir()).path
+
+        def fake(path):
+            path = os.path.abspath(os.fspath(path))
+            if path.startswith(root + os.sep):
+                return path
+            return root + path
+
+        for path in self.paths:
+            if path.endswith('.d'):
+                os.makedirs(fake(path), exist_ok=True)
+            else:
+                os.makedirs(os.path.dirname(fake(path)), exist_ok=True)
+                with open(fake(path), 'w'):
+                    pass
+        # Old enough for the directory listings to be cached.
+        mtime = time.time() - 60
+        for dirpath, _, _ in os.walk(root):
+            os.utime(dirpath, (mtime, mtime))
+
+        class FakePath:
+            def __getattr__(self, name):
+                return getattr(os.path, name)
+
+            def exists(self, path):
+                return os.path.exists(fake(path))
+
+        class FakeOS:
+            path = FakePath()
+
+            def __getattr__(self, name):
+                return getattr(os, name)
+
+            def stat(self, path, *args, **kwargs):
+                return os.stat(fake(path), *args, **kwargs)
+
+            def scandir(self, path):
+                return os.scandir(fake(path))
+
+        cfg.invalidate_dir_cache()
+        self.addCleanup(cfg.invalidate_dir_cache)
+        self.useFixture(fixtures.MonkeyPatch('oslo_config.cfg.os', FakeOS()))
+
+
 def _spawn_config_opts_worker(conf, result_queue):
     try:
         assert conf.spawn_default == 'changed-default'
@@ -362,9 +424,7 @@ class FindConfigFilesTestCase(BaseTestCase):
         ]
 
         self.useFixture(fixtures.MonkeyPatch('sys.argv', ['foo']))
-        self.useFixture(
-            fixtures.MonkeyPatch('os.path.exists', lambda p: p in config_files)
-        )
+        self.useFixture(_FakePaths(config_files))
 
         self.assertEqual(cfg.find_config_files(project='blaa'), config_files)
 
@@ -385,9 +445,7 @@ class FindConfigFilesTestCase(BaseTestCase):
             '/etc/bar.conf',
         ]
 
-        self.useFixture(
-            fixtures.MonkeyPatch('os.path.exists', lambda p: p in config_files)
-        )
+        self.useFixture(_FakePaths(config_files))
 
         expected = [
             os.path.expanduser('~/.foo/foo.conf'),
@@ -407,9 +465,7 @@ class FindConfigFilesTestCase(BaseTestCase):
         }
 
         self.useFixture(fixtures.MonkeyPatch('sys.argv', ['foo']))
-        self.useFixture(
-            fixtures.MonkeyPatch('os.path.exists', lambda p: p in config_files)
-        )
+        self.useFixture(_FakePaths(config_files))
         self.useFixture(fixtures.MonkeyPatch('os.environ', fake_env))
 
         self.assertEqual(
@@ -421,9 +477,7 @@ class FindConfigFilesTestCase(BaseTestCase):
         config_files = ['/etc/foo.json']
 
         self.useFixture(fixtures.MonkeyPatch('sys.argv', ['foo']))
-        self.useFixture(
-            fixtures.MonkeyPatch('os.path.exists', lambda p: p in config_files)
-        )
+        self.useFixture(_FakePaths(config_files))
 
         self.assertEqual(cfg.find_config_files(project='blaa'), [])
         self.assertEqual(
@@ -440,9 +494,7 @@ class FindConfigDirsTestCase(BaseTestCase):
         ]
 
         self.useFixture(fixtures.MonkeyPatch('sys.argv', ['foo']))
-        self.useFixture(
-            fixtures.MonkeyPatch('os.path.exists', lambda p: p in config_dirs)
-        )
+        self.useFixture(_FakePaths(config_dirs))
 
         self.assertEqual(cfg.find_config_dirs(project='blaa'), config_dirs)
 
@@ -454,9 +506,7 @@ class FindConfigDirsTestCase(BaseTestCase):
         }
 
         self.useFixture(fixtures.MonkeyPatch('sys.argv', ['foo']))
-        self.useFixture(
-            fixtures.MonkeyPatch('os.path.exists', lambda p: p in config_dirs)
-        )
+        self.useFixture(_FakePaths(config_dirs))
         self.useFixture(fixtures.MonkeyPatch('os.environ', fake_env))
 
         self.assertEqual(cfg.find_config_dirs(project='blaa'), config_dirs)
@@ -469,9 +519,7 @@ class FindConfigDirsTestCase(BaseTestCase):
         config_dirs = ['/etc/foo.json.d']
 
         self.useFixture(fixtures.MonkeyPatch('sys.argv', ['foo']))
-        self.useFixture(
-            fixtures.MonkeyPatch('os.path.exists', lambda p: p in config_dirs)
-        )
+        self.useFixture(_FakePaths(config_dirs))
 
         self.assertEqual(cfg.find_config_dirs(project='blaa'), [])
         self.assertEqual(
@@ -2867,6 +2915,71 @@ class ConfigFileReloadTestCase(BaseTestCase):
         self.assertTrue(hasattr(self.conf, 'foo1'))
         self.assertEqual('test11', self.conf.foo1)
 
+    def test_conf_files_reload_keeps_argument_order(self):
+        self.conf.register_cli_opt(cfg.StrOpt('foo'))
+        self.conf.register_cli_opt(cfg.StrOpt('bar'))
+        paths = self.create_tempfiles(
+            [('1', '[DEFAULT]\nfoo = file\nbar = file\n')]
+        )
+
+        self.conf(['--foo', 'cli', '--config-file', paths[0], '--bar', 'cli'])
+        self.assertEqual('file', self.conf.foo)
+        self.assertEqual('cli', self.conf.bar)
+
+        with open(paths[0], 'w') as f:
+            f.write('[DEFAULT]\nfoo = changed\nbar = changed\n')
+
+        self.assertTrue(self.conf.reload_config_files())
+        self.assertEqual('changed', self.conf.foo)
+        self.assertEqual('cli', self.conf.bar)
+
+    def test_conf_files_reload_skips_argparse(self):
+        self.conf.register_cli_opt(cfg.StrOpt('foo'))
+        paths = self.create_tempfiles([('1', '[DEFAULT]\nfoo = baar\n')])
+        self.conf(['--config-file', paths[0]])
+
+        with mock.patch.object(self.conf._oparser, 'parse_args') as parse:
+            self.assertTrue(self.conf.reload_config_files())
+        parse.assert_not_called()
+        self.assertEqual([paths[0]], self.conf.config_file)
+        self.assertEqual('baar', self.conf.foo)
+
+    def test_conf_files_reload_multi_opt(self):
+        self.conf.register_cli_opt(cfg.MultiStrOpt('foo'))
+        paths = self.create_tempfiles([('1', '[DEFAULT]\nfoo = b\n')])
+
+        self.conf(['--foo', 'a', '--config-file', paths[0], '--foo', 'c'])
+        self.assertEqual(['a', 'b', 'c'], self.conf.foo)
+
+        self.assertTrue(self.conf.reload_config_files())
+        self.assertEqual(['a', 'b', 'c'], self.conf.foo)
+
+    def test_conf_files_reload_config_dir(self):
+        self.conf.register_cli_opt(cfg.StrOpt('foo'))
+        paths = self.create_tempfiles([('1', '[DEFAULT]\nfoo = baar\n')])
+        config_dir = os.path.dirname(paths[0])
+
+        self.conf(['--config-dir', config_dir])
+        self.assertEqual('baar', self.conf.foo)
+
+        with open(paths[0], 'w') as f:
+            f.write('[DEFAULT]\nfoo = baaar\n')
+
+        self.assertTrue(self.conf.reload_config_files())
+        self.assertEqual('baaar', self.conf.foo)
+        self.assertEqual([config_dir], self.conf.config_dir)
+
+    def test_conf_files_reload_invalid_cli_value(self):
+        self.conf.register_cli_opt(cfg.IntOpt('foo'))
+        paths = self.create_tempfiles([('1', '[DEFAULT]\nfoo = 1\n')])
+        self.conf(['--config-file', paths[0]])
+
+        with open(paths[0], 'w') as f:
+            f.write('[DEFAULT]\nfoo = one\n')
+
+        self.assertFalse(self.conf.reload_config_files())
+        self.assertEqual(1, self.conf.foo)
+
 
 class ConfigFileMutateTestCase(BaseTestCase):
     def setUp(self):
@@ -3001,6 +3114,466 @@ class ConfigFileMutateTestCase(BaseTestCase):
         self.assertIn('cli', dests)
         self.assertIn('foo', dests)
 
+    def _test_diff_changed(self, old, new, args=()):
+        paths = self.create_tempfiles([('1', old), ('2', new)])
+        self.conf(['--config-file', paths[0]] + list(args))
+        old_ns = self.conf._namespace
+        shutil.copy(paths[1], paths[0])
+        diff = self.conf.mutate_config_files()
+        # The opts compared are limited to those named by changed entries,
+        # but the result is the same as comparing all opts.
+        new_ns = self.conf._mutable_ns
+        assert new_ns is not None
+        self.assertEqual(self.conf._diff_ns(old_ns, new_ns), diff)
+        return diff
+
+    def test_diff_only_changed_opts(self):
+        for i in range(10):
+            self.conf.register_opt(cfg.StrOpt(f'foo{i}', mutable=True))
+            self.conf.register_opt(
+                cfg.StrOpt(f'boo{i}', mutable=True), group=self.my_group
+            )
+        paths = self.create_tempfiles(
+            [
+                ('1', '[DEFAULT]\nfoo1 = a\nfoo2 = a\n[group]\nboo1 = a\n'),
+                ('2', '[DEFAULT]\nfoo1 = a\nfoo2 = b\n[GROUP]\nboo3 = a\n'),
+            ]
+        )
+        self.conf(['--config-file', paths[0]])
+        shutil.copy(paths[1], paths[0])
+        mutable_ns = self.conf._reload_config_files()
+        assert self.conf._namespace is not None
+        changed = self.conf._changed_opt_infos(
+            self.conf._namespace, mutable_ns
+        )
+        self.assertEqual(
+            [(None, 'foo2'), ('group', 'boo1'), ('group', 'boo3')],
+            [(g and g.name, info['opt'].name) for info, g in changed],
+        )
+
+    def test_diff_deprecated_names(self):
+        self.conf.register_opt(
+            cfg.StrOpt('foo', mutable=True, deprecated_name='oldfoo')
+        )
+        self.conf.register_opt(
+            cfg.StrOpt('boo', mutable=True, deprecated_group='oldgroup'),
+            group=self.my_group,
+        )
+        diff = self._test_diff_changed(
+            '[DEFAULT]\noldfoo = a\n[oldgroup]\nboo = a\n',
+            '[DEFAULT]\noldfoo = b\n[oldgroup]\nboo = b\n',
+        )
+        self.assertEqual(
+            {(None, 'foo'): ('a', 'b'), ('group', 'boo'): ('a', 'b')}, diff
+        )
+
+    def test_diff_files_added(self):
+        self.conf.register_opt(cfg.StrOpt('foo', mutable=True))
+        self.conf.register_opt(cfg.MultiStrOpt('boo', mutable=True))
+        config_dir = tempfile.mkdtemp()
+        self.tempdirs.append(config_dir)
+        diff = self._test_diff_changed(
+            '[DEFAULT]\nfoo = a\nboo = a\n',
+            '[DEFAULT]\nfoo = a\nboo = a\n',
+            ['--config-dir', config_dir],
+        )
+        self.assertEqual({}, diff)
+        self.create_tempfiles(
+            [(os.path.join(config_dir, 'extra'), '[DEFAULT]\nboo = b\n')]
+        )
+        self.assertEqual(
+            {(None, 'boo'): (['a'], ['a', 'b'])},
+            self.conf.mutate_config_files(),
+        )
+
+    def test_diff_cli_value_from_file(self):
+        self.conf.register_cli_opt(
+            cfg.StrOpt('foo', mutable=True), group=self.my_group
+        )
+        diff = self._test_diff_changed(
+            '[group]\nfoo = a\n', '[group]\nfoo = b\n'
+        )
+        self.assertEqual({('group', 'foo'): ('a', 'b')}, diff)
+
+    def test_warn_immutability_deprecated_name(self):
+        self.fake_logger = self.useFixture(fixtures.FakeLogger())
+        self.conf.register_opt(cfg.StrOpt('foo', deprecated_name='oldfoo'))
+        self._test_diff_changed(
+            '[DEFAULT]\noldfoo = a\n', '[DEFAULT]\noldfoo = b\n'
+        )
+        self.assertIn(
+            'Ignoring change to immutable option DEFAULT.foo',
+            self.fake_logger.output,
+        )
+
+
+class MutateHooksTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.conf.register_opt(cfg.StrOpt('foo', mutable=True))
+        self.paths = self.create_tempfiles(
+            [('1', '[DEFAULT]\nfoo = a\n'), ('2', '[DEFAULT]\nfoo = b\n')]
+        )
+        self.conf(['--config-file', self.paths[0]])
+        shutil.copy(self.paths[1], self.paths[0])
+        self.fake_logger = self.useFixture(fixtures.FakeLogger())
+
+    def _fail(self, conf, fresh):
+        raise ValueError('hook failed')
+
+    def _report(self):
+        report = self.conf.mutate_report()
+        assert report is not None
+        return report
+
+    def test_serial(self):
+        calls = []
+        self.conf.register_mutate_hook(lambda conf, fresh: calls.append(1))
+        self.assertIsNone(self.conf.mutate_report())
+        fresh = self.conf.mutate_config_files()
+        report = self._report()
+        self.assertEqual(fresh, report.changed)
+        self.assertEqual([1], calls)
+        self.assertEqual(1, len(report.hooks))
+        self.assertIsNone(report.hooks[0].exception)
+        self.assertFalse(report.hooks[0].timed_out)
+        self.assertGreaterEqual(report.duration, report.hooks[0].duration)
+
+    def test_serial_exception_raised(self):
+        self.conf.register_mutate_hook(self._fail)
+        self.assertRaises(ValueError, self.conf.mutate_config_files)
+        (result,) = self._report().hooks
+        self.assertEqual(self._fail, result.hook)
+        self.assertIsInstance(result.exception, ValueError)
+
+    def test_concurrent(self):
+        barrier = threading.Barrier(2, timeout=10)
+        self.conf.register_mutate_hook(lambda conf, fresh: barrier.wait())
+        self.conf.register_mutate_hook(lambda conf, fresh: barrier.wait())
+        self.conf.enable_concurrent_mutate_hooks()
+        self.conf.mutate_config_files()
+        results = self._report().hooks
+        self.assertEqual(2, len(results))
+        for result in results:
+            self.assertIsNone(result.exception)
+            self.assertIsNotNone(result.duration)
+
+    def test_concurrent_exception_reported(self):
+        calls = []
+        self.conf.register_mutate_hook(self._fail)
+        self.conf.register_mutate_hook(lambda conf, fresh: calls.append(1))
+        self.conf.enable_concurrent_mutate_hooks(max_workers=1)
+        self.assertEqual(
+            {(None, 'foo'): ('a', 'b')}, self.conf.mutate_config_files()
+        )
+        self.assertEqual([1], calls)
+        errors = [r.exception for r in self._report().hooks if r.exception]
+        self.assertEqual(1, len(errors))
+        self.assertIsInstance(errors[0], ValueError)
+        self.assertIn('hook failed', self.fake_logger.output)
+
+    def test_concurrent_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.conf.register_mutate_hook(lambda conf, fresh: release.wait(10))
+        self.conf.enable_concurrent_mutate_hooks(timeout=0.05)
+        self.conf.mutate_config_files()
+        (result,) = self._report().hooks
+        self.assertTrue(result.timed_out)
+        self.assertIsNone(result.duration)
+        self.assertIn('did not finish within 0.05', self.fake_logger.output)
+
+    def test_concurrent_timeout_process_exits(self):
+        path = self.create_tempfiles([('exit', '[DEFAULT]\nfoo = a\n')])[0]
+        code = (
+            'import threading, sys\n'
+            'from oslo_config import cfg\n'
+            'conf = cfg.ConfigOpts()\n'
+            'conf.register_opt(cfg.StrOpt("foo", mutable=True))\n'
+            'conf(["--config-file", sys.argv[1]])\n'
+            'conf.register_mutate_hook(\n'
+            '    lambda conf, fresh: threading.Event().wait())\n'
+            'conf.enable_concurrent_mutate_hooks(timeout=0.05)\n'
+            'conf.mutate_config_files()\n'
+            'print(conf.mutate_report().hooks[0].timed_out)\n'
+        )
+        output = subprocess.check_output(
+            [sys.executable, '-c', code, path],
+            stderr=subprocess.DEVNULL,
+            timeout=30,
+        )
+        self.assertEqual(b'True', output.strip())
+
+    def test_concurrent_timeout_per_hook(self):
+        for _ in range(3):
+            self.conf.register_mutate_hook(lambda conf, fresh: time.sleep(0.2))
+        self.conf.enable_concurrent_mutate_hooks(max_workers=1, timeout=0.5)
+        self.conf.mutate_config_files()
+        self.assertEqual(
+            [False] * 3, [r.timed_out for r in self._report().hooks]
+        )
+
+    def test_concurrent_queued_after_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        started = []
+
+        def hook(conf, fresh):
+            started.append(1)
+            release.wait(10)
+
+        self.conf.register_mutate_hook(hook)
+        self.conf.register_mutate_hook(lambda conf, fresh: hook(conf, fresh))
+        self.conf.enable_concurrent_mutate_hooks(max_workers=1, timeout=0.05)
+        self.conf.mutate_config_files()
+        self.assertEqual([1, 1], started)
+        self.assertEqual(
+            [True, True], [r.timed_out for r in self._report().hooks]
+        )
+
+    def test_disable_concurrent(self):
+        self.conf.register_mutate_hook(self._fail)
+        self.conf.enable_concurrent_mutate_hooks()
+        self.conf.disable_concurrent_mutate_hooks()
+        self.assertRaises(ValueError, self.conf.mutate_config_files)
+
+    def test_invalid_args(self):
+        self.assertRaises(
+            ValueError, self.conf.enable_concurrent_mutate_hooks, 0
+        )
+        self.assertRaises(
+            ValueError, self.conf.enable_concurrent_mutate_hooks, timeout=0
+        )
+
+
+class SubscribeTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.group = cfg.OptGroup('group')
+        self.conf.register_opt(cfg.IntOpt('foo', mutable=True))
+        self.conf.register_opt(cfg.StrOpt('bar-baz', mutable=True))
+        self.conf.register_opt(
+            cfg.IntOpt('boo', mutable=True), group=self.group
+        )
+        self.conf.register_opt(
+            cfg.IntOpt('bam', mutable=True), group=self.group
+        )
+        self.path = self.create_tempfiles(
+            [('1', '[DEFAULT]\nfoo = 1\n[group]\nboo = 1\nbam = 1\n')]
+        )[0]
+        self.conf(['--config-file', self.path])
+        self.calls = []
+
+    def _callback(self, conf, key, old, new):
+        self.calls.append((key, old, new))
+
+    def _mutate(self, contents):
+        with open(self.path, 'w') as f:
+            f.write(contents)
+        self.conf.mutate_config_files()
+
+    def test_option(self):
+        self.conf.subscribe((None, 'foo'), self._callback)
+        self._mutate('[DEFAULT]\nfoo = 2\n[group]\nboo = 2\nbam = 1\n')
+        self.assertEqual([((None, 'foo'), 1, 2)], self.calls)
+
+    def test_option_in_group(self):
+        self.conf.subscribe((self.group, 'boo'), self._callback)
+        self._mutate('[DEFAULT]\nfoo = 2\n[group]\nboo = 2\nbam = 1\n')
+        self.assertEqual([(('group', 'boo'), 1, 2)], self.calls)
+
+    def test_group(self):
+        self.conf.subscribe('group', self._callback)
+        self._mutate('[DEFAULT]\nfoo = 2\n[group]\nboo = 2\nbam = 3\n')
+        self.assertEqual(
+            [(('group', 'bam'), 1, 3), (('group', 'boo'), 1, 2)],
+            sorted(self.calls),
+        )
+
+    def test_default_group(self):
+        self.conf.subscribe('DEFAULT', self._callback)
+        self._mutate('[DEFAULT]\nbar_baz = a\n[group]\nboo = 2\nbam = 1\n')
+        self.assertEqual(
+            [((None, 'bar-baz'), None, 'a'), ((None, 'foo'), 1, None)],
+            sorted(self.calls),
+        )
+
+    def test_not_called_when_unchanged(self):
+        self.conf.subscribe((None, 'foo'), self._callback)
+        self.conf.subscribe('group', self._callback)
+        self._mutate('[DEFAULT]\nfoo = 1\n[group]\nboo = 1\nbam = 1\n')
+        self.assertEqual([], self.calls)
+
+    def test_called_once(self):
+        self.conf.subscribe(('group', 'boo'), self._callback)
+        self.conf.subscribe(('group', 'boo'), self._callback)
+        self.conf.subscribe(self.group, self._callback)
+        self._mutate('[DEFAULT]\nfoo = 1\n[group]\nboo = 2\nbam = 1\n')
+        self.assertEqual([(('group', 'boo'), 1, 2)], self.calls)
+
+    def test_unsubscribe(self):
+        self.conf.subscribe(('group', 'boo'), self._callback)
+        self.conf.unsubscribe(('group', 'boo'), self._callback)
+        self.conf.unsubscribe('group', self._callback)
+        self._mutate('[DEFAULT]\nfoo = 1\n[group]\nboo = 2\nbam = 1\n')
+        self.assertEqual([], self.calls)
+        self.assertEqual({}, self.conf._subscribers)
+
+    def test_not_called_when_overridden(self):
+        self.conf.subscribe((None, 'foo'), self._callback)
+        self.conf.subscribe('group', self._callback)
+        self.conf.set_override('foo', 5)
+        self.conf.set_override('boo', 5, group='group')
+        self._mutate('[DEFAULT]\nfoo = 2\n[group]\nboo = 2\nbam = 3\n')
+        self.assertEqual([(('group', 'bam'), 1, 3)], self.calls)
+
+    def test_called_before_hooks(self):
+        self.conf.subscribe((None, 'foo'), self._callback)
+        self.conf.register_mutate_hook(
+            lambda conf, fresh: self.calls.append('hook')
+        )
+        self._mutate('[DEFAULT]\nfoo = 2\n[group]\nboo = 1\nbam = 1\n')
+        self.assertEqual([((None, 'foo'), 1, 2), 'hook'], self.calls)
+
+    def test_option_by_dest(self):
+        self.conf.subscribe((None, 'bar_baz'), self._callback)
+        self._mutate('[DEFAULT]\nbar_baz = a\n[group]\nboo = 1\nbam = 1\n')
+        self.assertEqual([((None, 'bar-baz'), None, 'a')], self.calls)
+
+    def test_failing_subscriber(self):
+        logger = self.useFixture(fixtures.FakeLogger())
+
+        def fail(conf, key, old, new):
+            raise ValueError('subscriber failed')
+
+        self.conf.subscribe((None, 'foo'), fail)
+        self.conf.subscribe((None, 'foo'), self._callback)
+        self.conf.register_mutate_hook(
+            lambda conf, fresh: self.calls.append('hook')
+        )
+        self._mutate('[DEFAULT]\nfoo = 2\n[group]\nboo = 1\nbam = 1\n')
+        self.assertEqual([((None, 'foo'), 1, 2), 'hook'], self.calls)
+        self.assertIn('subscriber failed', logger.output)
+
+    def test_invalid_value(self):
+        self.useFixture(fixtures.FakeLogger())
+        self.conf.subscribe('group', self._callback)
+        self._mutate('[DEFAULT]\nfoo = 1\n[group]\nboo = x\nbam = 2\n')
+        self.assertEqual([(('group', 'bam'), 1, 2)], self.calls)
+
+
+class GenerationTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.group = cfg.OptGroup('group')
+        self.conf.register_opt(cfg.IntOpt('foo', mutable=True))
+        self.conf.register_opt(
+            cfg.IntOpt(
+                'boo',
+                mutable=True,
+                deprecated_opts=[cfg.DeprecatedOpt('oldboo')],
+            ),
+            group=self.group,
+        )
+        self.conf.register_opt(cfg.IntOpt('bam'), group=self.group)
+        self.path = self.create_tempfiles(
+            [('1', '[DEFAULT]\nfoo = 1\n[group]\nboo = 1\nbam = 1\n')]
+        )[0]
+        self.conf(['--config-file', self.path])
+
+    def _generations(self):
+        return (
+            self.conf.generation(),
+            self.conf.generation('DEFAULT'),
+            self.conf.generation(name='foo'),
+            self.conf.generation(self.group),
+            self.conf.generation('group', 'boo'),
+            self.conf.generation('group', 'bam'),
+        )
+
+    def _write(self, contents):
+        with open(self.path, 'w') as f:
+            f.write(contents)
+
+    def _assertBumped(self, before, *bumped):
+        after = self._generations()
+        for i, (old, new) in enumerate(zip(before, after)):
+            if i in bumped:
+                self.assertGreater(new, old)
+            else:
+                self.assertEqual(old, new)
+
+    def test_override(self):
+        before = self._generations()
+        self.conf.set_override('boo', 2, group='group')
+        self._assertBumped(before, 0, 3, 4)
+        before = self._generations()
+        self.conf.set_override('boo', 2, group='group')
+        self._assertBumped(before)
+        self.conf.clear_override('boo', group='group')
+        self._assertBumped(before, 0, 3, 4)
+        before = self._generations()
+        self.conf.clear_override('boo', group='group')
+        self._assertBumped(before)
+
+    def test_default(self):
+        before = self._generations()
+        self.conf.set_default('foo', 2)
+        self._assertBumped(before, 0, 1, 2)
+        before = self._generations()
+        self.conf.clear_default('foo')
+        self._assertBumped(before, 0, 1, 2)
+
+    def test_deprecated_name(self):
+        before = self._generations()
+        self.conf.set_override('oldboo', 2)
+        self._assertBumped(before, 0, 3, 4)
+        self.assertEqual(
+            self.conf.generation('group', 'boo'),
+            self.conf.generation(name='oldboo'),
+        )
+
+    def test_register(self):
+        before = self._generations()
+        self.conf.register_opt(cfg.IntOpt('bam'), group=self.group)
+        self._assertBumped(before)
+        self.conf.register_opt(cfg.IntOpt('baz'), group=self.group)
+        self._assertBumped(before, 0, 3)
+        self.assertEqual(
+            self.conf.generation(), self.conf.generation('group', 'baz')
+        )
+        before = self._generations()
+        self.conf.register_group(cfg.OptGroup('other'))
+        self._assertBumped(before, 0)
+        self.assertEqual(self.conf.generation(), self.conf.generation('other'))
+
+    def test_reload(self):
+        before = self._generations()
+        self._write('[DEFAULT]\nfoo = 1\n[group]\nboo = 1\nbam = 2\n')
+        self.assertTrue(self.conf.reload_config_files())
+        self._assertBumped(before, 0, 3, 5)
+        before = self._generations()
+        self.assertTrue(self.conf.reload_config_files())
+        self._assertBumped(before)
+
+    def test_mutate(self):
+        before = self._generations()
+        self._write('[DEFAULT]\nfoo = 2\n[group]\nboo = 1\nbam = 2\n')
+        self.conf.mutate_config_files()
+        self._assertBumped(before, 0, 1, 2)
+
+    def test_reset(self):
+        self.conf.set_override('boo', 2, group='group')
+        before = self._generations()
+        self.conf.reset()
+        self._assertBumped(before, 0, 1, 2, 3, 4, 5)
+
+    def test_unknown(self):
+        self.assertRaises(
+            cfg.NoSuchOptError, self.conf.generation, 'group', 'nope'
+        )
+        self.assertRaises(cfg.NoSuchGroupError, self.conf.generation, 'nope')
+
 
 class OptGroupsTestCase(BaseTestCase):
     def test_arg_group(self):
@@ -3412,6 +3985,62 @@ class ReRegisterOptTestCase(BaseTestCase):
         self.assertTrue(self.conf.register_opt(opt, group=group))
         self.assertFalse(self.conf.register_opt(opt, group='blaa'))
 
+    def test_re_register_equal_opt(self):
+        self.assertTrue(self.conf.register_opt(cfg.StrOpt('foo')))
+        opt = cfg.StrOpt('foo')
+        opt._set_location = cfg.LocationInfo(
+            cfg.Locations.opt_default, 'elsewhere'
+        )
+        self.assertFalse(self.conf.register_opt(opt))
+
+    def test_re_register_after_set_defaults(self):
+        opts = [cfg.StrOpt('foo', default='foo')]
+        self.conf.register_opts(opts)
+        cfg.set_defaults(opts, foo='bar')
+        self.assertFalse(self.conf.register_opt(opts[0]))
+        self.assertFalse(
+            self.conf.register_opt(cfg.StrOpt('foo', default='bar'))
+        )
+        self.assertRaises(
+            cfg.DuplicateOptError,
+            self.conf.register_opt,
+            cfg.StrOpt('foo', default='foo'),
+        )
+
+    def _cli_opts(self):
+        return [
+            (item['opt'].dest, item['group'] and item['group'].name)
+            for item in self.conf._cli_opts
+            if item['opt'].dest != 'shell_completion'
+        ]
+
+    def test_cli_re_register_opt(self):
+        self.conf.register_cli_opt(cfg.StrOpt('foo'))
+        self.conf.register_cli_opt(cfg.StrOpt('pos', positional=True))
+        self.conf.register_cli_opt(cfg.StrOpt('bar'))
+        self.assertFalse(self.conf.register_cli_opt(cfg.StrOpt('foo')))
+        self.assertFalse(
+            self.conf.register_cli_opt(cfg.StrOpt('pos', positional=True))
+        )
+        self.assertEqual(
+            [('bar', None), ('foo', None), ('pos', None)], self._cli_opts()
+        )
+
+    def test_cli_re_register_opt_in_group(self):
+        opt = cfg.StrOpt('foo')
+        self.conf.register_cli_opt(opt, group='blaa')
+        self.conf.register_cli_opt(opt)
+        self.conf.register_cli_opt(opt, group='blaa')
+        self.assertEqual([('foo', None), ('foo', 'blaa')], self._cli_opts())
+
+    def test_cli_re_register_after_unregister(self):
+        opt = cfg.StrOpt('foo')
+        self.conf.register_cli_opt(opt)
+        self.conf.unregister_opt(opt)
+        self.assertEqual([], self._cli_opts())
+        self.assertTrue(self.conf.register_cli_opt(opt))
+        self.assertEqual([('foo', None)], self._cli_opts())
+
 
 class RegisterOptNameTestCase(BaseTestCase):
     def test_register_opt_with_disallow_name(self):
@@ -3536,6 +4165,43 @@ class TemplateSubstitutionTestCase(BaseTestCase):
         self.assertTrue(hasattr(self.conf, 'bar'))
         self.assertEqual('foo-somethin$k2', self.conf.bar)
 
+    def test_str_sub_unknown_and_invalid_left_alone(self):
+        self._prep_test_str_sub(foo_default='blaa')
+
+        paths = self.create_tempfiles(
+            [('test', '[DEFAULT]\nbar=$foo-${foo}-$ -$$-\\$foo\n')]
+        )
+
+        self.conf(['--config-file', paths[0]])
+
+        self.assertEqual('blaa-blaa-$ -$-$foo', self.conf.bar)
+
+    def test_str_sub_dotted_group_reference(self):
+        self.conf.register_group(cfg.OptGroup('ba'))
+        self.conf.register_cli_opt(cfg.StrOpt('foo', default='blaa'), 'ba')
+        self.conf.register_cli_opt(cfg.StrOpt('bar', default='${ba.foo}/x'))
+
+        self.conf([])
+
+        self.assertEqual('blaa/x', self.conf.bar)
+
+    def test_parse_template_is_cached(self):
+        parsed = cfg._parse_template(cfg.ConfigOpts.Template, '$a.b/$c')
+        self.assertIs(
+            parsed, cfg._parse_template(cfg.ConfigOpts.Template, '$a.b/$c')
+        )
+        self.assertEqual(
+            (
+                cfg._TemplateRef('a.b', 'a', 'b', '$a.b'),
+                '/',
+                cfg._TemplateRef('c', None, 'c', '$c'),
+            ),
+            parsed,
+        )
+        self.assertEqual(
+            '$x', cfg._parse_template(cfg.ConfigOpts.Template, '\\$x')
+        )
+
     def test_str_sub_group_from_default(self):
         self.conf.register_cli_opt(cfg.StrOpt('foo', default='blaa'))
         self.conf.register_group(cfg.OptGroup('ba'))
@@ -3788,6 +4454,102 @@ class TemplateSubstitutionTestCase(BaseTestCase):
         self.assertTrue(hasattr(self.conf, 'dt'))
         self.assertEqual('blaa', self.conf.dt['floo'])
 
+    def test_str_sub_circular_reference(self):
+        self.conf.register_group(cfg.OptGroup('ba'))
+        self.conf.register_opt(cfg.StrOpt('foo', default='$bar'))
+        self.conf.register_opt(cfg.StrOpt('bar', default='x-${ba.r}'))
+        self.conf.register_opt(cfg.StrOpt('r', default='$foo'), group='ba')
+
+        self.conf([])
+
+        exc = self.assertRaises(
+            cfg.TemplateSubstitutionError, getattr, self.conf, 'foo'
+        )
+        self.assertEqual(
+            'template substitution error: circular reference detected: '
+            'foo -> bar -> ba.r -> foo',
+            str(exc),
+        )
+
+    def test_str_sub_self_reference(self):
+        self.conf.register_opt(cfg.StrOpt('foo', default='$foo'))
+
+        self.conf([])
+
+        self.assertRaises(
+            cfg.TemplateSubstitutionError, getattr, self.conf, 'foo'
+        )
+
+    def test_str_sub_long_chain(self):
+        count = sys.getrecursionlimit() * 2
+        self.conf.register_opts(
+            [
+                cfg.StrOpt(f'opt{i}', default=f'${{opt{i + 1}}}/{i}')
+                for i in range(count)
+            ]
+            + [cfg.StrOpt(f'opt{count}', default='end')]
+        )
+
+        self.conf([])
+
+        with mock.patch.object(
+            self.conf, '_do_get', wraps=self.conf._do_get
+        ) as do_get:
+            value = self.conf.opt0
+
+        self.assertEqual(
+            'end/' + '/'.join(str(i) for i in reversed(range(count))), value
+        )
+        # every link is attempted once before and once after its reference
+        # has been resolved
+        self.assertEqual(2 * count + 1, do_get.call_count)
+
+    def test_str_sub_concurrent_lookups(self):
+        self.conf.register_opts(
+            [
+                cfg.StrOpt('a', default='$c/a'),
+                cfg.StrOpt('b', default='$c/b'),
+                cfg.StrOpt('c', default='c'),
+            ]
+        )
+
+        self.conf([])
+
+        # Interleave two lookups so that the first one started finishes
+        # first, while the second one is still resolving.
+        entered = {'a': threading.Event(), 'b': threading.Event()}
+        release = {'a': threading.Event(), 'b': threading.Event()}
+        do_get = self.conf._do_get
+
+        def blocking_do_get(name, group=None, namespace=None):
+            if name in entered and not entered[name].is_set():
+                entered[name].set()
+                release[name].wait(5)
+            return do_get(name, group, namespace)
+
+        results = {}
+
+        def lookup(name):
+            results[name] = self.conf._get(name)
+
+        with mock.patch.object(self.conf, '_do_get', blocking_do_get):
+            thread_a = threading.Thread(target=lookup, args=('a',))
+            thread_b = threading.Thread(target=lookup, args=('b',))
+            thread_a.start()
+            self.assertTrue(entered['a'].wait(5))
+            thread_b.start()
+            self.assertTrue(entered['b'].wait(5))
+            release['a'].set()
+            thread_a.join(5)
+            release['b'].set()
+            thread_b.join(5)
+
+        self.assertEqual({'a': 'c/a', 'b': 'c/b'}, results)
+        self.assertIsNone(getattr(self.conf._resolving, 'memo', None))
+        loc = self.conf.get_location('a')
+        assert loc is not None
+        self.assertEqual(cfg.Locations.opt_default, loc.location)
+
 
 class ConfigDirTestCase(BaseTestCase):
     def test_config_dir(self):
@@ -3960,6 +4722,680 @@ class ReparseTestCase(BaseTestCase):
         self.assertEqual('r', self.conf.blaa.foo)
 
 
+class ParserCacheTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.conf.register_cli_opt(cfg.StrOpt('foo', default='r'))
+
+    def test_parser_reused(self):
+        self.conf(['--foo', 'a'])
+        parser = self.conf._oparser
+        self.assertEqual('a', self.conf.foo)
+        self.conf.reset()
+        self.conf(['--foo', 'b'])
+        self.assertIs(parser, self.conf._oparser)
+        self.assertEqual('b', self.conf.foo)
+
+    def test_parser_rebuilt_for_new_cli_opt(self):
+        self.conf(['--foo', 'a'])
+        parser = self.conf._oparser
+        self.conf.reset()
+        self.conf.register_cli_opt(cfg.StrOpt('bar'), group='blaa')
+        self.conf(['--blaa-bar', 'b'])
+        self.assertIsNot(parser, self.conf._oparser)
+        self.assertEqual('b', self.conf.blaa.bar)
+
+    def test_parser_rebuilt_for_unregistered_cli_opt(self):
+        opt = cfg.StrOpt('bar')
+        self.conf.register_cli_opt(opt)
+        self.conf(['--bar', 'a'])
+        self.conf.reset()
+        self.conf.unregister_opt(opt)
+        self.assertRaises(SystemExit, self.conf, ['--bar', 'b'])
+
+    def test_parser_rebuilt_for_new_metadata(self):
+        self.conf(['--foo', 'a'], usage='foo')
+        parser = self.conf._oparser
+        self.conf(['--foo', 'a'], usage='bar')
+        self.assertIsNot(parser, self.conf._oparser)
+        parser = self.conf._oparser
+        paths = self.create_tempfiles([('test', '[DEFAULT]\nfoo = b\n')])
+        self.conf(['--foo', 'a'], usage='bar', default_config_files=paths)
+        self.assertIsNot(parser, self.conf._oparser)
+        self.assertEqual('a', self.conf.foo)
+
+    def test_parser_not_recreated_for_same_metadata(self):
+        self.conf(['--foo', 'a'])
+        with mock.patch.object(
+            cfg, '_CachedArgumentParser', wraps=cfg._CachedArgumentParser
+        ) as parser_class:
+            self.conf(['--foo', 'b'])
+        parser_class.assert_not_called()
+        self.assertEqual('b', self.conf.foo)
+
+    def test_parser_rebuilt_for_changed_help(self):
+        opt = self.conf._get_opt_info('foo').opt
+        self.conf(['--foo', 'a'])
+        opt.help = 'new help'
+        self.conf(['--foo', 'a'])
+        out = io.StringIO()
+        self.conf.print_help(file=out)
+        self.assertIn('new help', out.getvalue())
+
+    def test_parser_rebuilt_for_changed_choices(self):
+        opt = cfg.StrOpt('bar', choices=['a'])
+        self.conf.register_cli_opt(opt)
+        self.conf(['--bar', 'a'])
+        type_ = opt.type
+        assert isinstance(type_, types.String) and type_.choices is not None
+        type_.choices['b'] = None
+        self.conf(['--bar', 'b'])
+        out = io.StringIO()
+        self.conf.print_help(file=out)
+        self.assertIn('Allowed values: a, b', out.getvalue())
+
+
+class ConfigOnlyArgsTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.conf.register_cli_opt(cfg.StrOpt('foo', default='r'))
+        self.paths = self.create_tempfiles(
+            [('1', '[DEFAULT]\nfoo = a\n'), ('2', '[DEFAULT]\nfoo = b\n')]
+        )
+        self.parse_args = self.useFixture(
+            fixtures.MockPatchObject(
+                cfg._CachedArgumentParser,
+                'parse_args',
+                side_effect=cfg._CachedArgumentParser.parse_args,
+                autospec=True,
+            )
+        ).mock
+
+    def test_config_file_and_dir(self):
+        config_dir = os.path.dirname(self.paths[0])
+        self.conf(
+            [
+                '--config-file',
+                self.paths[0],
+                '--config-file=' + self.paths[1],
+                '--config-dir',
+                config_dir,
+            ]
+        )
+        self.assertFalse(self.parse_args.called)
+        self.assertEqual(self.paths, self.conf.config_file)
+        self.assertEqual([config_dir], self.conf.config_dir)
+        self.assertEqual('a', self.conf.foo)
+
+    def test_no_args(self):
+        self.conf([])
+        self.assertFalse(self.parse_args.called)
+        self.assertEqual('r', self.conf.foo)
+
+    def test_reload(self):
+        self.conf(['--config-file', self.paths[0]])
+        with open(self.paths[0], 'w') as f:
+            f.write('[DEFAULT]\nfoo = c\n')
+        self.conf.reload_config_files()
+        self.assertFalse(self.parse_args.called)
+        self.assertEqual('c', self.conf.foo)
+
+    def _assert_parsed(self, args):
+        self.conf(args)
+        self.assertTrue(self.parse_args.called)
+
+    def test_other_opt(self):
+        self._assert_parsed(['--config-file', self.paths[0], '--foo', 'c'])
+        self.assertEqual('c', self.conf.foo)
+
+    def test_abbreviated_opt(self):
+        self._assert_parsed(['--config-f', self.paths[1]])
+        self.assertEqual('b', self.conf.foo)
+
+    def test_missing_value(self):
+        self.assertRaises(SystemExit, self.conf, ['--config-file'])
+        self.assertTrue(self.parse_args.called)
+
+    def test_help(self):
+        stdout = io.StringIO()
+        self.useFixture(fixtures.MonkeyPatch('sys.stdout', stdout))
+        self.assertRaises(SystemExit, self.conf, ['--help'])
+        self.assertIn('--foo FOO', stdout.getvalue())
+
+    def test_positional_opt(self):
+        self.conf.register_cli_opt(cfg.StrOpt('bar', positional=True))
+        self._assert_parsed(['--config-file', self.paths[0], 'c'])
+        self.assertEqual('c', self.conf.bar)
+
+    def test_print_help(self):
+        self.conf(['--config-file', self.paths[0]])
+        f = io.StringIO()
+        self.conf.print_help(file=f)
+        self.assertIn('--foo FOO', f.getvalue())
+
+    def test_duplicate_option_string(self):
+        self.conf.register_cli_opt(cfg.StrOpt('bar', short='b'))
+        self.conf.register_cli_opt(cfg.StrOpt('baz', short='b'))
+        self.assertRaises(
+            cfg.DuplicateOptError,
+            self.conf,
+            ['--config-file', self.paths[0]],
+        )
+
+
+class FileWatcherTestCase(BaseTestCase):
+    scenarios = [
+        ('inotify', dict(use_inotify=True)),
+        ('poll', dict(use_inotify=False)),
+    ]
+    use_inotify: bool
+
+    def setUp(self):
+        super().setUp()
+        self.conf.register_opt(cfg.StrOpt('foo', mutable=True))
+        self.path = self.create_tempfiles([('1', '[DEFAULT]\nfoo = a\n')])[0]
+        self.reloaded = threading.Event()
+        self.conf.register_mutate_hook(lambda conf, fresh: self.reloaded.set())
+        self.addCleanup(self.conf.stop_file_watcher)
+
+    def _start(self, args=None, debounce=0.05):
+        if args is None:
+            args = ['--config-file', self.path]
+        self.conf(args)
+        self.conf.start_file_watcher(
+            debounce=debounce, interval=0.01, use_inotify=self.use_inotify
+        )
+        info = self._info()
+        self.assertTrue(info.running)
+        if self.use_inotify and sys.platform.startswith('linux'):
+            self.assertEqual('inotify', info.backend)
+        else:
+            self.assertEqual('poll', info.backend)
+
+    def _info(self):
+        info = self.conf.file_watcher_info()
+        assert info is not None
+        return info
+
+    def _write(self, path, value):
+        with open(path, 'w') as f:
+            f.write(f'[DEFAULT]\nfoo = {value}\n')
+
+    def _wait_for_reload(self):
+        self.assertTrue(self.reloaded.wait(10))
+        self.reloaded.clear()
+
+    def test_not_initialized(self):
+        self.assertIsNone(self.conf.file_watcher_info())
+        self.assertRaises(
+            cfg.NotInitializedError, self.conf.start_file_watcher
+        )
+
+    def test_invalid_args(self):
+        self.conf([])
+        self.assertRaises(
+            ValueError, self.conf.start_file_watcher, debounce=-1
+        )
+        self.assertRaises(ValueError, self.conf.start_file_watcher, interval=0)
+        self.assertIsNone(self.conf.file_watcher_info())
+
+    def test_reload_on_change(self):
+        self._start()
+        self._write(self.path, 'b')
+        self._wait_for_reload()
+        self.assertEqual('b', self.conf.foo)
+        info = self._info()
+        self.assertEqual(1, info.reloads)
+        self.assertEqual(0, info.failures)
+        self.assertEqual(info.last_duration, info.total_duration)
+
+    def test_burst_coalesced(self):
+        self._start(debounce=0.5)
+        for value in ('b', 'cc', 'ddd', 'eeee'):
+            self._write(self.path, value)
+            time.sleep(0.02)
+        self._wait_for_reload()
+        self.assertEqual('eeee', self.conf.foo)
+        self.assertFalse(self.reloaded.wait(0.7))
+        self.assertEqual(1, self._info().reloads)
+
+    def test_file_replaced(self):
+        self._start()
+        for value in ('b', 'cc'):
+            self._write(self.path + '.new', value)
+            os.replace(self.path + '.new', self.path)
+            self._wait_for_reload()
+            self.assertEqual(value, self.conf.foo)
+
+    def test_config_dir(self):
+        config_dir = tempfile.mkdtemp()
+        self._start(['--config-dir', config_dir])
+        self._write(os.path.join(config_dir, 'new.conf'), 'b')
+        self._wait_for_reload()
+        self.assertEqual('b', self.conf.foo)
+
+    def test_failure_counted(self):
+        self.useFixture(fixtures.FakeLogger())
+        self._start()
+        with open(self.path, 'w') as f:
+            f.write('[DEFAULT\n')
+        for _ in range(1000):
+            if self._info().failures:
+                break
+            time.sleep(0.01)
+        info = self._info()
+        self.assertEqual((0, 1), (info.reloads, info.failures))
+        self.assertEqual('a', self.conf.foo)
+
+    def test_stop(self):
+        self._start()
+        self.conf.stop_file_watcher()
+        self.assertFalse(self._info().running)
+        self._write(self.path, 'b')
+        self.assertFalse(self.reloaded.wait(0.2))
+        self.assertEqual('a', self.conf.foo)
+
+    def test_stop_timeout_releases_descriptors(self):
+        entered = threading.Event()
+        release = threading.Event()
+
+        def hook(conf, fresh):
+            entered.set()
+            release.wait(10)
+
+        self.conf.register_mutate_hook(hook)
+        self._start()
+        watcher = self.conf._file_watcher
+        assert watcher is not None and watcher._thread is not None
+        self._write(self.path, 'b')
+        self.assertTrue(entered.wait(10))
+        self.conf.stop_file_watcher(timeout=0.01)
+        self.assertTrue(watcher._thread.is_alive())
+        release.set()
+        watcher._thread.join(10)
+        self.assertFalse(watcher._thread.is_alive())
+        self.assertIsNone(watcher._inotify)
+        self.assertEqual((-1, -1), (watcher._wake_r, watcher._wake_w))
+
+
+class ConversionCacheTestCase(BaseTestCase):
+    def test_disabled_by_default(self):
+        self.assertIsNone(self.conf.conversion_cache_info())
+
+    def test_invalid_maxsize(self):
+        self.assertRaises(ValueError, self.conf.enable_conversion_cache, 0)
+
+    def test_hits_across_reloads_and_opts(self):
+        int_type = types.Integer()
+        self.conf.register_opt(cfg.Opt('foo', type=int_type))
+        self.conf.register_opt(cfg.Opt('bar', type=int_type))
+        self.conf.enable_conversion_cache()
+        paths = self.create_tempfiles([('test', '[DEFAULT]\nfoo=1\nbar=1\n')])
+
+        self.conf(['--config-file', paths[0]])
+
+        self.assertEqual(1, self.conf.foo)
+        self.assertEqual(1, self.conf.bar)
+        self.assertTrue(self.conf.reload_config_files())
+        self.assertEqual(1, self.conf.foo)
+        self.assertEqual(
+            cfg.ConversionCacheInfo(
+                hits=2, misses=1, maxsize=1024, currsize=1
+            ),
+            self.conf.conversion_cache_info(),
+        )
+
+    def test_keyed_by_type_identity(self):
+        self.conf.register_opt(cfg.IntOpt('foo', default='5', max=10))
+        self.conf.register_opt(cfg.StrOpt('bar', default='5'))
+        self.conf.enable_conversion_cache()
+
+        self.conf([])
+
+        self.assertEqual(5, self.conf.foo)
+        self.assertEqual('5', self.conf.bar)
+        info = self.conf.conversion_cache_info()
+        assert info is not None
+        self.assertEqual(2, info.misses)
+
+    def test_mutable_results_are_copied(self):
+        self.conf.register_opt(cfg.ListOpt('foo', default='a,b'))
+        self.conf.enable_conversion_cache()
+
+        self.conf([])
+
+        self.conf.foo.append('c')
+        self.conf.clear_override('foo')
+        self.assertEqual(['a', 'b'], self.conf.foo)
+        info = self.conf.conversion_cache_info()
+        assert info is not None
+        self.assertEqual(1, info.misses)
+
+    def test_errors_are_not_cached(self):
+        self.conf.register_opt(cfg.IntOpt('foo'))
+        self.conf.enable_conversion_cache()
+        paths = self.create_tempfiles([('test', '[DEFAULT]\nfoo=x\n')])
+
+        self.conf(['--config-file', paths[0]])
+
+        self.assertRaises(cfg.ConfigFileValueError, getattr, self.conf, 'foo')
+        self.assertRaises(cfg.ConfigFileValueError, getattr, self.conf, 'foo')
+        self.assertEqual(
+            cfg.ConversionCacheInfo(
+                hits=0, misses=2, maxsize=1024, currsize=0
+            ),
+            self.conf.conversion_cache_info(),
+        )
+
+    def test_least_recently_used_evicted(self):
+        self.conf.enable_conversion_cache(maxsize=2)
+        opt = cfg.IntOpt('foo')
+        for value in ('1', '2', '1', '3', '1'):
+            self.conf._convert_value(value, opt)
+        self.assertEqual(
+            cfg.ConversionCacheInfo(hits=2, misses=3, maxsize=2, currsize=2),
+            self.conf.conversion_cache_info(),
+        )
+
+    def test_disable(self):
+        self.conf.enable_conversion_cache()
+        self.conf.disable_conversion_cache()
+        self.assertIsNone(self.conf.conversion_cache_info())
+
+
+class ConverterTestCase(BaseTestCase):
+    def test_compiled_once_per_opt(self):
+        opt = cfg.MultiOpt('foo', item_type=types.Integer(max=10))
+        self.conf.register_opt(opt)
+        paths = self.create_tempfiles([('test', '[DEFAULT]\nfoo=1\nfoo=2\n')])
+        self.conf(['--config-file', paths[0]])
+        with mock.patch.object(
+            opt.type, '_compile', wraps=opt.type._compile
+        ) as compile:
+            self.assertEqual([1, 2], self.conf.foo)
+            self.conf.reload_config_files()
+            self.assertEqual([1, 2], self.conf.foo)
+        compile.assert_called_once_with()
+
+    def test_error(self):
+        self.conf.register_opt(cfg.IntOpt('foo', max=10))
+        paths = self.create_tempfiles([('test', '[DEFAULT]\nfoo=11\n')])
+        self.conf(['--config-file', paths[0]])
+        e = self.assertRaises(cfg.ConfigFileValueError, self.conf._get, 'foo')
+        self.assertIn('Should be less than or equal to 10', str(e))
+
+    def test_unregister_drops_converter(self):
+        opt = cfg.StrOpt('foo', default='bar')
+        self.conf.register_opt(opt)
+        self.assertEqual('bar', self.conf.foo)
+        self.assertIn(opt, self.conf._converters)
+        self.conf.unregister_opt(opt)
+        self.assertNotIn(opt, self.conf._converters)
+
+    def _get(self, name):
+        # bypass the value cache, which changing the opt type leaves alone
+        return self.conf._get(name, namespace=self.conf._namespace)
+
+    def _assert_invalid(self, name):
+        self.assertRaises(cfg.ConfigFileValueError, self._get, name)
+
+    def test_type_replaced(self):
+        opt = cfg.StrOpt('foo')
+        self.conf.register_opt(opt)
+        paths = self.create_tempfiles([('test', '[DEFAULT]\nfoo=b\n')])
+        self.conf(['--config-file', paths[0]])
+        self.assertEqual('b', self._get('foo'))
+        opt.type = types.String(choices=['a'])
+        self._assert_invalid('foo')
+
+    def test_choices_changed_in_place(self):
+        opt = cfg.StrOpt('foo', choices=['a'])
+        self.conf.register_opt(opt)
+        paths = self.create_tempfiles([('test', '[DEFAULT]\nfoo=b\n')])
+        self.conf(['--config-file', paths[0]])
+        self._assert_invalid('foo')
+        type_ = opt.type
+        assert isinstance(type_, types.String) and type_.choices is not None
+        type_.choices['b'] = None
+        self.assertEqual('b', self._get('foo'))
+
+    def test_subclass_call(self):
+        class Upper(types.String):
+            def __call__(self, value):
+                return super().__call__(value).upper()
+
+        self.conf.register_opt(cfg.Opt('foo', type=Upper(), default='a'))
+        self.conf([])
+        self.assertEqual('A', self.conf.foo)
+
+
+class LazyImportTestCase(base.BaseTestCase):
+    def test_heavy_modules_not_imported(self):
+        code = (
+            'import sys\n'
+            'import oslo_config.cfg\n'
+            'print(" ".join(sorted(m for m in ("glob", "inspect", "netaddr",'
+            ' "pickle", "rfc3986", "stevedore") if m in sys.modules)))\n'
+        )
+        output = subprocess.check_output([sys.executable, '-c', code])
+        self.assertEqual(b'', output.strip())
+
+
+class DeferDefaultChecksTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.useFixture(
+            fixtures.MonkeyPatch('oslo_config.cfg._defer_default_checks', True)
+        )
+
+    def test_defer_default_checks(self):
+        self.addCleanup(cfg.defer_default_checks, cfg._defer_default_checks)
+        cfg.defer_default_checks(False)
+        self.assertRaises(
+            cfg.DefaultValueError, cfg.IntOpt, 'foo', default='x'
+        )
+        cfg.defer_default_checks()
+        opt = cfg.IntOpt('foo', default='x')
+        self.assertIn(opt, cfg._unchecked_defaults)
+
+    def test_invalid_defaults_reported_at_once(self):
+        self.conf.register_opts(
+            [
+                cfg.IntOpt('foo', default='x'),
+                cfg.IntOpt('bar', default=1),
+                cfg.BoolOpt('baz', default='maybe'),
+            ],
+            group='blaa',
+        )
+        exc = self.assertRaises(cfg.DefaultValueError, self.conf, [])
+        self.assertIn('baz: Error processing default value maybe', str(exc))
+        self.assertIn('foo: Error processing default value x', str(exc))
+        self.assertNotIn('bar:', str(exc))
+
+    def test_not_checked_without_validate_default_values(self):
+        conf = cfg.ConfigOpts()
+        conf.register_opt(cfg.IntOpt('foo', default='x'))
+        conf([], validate_default_values=False)
+
+    def test_checked_opts_are_forgotten(self):
+        opts = [cfg.IntOpt('foo', default=1), cfg.IntOpt('bar', default='x')]
+        self.assertRaises(
+            cfg.DefaultValueError, cfg.check_default_values, opts
+        )
+        self.assertNotIn(opts[0], cfg._unchecked_defaults)
+        self.assertIn(opts[1], cfg._unchecked_defaults)
+
+
+class LazyRegistrationTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.moddir = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(
+            fixtures.MonkeyPatch('sys.path', [self.moddir] + sys.path)
+        )
+        self.useFixture(
+            fixtures.MonkeyPatch('oslo_config.cfg.CONF', self.conf)
+        )
+
+    def _make_module(self, name, body):
+        with open(os.path.join(self.moddir, name + '.py'), 'w') as f:
+            f.write('from oslo_config import cfg\n' + body)
+        self.addCleanup(sys.modules.pop, name, None)
+        return name
+
+    def test_lazy_group(self):
+        module = self._make_module(
+            'lazy_group_mod',
+            "cfg.CONF.register_opt(cfg.StrOpt('foo', default='bar'), "
+            "'blaa')\n",
+        )
+        self.conf.register_lazy_group('blaa', module)
+        self.conf([])
+        self.assertNotIn(module, sys.modules)
+        self.assertEqual('bar', self.conf.blaa.foo)
+        self.assertIn(module, sys.modules)
+
+    def test_lazy_opt_in_registered_group(self):
+        module = self._make_module(
+            'lazy_opt_mod',
+            "cfg.CONF.register_opt(cfg.StrOpt('foo', default='bar'), "
+            "'blaa')\n",
+        )
+        self.conf.register_opt(cfg.StrOpt('eager'), group='blaa')
+        self.conf.register_lazy_opt('foo', module, group='blaa')
+        self.conf([])
+        self.assertIsNone(self.conf.blaa.eager)
+        self.assertNotIn(module, sys.modules)
+        self.assertEqual('bar', self.conf.blaa.foo)
+
+    def test_lazy_default_opt(self):
+        module = self._make_module(
+            'lazy_default_mod',
+            "cfg.CONF.register_opt(cfg.StrOpt('foo', default='bar'))\n",
+        )
+        self.conf.register_lazy_opt('foo', module)
+        self.conf([])
+        self.assertIn('foo', self.conf)
+        self.assertEqual('bar', self.conf.foo)
+
+    def test_lazy_opt_not_registered_by_module(self):
+        module = self._make_module('lazy_empty_mod', '')
+        self.conf.register_lazy_opt('foo', module, group='blaa')
+        self.conf([])
+        self.assertRaises(cfg.NoSuchOptError, getattr, self.conf, 'foo')
+        self.assertRaises(
+            cfg.NoSuchGroupError, self.conf._get_opt_info, 'foo', 'blaa'
+        )
+        self.assertIn(module, sys.modules)
+
+    def test_iteration_loads_everything(self):
+        module = self._make_module(
+            'lazy_iter_mod',
+            "cfg.CONF.register_opt(cfg.StrOpt('foo'), 'blaa')\n"
+            "cfg.CONF.register_opt(cfg.StrOpt('bar'))\n",
+        )
+        self.conf.register_lazy_group('blaa', module)
+        self.conf([])
+        self.assertIn('blaa', list(self.conf))
+        self.assertIn('bar', list(self.conf))
+        self.assertEqual({}, self.conf._lazy_sources)
+
+    def test_log_opt_values_loads_everything(self):
+        module = self._make_module(
+            'lazy_log_mod',
+            "cfg.CONF.register_opt(cfg.StrOpt('foo', default='bar'), "
+            "'blaa')\n",
+        )
+        self.conf.register_lazy_group('blaa', module)
+        self.conf([])
+        logger = mock.Mock()
+        self.conf.log_opt_values(logger, logging.DEBUG)
+        logger.log.assert_any_call(
+            logging.DEBUG, '%-30s = %s', 'blaa.foo', 'bar'
+        )
+
+    def test_group_attr_iteration_loads_group(self):
+        module = self._make_module(
+            'lazy_group_attr_mod',
+            "cfg.CONF.register_opt(cfg.StrOpt('foo'), 'blaa')\n",
+        )
+        self.conf.register_opt(cfg.StrOpt('eager'), group='blaa')
+        self.conf.register_lazy_opt('foo', module, group='blaa')
+        self.conf([])
+        self.assertEqual(['eager', 'foo'], sorted(self.conf.blaa))
+
+    def test_lazy_namespace(self):
+        ext = mock.Mock()
+        ext.plugin.return_value = [
+            (cfg.OptGroup('blaa', title='Blaa'), [cfg.StrOpt('foo')]),
+            ('DEFAULT', [cfg.StrOpt('bar', default='baz')]),
+        ]
+        self.conf.register_lazy_group('blaa', namespace='lazy.namespace')
+        self.conf([])
+        with mock.patch(
+            'stevedore.named.NamedExtensionManager', return_value=[ext]
+        ) as mgr:
+            self.assertIsNone(self.conf.blaa.foo)
+        self.assertEqual(['lazy.namespace'], mgr.call_args[1]['names'])
+        self.assertEqual('Blaa', self.conf._get_group('blaa').title)
+        self.assertEqual('baz', self.conf.bar)
+
+    def test_lazy_namespace_load_failure(self):
+        def fail(*args, **kwargs):
+            kwargs['on_load_failure_callback'](
+                None, None, ImportError('no module')
+            )
+
+        self.conf.register_lazy_group('blaa', namespace='lazy.namespace')
+        self.conf([])
+        with mock.patch('stevedore.named.NamedExtensionManager', fail):
+            e = self.assertRaises(ImportError, self.conf.load_lazy_opts)
+        self.assertEqual('no module', str(e))
+
+    def test_other_opt_does_not_load(self):
+        module = self._make_module(
+            'lazy_other_mod',
+            "cfg.CONF.register_opt(cfg.StrOpt('foo'), 'blaa')\n",
+        )
+        self.conf.register_opt(cfg.StrOpt('bar'), group='blaa')
+        self.conf.register_lazy_opt('foo', module, group='blaa')
+        self.conf([])
+        self.assertIsNone(self.conf.blaa.bar)
+        self.assertNotIn('baz', self.conf)
+        self.assertNotIn(module, sys.modules)
+        self.assertEqual(['foo'], list(self.conf._lazy_sources['blaa']))
+
+    def test_requires_one_source(self):
+        self.assertRaises(ValueError, self.conf.register_lazy_group, 'blaa')
+        self.assertRaises(
+            ValueError,
+            self.conf.register_lazy_opt,
+            'foo',
+            'mod',
+            namespace='lazy.namespace',
+        )
+
+    def test_pending_sources_survive_pickling(self):
+        module = self._make_module(
+            'lazy_pickle_mod',
+            "cfg.CONF.register_opt(cfg.StrOpt('foo', default='bar'), "
+            "'blaa')\n",
+        )
+        self.conf.register_lazy_group('blaa', module)
+        self.conf([])
+        restored = pickle.loads(pickle.dumps(self.conf))
+        self.assertEqual(self.conf._lazy_sources, restored._lazy_sources)
+
+    def test_state_without_lazy_sources(self):
+        self.conf.register_opt(cfg.StrOpt('foo', default='bar'))
+        self.conf([])
+        state = self.conf.export_state()
+        del state['lazy_sources']
+        restored = cfg.ConfigOpts.import_state(state)
+        self.assertEqual({}, restored._lazy_sources)
+        self.assertEqual('bar', restored.foo)
+
+
 class OverridesTestCase(BaseTestCase):
     def test_default_none(self):
         self.conf.register_opt(cfg.StrOpt('foo', default='foo'))
@@ -4581,9 +6017,7 @@ class FindFileTestCase(BaseTestCase):
     def test_find_policy_file(self):
         policy_file = '/etc/policy.json'
 
-        self.useFixture(
-            fixtures.MonkeyPatch('os.path.exists', lambda p: p == policy_file)
-        )
+        self.useFixture(_FakePaths([policy_file]))
 
         self.conf([])
 
@@ -4637,6 +6071,107 @@ class FindFileTestCase(BaseTestCase):
         self.assertEqual(path, self.conf.find_file('policy.json'))
 
 
+class DirListingCacheTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(cfg.invalidate_dir_cache)
+        self.dir = tempfile.mkdtemp()
+        self.create_tempfiles(
+            [
+                (os.path.join(self.dir, 'b'), '[DEFAULT]\nfoo = b\n'),
+                (os.path.join(self.dir, 'a'), '[DEFAULT]\nfoo = a\n'),
+                (os.path.join(self.dir, '.hidden'), '[DEFAULT]\nfoo = h\n'),
+            ]
+        )
+        self.policy_file = self.create_tempfiles(
+            [(os.path.join(self.dir, 'policy.json'), '{}')], ext=''
+        )[0]
+        self.conf.register_opt(cfg.StrOpt('foo'))
+        self._age_dir()
+        self.scandir = self.useFixture(
+            fixtures.MockPatch('os.scandir', side_effect=os.scandir)
+        ).mock
+
+    def _scans(self):
+        return [
+            c for c in self.scandir.call_args_list if c.args == (self.dir,)
+        ]
+
+    def _age_dir(self):
+        mtime = os.stat(self.dir).st_mtime - 60
+        os.utime(self.dir, (mtime, mtime))
+
+    def test_config_dir_files(self):
+        self.conf(['--config-dir', self.dir])
+        self.assertEqual('b', self.conf.foo)
+        self.assertEqual(
+            [os.path.join(self.dir, n) for n in ('a.conf', 'b.conf')],
+            cfg._list_config_dir(self.dir),
+        )
+
+    def test_listing_reused(self):
+        self.conf(['--config-dir', self.dir])
+        self.conf.reload_config_files()
+        self.assertEqual(self.policy_file, self.conf.find_file('policy.json'))
+        self.assertEqual(1, len(self._scans()))
+
+    def test_listing_refreshed_when_modified(self):
+        self.conf(['--config-dir', self.dir])
+        self.create_tempfiles(
+            [(os.path.join(self.dir, 'c'), '[DEFAULT]\nfoo = c\n')]
+        )
+        self.conf.reload_config_files()
+        self.assertEqual('c', self.conf.foo)
+        self.assertEqual(2, len(self._scans()))
+
+    def test_recently_modified_not_cached(self):
+        os.utime(self.dir)
+        cfg._list_config_dir(self.dir)
+        cfg._list_config_dir(self.dir)
+        self.assertEqual(2, len(self._scans()))
+
+    def test_recently_modified_lookup_not_listed(self):
+        os.utime(self.dir)
+        self.conf([])
+        self.assertEqual(
+            self.policy_file,
+            cfg._search_dirs([self.dir], 'policy', '.json'),
+        )
+        self.assertEqual([], self._scans())
+
+    def test_invalidate(self):
+        cfg._list_config_dir(self.dir)
+        cfg.invalidate_dir_cache(self.dir)
+        cfg._list_config_dir(self.dir)
+        cfg.invalidate_dir_cache()
+        cfg._list_config_dir(self.dir)
+        self.assertEqual(3, len(self._scans()))
+
+    def test_missing_dir(self):
+        self.assertIsNone(
+            cfg._list_config_dir(os.path.join(self.dir, 'missing'))
+        )
+        self.assertEqual(
+            [], cfg._list_config_dir(os.path.join(self.dir, 'a.conf'))
+        )
+
+    def test_unreadable_dir(self):
+        self.scandir.side_effect = PermissionError(errno.EACCES, 'denied')
+        self.conf(['--config-dir', self.dir])
+        self.assertEqual(self.policy_file, self.conf.find_file('policy.json'))
+        self.assertIsNone(self.conf.find_file('missing.json'))
+        self.assertEqual([], cfg._list_config_dir(self.dir))
+
+    def test_broken_symlink(self):
+        os.symlink(
+            os.path.join(self.dir, 'missing'),
+            os.path.join(self.dir, 'link.json'),
+        )
+        self._age_dir()
+        self.conf(['--config-dir', self.dir])
+        self.assertIsNone(self.conf.find_file('link.json'))
+
+
 class OptDumpingTestCase(BaseTestCase):
     class FakeLogger:
         def __init__(self, test_case, expected_lvl):
@@ -4877,9 +6412,7 @@ class TildeExpansionTestCase(BaseTestCase):
         except cfg.ConfigFilesNotFoundError as cfnfe:
             self.assertIn(homedir, str(cfnfe))
 
-        self.useFixture(
-            fixtures.MonkeyPatch('os.path.exists', lambda p: p == tmpfile)
-        )
+        self.useFixture(_FakePaths([tmpfile]))
 
         self.assertEqual(tmpfile, self.conf.find_file(tmpbase))
 
@@ -4888,10 +6421,7 @@ class TildeExpansionTestCase(BaseTestCase):
         try:
             tmpdir = tempfile.mkdtemp(dir=homedir, prefix='cfg-', suffix='.d')
             tmpfile = os.path.join(tmpdir, 'foo.conf')
-
-            self.useFixture(
-                fixtures.MonkeyPatch('glob.glob', lambda p: [tmpfile])
-            )
+            os.symlink(os.path.join(tmpdir, 'missing'), tmpfile)
 
             e = self.assertRaises(
                 cfg.ConfigFilesNotFoundError,
@@ -6082,6 +7612,99 @@ class OptTestCase(base.BaseTestCase):
     def test_illegal_name(self):
         self.assertRaises(ValueError, cfg.BoolOpt, '_foo')
 
+    def test_opt_vars(self):
+        opt = cfg.SubCommandOpt('foo', title='bar')
+        attrs = vars(opt)
+        self.assertEqual('foo', attrs['name'])
+        self.assertEqual('bar', attrs['title'])
+        self.assertEqual('advanced', list(attrs)[-4])
+
+    def test_opt_extra_attribute(self):
+        for opt in (
+            cfg.StrOpt('foo'),
+            cfg.MultiStrOpt('foo'),
+            cfg.SubCommandOpt('foo'),
+            cfg.DeprecatedOpt('foo'),
+        ):
+            setattr(opt, 'extra', 1)
+            self.assertEqual(1, opt.__dict__['extra'], type(opt).__name__)
+
+    def test_subclass_without_slots(self):
+        class CustomOpt(cfg.StrOpt):
+            def __init__(self, name, extra):
+                super().__init__(name)
+                self.extra = extra
+
+        self.assertEqual(CustomOpt('foo', 1), CustomOpt('foo', 1))
+        self.assertNotEqual(CustomOpt('foo', 1), CustomOpt('foo', 2))
+        self.assertEqual(1, vars(CustomOpt('foo', 1))['extra'])
+
+    def test_opt_pickle_and_copy(self):
+        opt = cfg.StrOpt(
+            'foo', default='bar', deprecated_opts=[cfg.DeprecatedOpt('old')]
+        )
+        for copied in (pickle.loads(pickle.dumps(opt)), copy.deepcopy(opt)):
+            self.assertEqual(opt, copied)
+            self.assertEqual('bar', copied.default)
+            self.assertEqual(
+                [cfg.DeprecatedOpt('old')], copied.deprecated_opts
+            )
+
+    @mock.patch.object(cfg, '_show_caller_details', False)
+    def test_default_location_is_shared(self):
+        self.assertIs(
+            cfg.StrOpt('foo')._set_location, cfg.IntOpt('bar')._set_location
+        )
+
+    def test_opt_info_mapping(self):
+        opt = cfg.StrOpt('foo')
+        info = cfg._OptInfo(opt, False)
+        self.assertIs(opt, info['opt'])
+        self.assertNotIn('default', info)
+        self.assertNotIn('pop', info)
+        self.assertRaises(KeyError, info.__getitem__, 'default')
+        self.assertIsNone(info.pop('default', None))
+        info['default'] = 'bar'
+        self.assertIn('default', info)
+        self.assertEqual('bar', info.pop('default'))
+        self.assertNotIn('default', info)
+        self.assertRaises(KeyError, info.pop, 'default')
+
+    def test_opt_info_mutable_mapping(self):
+        opt = cfg.StrOpt('foo')
+        info = cfg._OptInfo(opt, False)
+        self.assertEqual({'opt': opt, 'cli': False}, dict(info))
+        self.assertEqual(['opt', 'cli'], list(info))
+        self.assertEqual(2, len(info))
+        self.assertEqual(info, {'opt': opt, 'cli': False})
+        self.assertIsNone(info.get('default'))
+        info.update(default='bar', override='baz')
+        self.assertEqual('bar', info['default'])
+        del info['override']
+        self.assertRaises(KeyError, info.__delitem__, 'override')
+        self.assertEqual('bar', info.setdefault('default', 'qux'))
+        self.assertEqual(
+            [('opt', opt), ('cli', False), ('default', 'bar')],
+            list(info.items()),
+        )
+
+    def test_opt_info_other_keys(self):
+        opt = cfg.StrOpt('foo')
+        info = cfg._OptInfo(opt, False)
+        info['foo'] = 'bar'
+        self.assertEqual('bar', info['foo'])
+        self.assertEqual({'opt': opt, 'cli': False, 'foo': 'bar'}, info)
+        del info['foo']
+        self.assertNotIn('foo', info)
+        self.assertRaises(KeyError, info.__getitem__, 'pop')
+
+    def test_opt_info_pickle(self):
+        info = cfg._OptInfo(cfg.StrOpt('foo'), False)
+        info['override'] = 'bar'
+        copied = pickle.loads(pickle.dumps(info))
+        self.assertEqual(info, copied)
+        self.assertNotIn('default', copied)
+
 
 class SectionsTestCase(BaseTestCase):
     def test_list_all_sections(self):
@@ -10,6 +10,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import sys
 import tempfile
 import textwrap
 
@@ -95,6 +96,13 @@ class GetLocationTestCase(base.BaseTestCase):
         )
         self.assertIn('test_get_location.py', loc.detail)
 
+    def test_opt_default_detail(self):
+        for opt in (cfg.Opt('foo'), cfg.StrOpt('foo'), cfg.ListOpt('foo')):
+            self.assertEqual(__file__, opt._set_location.detail)
+
+    def test_caller_detail_beyond_stack(self):
+        self.assertIsNone(cfg._get_caller_detail(sys.getrecursionlimit()))
+
     def test_set_default_on_config_opt(self):
         self.conf.set_default('normal_opt', self.id())
         self.conf([])
@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import pickle
 import re
 import unittest
 
@@ -215,6 +216,16 @@ class StringTypeTests(TypeTestHelper, unittest.TestCase):
 class BooleanTypeTests(TypeTestHelper, unittest.TestCase):
     type = types.Boolean()
 
+    def test_subclass_values(self):
+        class YesNo(types.Boolean):
+            TRUE_VALUES = ['y']
+            FALSE_VALUES = ['n']
+
+        self.type_instance = YesNo()
+        self.assertConvertedValue('Y', True)
+        self.assertConvertedValue('n', False)
+        self.assertInvalid('yes')
+
     def test_True(self):
         self.assertConvertedValue('True', True)
 
@@ -555,6 +566,47 @@ class ListTypeTests(TypeTestHelper, unittest.TestCase):
         self.assertInvalid('[1,2,3')
         self.assertInvalid('1,2,3]')
 
+    def test_invalid_item_after_valid_items(self):
+        self.type_instance = types.List(types.Integer())
+        self.assertConvertedValue('1,2,3', [1, 2, 3])
+        self.assertInvalid('1,2,foo,3')
+
+    def test_strict_quoted_items(self):
+        self.type_instance = types.List(types.String(quotes=True), strict=True)
+        self.assertConvertedValue(
+            'foo, "bar, baz", \'[bam\', it\'s',
+            ['foo', 'bar, baz', '[bam', "it's"],
+        )
+
+    def test_strict_bracketed_items(self):
+        self.type_instance = types.List(
+            types.List(types.Integer(), bounds=True, strict=True),
+            bounds=True,
+            strict=True,
+        )
+        self.assertConvertedValue(
+            '[[1, 2], [3], [4, 5, 6]]', [[1, 2], [3], [4, 5, 6]]
+        )
+
+    def test_strict_nested_brackets(self):
+        self.type_instance = types.List(strict=True)
+        self.assertConvertedValue(
+            'f(a, [b, c]), {d, e}, g', ['f(a, [b, c])', '{d, e}', 'g']
+        )
+
+    def test_strict_does_not_join_invalid_items(self):
+        self.type_instance = types.List(types.String(quotes=True), strict=True)
+        self.assertInvalid('foo,"bar,baz')
+        self.type_instance = types.List(types.List(bounds=True), strict=True)
+        self.assertInvalid('[foo,bar')
+        self.assertInvalid('foo],[bar')
+        self.assertInvalid('[foo),bar')
+
+    def test_strict_empty_value(self):
+        self.type_instance = types.List(strict=True)
+        self.assertConvertedValue('', [])
+        self.assertConvertedValue('foo, bar,', ['foo', 'bar'])
+
     def test_repr(self):
         t = types.List(types.Integer())
         self.assertEqual('List of Integer', repr(t))
@@ -680,6 +732,54 @@ class DictTypeTests(TypeTestHelper, unittest.TestCase):
     def test_no_mapping_produces_error(self):
         self.assertInvalid('foo,bar')
 
+    def test_pair_without_separator_is_joined_to_next_pair(self):
+        self.assertConvertedValue('foo,bar:baz', {'foo,bar': 'baz'})
+
+    def test_error_messages(self):
+        self.type_instance = types.Dict(
+            types.Integer(), key_value_separator='='
+        )
+        for value, message in (
+            ('foo=1,bar', 'Value should be NAME=VALUE pairs separated by ","'),
+            ('foo=1,=2', 'Key name should not be empty'),
+            ('foo=1,foo=2', 'Duplicate key foo'),
+            (
+                'foo=1,bar=x,baz=3',
+                "invalid literal for int() with base 10: 'x,baz=3'",
+            ),
+        ):
+            with self.assertRaises(ValueError) as cm:
+                self.type_instance(value)
+            self.assertEqual(message, str(cm.exception))
+
+    def test_strict_quoted_and_bracketed_values(self):
+        self.type_instance = types.Dict(types.String(quotes=True), strict=True)
+        self.assertConvertedValue(
+            'foo:"bar, baz", bam:[a, b], quux:it\'s',
+            {'foo': 'bar, baz', 'bam': '[a, b]', 'quux': "it's"},
+        )
+
+    def test_strict_dict_of_dicts(self):
+        self.type_instance = types.Dict(
+            types.Dict(bounds=True, strict=True), bounds=True, strict=True
+        )
+        self.assertConvertedValue(
+            '{k1:{k1:v1,k2:v2},k2:{k3:v3}}',
+            {'k1': {'k1': 'v1', 'k2': 'v2'}, 'k2': {'k3': 'v3'}},
+        )
+
+    def test_strict_does_not_join_invalid_pairs(self):
+        self.type_instance = types.Dict(strict=True)
+        self.assertInvalid('foo,bar:baz')
+        self.assertInvalid('foo:"bar,baz')
+        self.assertInvalid('foo:[bar,baz')
+        with self.assertRaises(ValueError) as cm:
+            self.type_instance('foo:1,bar')
+        self.assertEqual(
+            'Value should be NAME:VALUE pairs separated by ","',
+            str(cm.exception),
+        )
+
     def test_repr(self):
         t = types.Dict(types.Integer())
         self.assertEqual('Dict of Integer', repr(t))
@@ -720,6 +820,8 @@ class IPAddressTypeTests(TypeTestHelper, unittest.TestCase):
     def test_strings(self):
         self.assertInvalid('')
         self.assertInvalid('foo')
+        self.assertInvalid(' 192.168.0.1')
+        self.assertInvalid('fe80::1%eth0')
 
     def test_numbers(self):
         self.assertInvalid(1)
@@ -766,6 +868,18 @@ class HostAddressTypeTests(TypeTestHelper, unittest.TestCase):
         self.assertConvertedValue('ab-c.com', 'ab-c.com')
         self.assertConvertedValue('abc.com-org', 'abc.com-org')
         self.assertConvertedValue('abc.0-0', 'abc.0-0')
+        self.assertConvertedValue('ABCD:EF::1', 'ABCD:EF::1')
+
+    def test_strip_trailing_dot(self):
+        self.assertConvertedValue('cell1.nova.site1.', 'cell1.nova.site1')
+
+    def test_invalid_host_address_message(self):
+        self.assertRaisesRegex(
+            ValueError,
+            'host..name is not a valid host address',
+            self.type_instance,
+            'host..name',
+        )
 
 
 class HostDomainTypeTests(TypeTestHelper, unittest.TestCase):
@@ -788,6 +902,8 @@ class HostDomainTypeTests(TypeTestHelper, unittest.TestCase):
         )
         self.assertConvertedValue('host_01.co.uk', 'host_01.co.uk')
         self.assertConvertedValue('_site01001', '_site01001')
+        self.assertConvertedValue('192.168.0.1', '192.168.0.1')
+        self.assertConvertedValue('foo.bar.', 'foo.bar')
 
 
 class HostnameTypeTests(TypeTestHelper, unittest.TestCase):
@@ -857,6 +973,13 @@ class HostnameTypeTests(TypeTestHelper, unittest.TestCase):
         self.assertConvertedEqual('abc.com-org')
         self.assertConvertedEqual('abc.0-0')
 
+    def test_custom_label_regex(self):
+        self.assertInvalid('host_name')
+        self.assertEqual(
+            'host_name',
+            types.Hostname()('host_name', regex=types.HostDomain.DOMAIN_REGEX),
+        )
+
     def test_max_segment_size(self):
         self.assertConvertedEqual('host.%s.com' % ('x' * 63))
         self.assertInvalid('host.%s.com' % ('x' * 64))
@@ -915,6 +1038,34 @@ class URITypeTests(TypeTestHelper, unittest.TestCase):
         self.assertNotEqual(a, b)
         self.assertNotEqual(c, b)
 
+    def test_schemes(self):
+        self.type_instance = types.URI(schemes=['https'])
+        self.assertConvertedValue('https://example.com', 'https://example.com')
+        self.assertInvalid('http://example.com')
+
+    def test_validated_values_are_remembered(self):
+        uri = types.URI(max_length=22)
+        uri.VALIDATED_CACHE_SIZE = 2
+        self.assertRaises(ValueError, uri, 'invalid')
+        self.assertEqual({}, uri._validated)
+        for value in ('http://a.example', 'http://b.example', 'http://c.x'):
+            self.assertEqual(value, uri(value))
+        self.assertEqual(
+            ['http://b.example', 'http://c.x'], list(uri._validated)
+        )
+
+        # the length limit is still applied to remembered values
+        uri.max_length = 5
+        self.assertRaises(ValueError, uri, 'http://c.x')
+
+    def test_pickle(self):
+        uri = types.URI(schemes=['ftp'])
+        uri('ftp://example.com')
+        copied = pickle.loads(pickle.dumps(uri))
+        self.assertEqual(uri, copied)
+        self.assertEqual('ftp://example.com', copied('ftp://example.com'))
+        self.assertRaises(ValueError, copied, 'http://example.com')
+
 
 class PortTypeTests(TypeTestHelper, unittest.TestCase):
     type = types.Port()
@@ -1085,3 +1236,59 @@ class FormatSampleDefaultTests(unittest.TestCase):
         self.assertEqual(
             ['foo'], t.format_defaults('', sample_default=Exception('foo'))
         )
+
+
+class CompileTests(unittest.TestCase):
+    def assertSameConversion(self, type_instance, values):
+        convert = type_instance._compile()
+        for value in values:
+            try:
+                expected = type_instance(value)
+            except ValueError as e:
+                with self.assertRaises(ValueError) as cm:
+                    convert(value)
+                self.assertEqual(str(e), str(cm.exception))
+            else:
+                self.assertEqual(expected, convert(value))
+
+    def test_plain_string(self):
+        self.assertIs(str, types.String()._compile())
+
+    def test_string_choices(self):
+        values = ['foo', 'FOO', 'bar', '', 1]
+        self.assertSameConversion(types.String(choices=['foo', 1]), values)
+        self.assertSameConversion(
+            types.String(choices=[('Foo', 'help')], ignore_case=True), values
+        )
+
+    def test_string_checks_not_compiled(self):
+        for t in (
+            types.String(quotes=True),
+            types.String(regex='foo'),
+            types.String(max_length=3),
+        ):
+            self.assertIs(t, t._compile())
+
+    def test_boolean(self):
+        self.assertSameConversion(
+            types.Boolean(), [True, False, 'Yes', 'off', '1', 'foo']
+        )
+
+    def test_numbers(self):
+        values = [1, '2', ' 3 ', '', '  ', '-1', '11', 2.5, 'x']
+        self.assertSameConversion(types.Integer(), values)
+        self.assertSameConversion(types.Integer(min=0, max=10), values)
+        self.assertSameConversion(types.Float(min=0.5, max=10), values)
+        self.assertSameConversion(types.Port(), values + ['65536'])
+
+    def test_number_choices_not_compiled(self):
+        t = types.Integer(choices=[1, 2])
+        self.assertIs(t, t._compile())
+
+    def test_subclass_not_compiled(self):
+        class Upper(types.String):
+            def __call__(self, value):
+                return super().__call__(value).upper()
+
+        t = Upper()
+        self.assertIs(t, t._compile())
@@ -139,5 +139,16 @@ class TestValidator(base.BaseTestCase):
         with mock.patch('builtins.open', m):
             self.assertEqual(0, validator._validate(self.conf))
 
+    @mock.patch('oslo_config.generator._list_opts')
+    @mock.patch.object(cfg, '_defer_default_checks', True)
+    def test_invalid_deferred_default(self, mock_lo):
+        mock_lo.return_value = [
+            ('ns', [('foo', [cfg.IntOpt('opt', default='x')])])
+        ]
+        self.conf_fixture.config(namespace=['ns'], input_file='mocked.conf')
+        m = mock.mock_open(read_data='[foo]\nopt = 1\n')
+        with mock.patch('builtins.open', m):
+            self.assertEqual(1, validator._validate(self.conf))
+
     def test_invalid_options(self):
         self.assertRaises(RuntimeError, validator._validate, self.conf)
@@ -21,15 +21,19 @@ Use these classes as values for the `type` argument to
 """
 
 import collections
-from collections.abc import Callable, Iterable, KeysView
+from collections.abc import Callable, Container, Iterable, Iterator, KeysView
+import functools
 import operator
 import re
 import warnings
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
 import abc
-import netaddr
-import rfc3986
+
+# NOTE: netaddr and rfc3986 are slow to import, so they are only imported
+# when an address or URI actually needs to be validated.
+if TYPE_CHECKING:
+    import rfc3986
 
 
 class ConfigType(metaclass=abc.ABCMeta):
@@ -64,6 +68,15 @@ class ConfigType(metaclass=abc.ABCMeta):
     def __call__(self, value: Any) -> Any:
         pass
 
+    def _compile(self) -> Callable[[Any], Any]:
+        """Return a function converting values like this type.
+
+        Types may return a function specialized to their current settings,
+        skipping the checks they do not use. The function is compiled once
+        per option, so settings changed after that are not picked up.
+        """
+        return self
+
     @abc.abstractmethod
     def _formatter(self, value: Any) -> Any:
         pass
@@ -136,9 +149,11 @@ class String(ConfigType):
         else:
             self.choices = None
 
-        self.lower_case_choices: list[str] | None = None
+        self.lower_case_choices: frozenset[str] | None = None
         if self.choices is not None and self.ignore_case:
-            self.lower_case_choices = [c.lower() for c in self.choices]
+            self.lower_case_choices = frozenset(
+                c.lower() for c in self.choices
+            )
 
         self.regex = regex
         if self.regex is not None:
@@ -173,7 +188,7 @@ class String(ConfigType):
             return str_value
 
         # Check for case insensitive
-        choices: KeysView[str] | list[str]
+        choices: KeysView[str] | frozenset[str]
         if self.ignore_case:
             assert self.lower_case_choices is not None
             processed_value = str_value.lower()
@@ -184,12 +199,46 @@ class String(ConfigType):
         if processed_value in choices:
             return str_value
 
-        raise ValueError(
+        raise self._invalid_choice(str_value)
+
+    def _invalid_choice(self, str_value: str) -> ValueError:
+        assert self.choices is not None
+        return ValueError(
             'Valid values are [{}], but found {}'.format(
                 ', '.join([str(v) for v in self.choices]), repr(str_value)
             )
         )
 
+    def _compile(self) -> Callable[[Any], Any]:
+        if (
+            type(self).__call__ is not String.__call__
+            or self.quotes
+            or self.max_length > 0
+            or self.regex
+        ):
+            return self
+        if self.choices is None:
+            return str
+
+        ignore_case = self.ignore_case
+        # Check against the same containers as __call__ so that choices
+        # changed in place are still honored.
+        choices: Container[str]
+        if ignore_case:
+            assert self.lower_case_choices is not None
+            choices = self.lower_case_choices
+        else:
+            choices = self.choices
+        invalid_choice = self._invalid_choice
+
+        def convert(value: Any) -> str:
+            str_value = str(value)
+            if (str_value.lower() if ignore_case else str_value) in choices:
+                return str_value
+            raise invalid_choice(str_value)
+
+        return convert
+
     def __repr__(self) -> str:
         details = []
         if self.choices is not None:
@@ -261,18 +310,32 @@ class Boolean(ConfigType):
 
     def __init__(self, type_name: str = 'boolean value') -> None:
         super().__init__(type_name=type_name)
+        self._values = dict.fromkeys(self.FALSE_VALUES, False)
+        self._values.update(dict.fromkeys(self.TRUE_VALUES, True))
 
     def __call__(self, value: Any) -> bool:
         if isinstance(value, bool):
             return value
 
-        s = value.lower()
-        if s in self.TRUE_VALUES:
-            return True
-        elif s in self.FALSE_VALUES:
-            return False
-        else:
+        result = self._values.get(value.lower())
+        if result is None:
             raise ValueError(f'Unexpected boolean value {value!r}')
+        return result
+
+    def _compile(self) -> Callable[[Any], Any]:
+        if type(self).__call__ is not Boolean.__call__:
+            return self
+        values = self._values
+
+        def convert(value: Any) -> bool:
+            if isinstance(value, bool):
+                return value
+            result = values.get(value.lower())
+            if result is None:
+                raise ValueError(f'Unexpected boolean value {value!r}')
+            return result
+
+        return convert
 
     def __repr__(self) -> str:
         return 'Boolean'
@@ -363,6 +426,28 @@ class Number(ConfigType):
                 )
         return num_value
 
+    def _compile(self) -> Callable[[Any], Any]:
+        if (
+            type(self).__call__ is not Number.__call__
+            or self.choices is not None
+        ):
+            return self
+        num_type = self.num_type
+        min, max = self.min, self.max
+
+        def convert(value: Any) -> Any:
+            if not isinstance(value, num_type):
+                if str(value).strip() == '':
+                    return None
+                value = num_type(value)
+            if min is not None and value < min:
+                raise ValueError(f'Should be greater than or equal to {min:g}')
+            if max is not None and value > max:
+                raise ValueError(f'Should be less than or equal to {max:g}')
+            return value
+
+        return convert
+
     def __repr__(self) -> str:
         props = []
         if self.choices is not None:
@@ -502,6 +587,70 @@ class Port(Integer):
         )
 
 
+_ITEM_DELIMITERS = re.compile(r'[,()\[\]{}]')
+_NON_SPACE = re.compile(r'\S')
+_QUOTES_OR_BRACKETS = re.compile(r'[\'"()\[\]{}]')
+_OPENING_BRACKETS = {')': '(', ']': '[', '}': '{'}
+
+
+def _skip_quoted(value: str, pos: int) -> int:
+    """Return the position after a quoted string starting an item at *pos*.
+
+    Quotes are only significant at the start of an item; anywhere else they
+    are ordinary characters. If the item at *pos* is not quoted, *pos* is
+    returned unchanged.
+    """
+    first = _NON_SPACE.search(value, pos)
+    if first is not None and first.group() in '"\'':
+        end = value.find(first.group(), first.end())
+        if end == -1:
+            raise ValueError(f'Unterminated quote in {value!r}')
+        return end + 1
+    return pos
+
+
+def _split_items(
+    value: str, delimiters: re.Pattern[str] = _ITEM_DELIMITERS
+) -> list[str]:
+    """Split *value* on the commas that are not quoted or bracketed.
+
+    This is a single scan of *value*: commas inside an item enclosed in
+    single or double quotes, or inside a matching pair of ``()``, ``[]`` or
+    ``{}`` brackets, do not start a new item. Unterminated quotes and
+    unbalanced brackets are rejected.
+
+    *delimiters* may also match a key/value separator, in which case a
+    quoted string directly following the separator is skipped as well.
+    """
+    if _QUOTES_OR_BRACKETS.search(value) is None:
+        return value.split(',')
+    items = []
+    stack: list[str] = []
+    start = 0
+    pos = _skip_quoted(value, 0)
+    while True:
+        match = delimiters.search(value, pos)
+        if match is None:
+            break
+        char = match.group()
+        pos = match.end()
+        if char in _OPENING_BRACKETS:
+            if not stack or stack.pop() != _OPENING_BRACKETS[char]:
+                raise ValueError(f'Unbalanced "{char}" in {value!r}')
+            continue
+        if char == ',':
+            if not stack:
+                items.append(value[start : match.start()])
+                start = pos
+        elif char in ('(', '[', '{'):
+            stack.append(char)
+        pos = _skip_quoted(value, pos)
+    if stack:
+        raise ValueError(f'Unclosed "{stack[-1]}" in {value!r}')
+    items.append(value[start:])
+    return items
+
+
 class List(ConfigType):
     """List type.
 
@@ -513,10 +662,17 @@ class List(ConfigType):
     comma and next item until validation succeeds or there is no parts left.
     In the later case it will signal validation error.
 
+    With *strict* enabled the value is instead split in a single scan, and
+    each item is validated exactly once. A comma only separates items when it
+    is neither inside an item enclosed in quotes nor inside a pair of
+    ``()``, ``[]`` or ``{}`` brackets, and unterminated quotes or unbalanced
+    brackets are rejected.
+
     :param item_type: Type of list items. Should be an instance of
                       ``ConfigType``.
     :param bounds: if True, value should be inside "[" and "]" pair
     :param type_name: Type name to be used in the sample config file.
+    :param strict: if True, split items on unquoted, unbracketed commas only
 
     .. versionchanged:: 2.7
 
@@ -525,6 +681,10 @@ class List(ConfigType):
     .. versionchanged:: 10.3.0
 
        Added *min_length* parameter.
+
+    .. versionchanged:: 10.4.0
+
+       Added *strict* parameter.
     """
 
     item_type: 'ConfigType'
@@ -535,6 +695,7 @@ class List(ConfigType):
         bounds: bool = False,
         type_name: str = 'list value',
         min_length: int = 0,
+        strict: bool = False,
     ) -> None:
         super().__init__(type_name=type_name)
 
@@ -546,6 +707,7 @@ class List(ConfigType):
         self.item_type = item_type
         self.bounds = bounds
         self.min_length = min_length
+        self.strict = strict
 
     def __call__(self, value: Any) -> list[Any]:
         if isinstance(value, (list, tuple)):
@@ -558,12 +720,7 @@ class List(ConfigType):
             if not s.endswith(']'):
                 raise ValueError('Value should end with "]"')
             s = s[1:-1]
-        if s:
-            values = s.split(',')
-        else:
-            values = []
-
-        if not values:
+        if not s:
             if self.min_length > 0:
                 raise ValueError(
                     'Length should be greater than or equal to %g',
@@ -571,23 +728,11 @@ class List(ConfigType):
                 )
             return []
 
-        result: list[Any] = []
-        while values:
-            value = values.pop(0)
-            while True:
-                first_error = None
-                try:
-                    validated_value = self.item_type(value.strip())
-                    break
-                except ValueError as e:
-                    if not first_error:
-                        first_error = e
-                    if len(values) == 0:
-                        raise first_error
-
-                value += ',' + values.pop(0)
-
-            result.append(validated_value)
+        result: list[Any]
+        if self.strict:
+            result = [self.item_type(v.strip()) for v in _split_items(s)]
+        else:
+            result = self._join_and_convert(s.split(','))
 
         if self.min_length and len(result) < self.min_length:
             raise ValueError(
@@ -596,6 +741,25 @@ class List(ConfigType):
 
         return result
 
+    def _join_and_convert(self, values: list[str]) -> list[Any]:
+        result = []
+        count = len(values)
+        i = 0
+        while i < count:
+            value = values[i]
+            i += 1
+            while True:
+                try:
+                    validated_value = self.item_type(value.strip())
+                    break
+                except ValueError:
+                    if i == count:
+                        raise
+                value += ',' + values[i]
+                i += 1
+            result.append(validated_value)
+        return result
+
     def __repr__(self) -> str:
         return f'List of {repr(self.item_type)}'
 
@@ -632,6 +796,9 @@ class Range(ConfigType):
     .. versionadded:: 3.18
     """
 
+    _NUM = "0|-?[1-9][0-9]*"
+    _RANGE_REGEX = re.compile(f"^({_NUM})(?:-({_NUM}))?$")
+
     def __init__(
         self,
         min: int | None = None,
@@ -643,23 +810,24 @@ class Range(ConfigType):
         self.min = min
         self.max = max
         self.inclusive = inclusive
+        self._check_min = Integer(min=min)
+        self._check_max = Integer(max=max)
 
     def __call__(self, value: Any) -> range:
         value = str(value)
-        num = "0|-?[1-9][0-9]*"
-        m = re.match(f"^({num})(?:-({num}))?$", value)
+        m = self._RANGE_REGEX.match(value)
         if not m:
             raise ValueError(f'Invalid Range: {value}')
         left = int(m.group(1))
         right = int(left if m.group(2) is None else m.group(2))
 
         if left < right:
-            left = cast(int, Integer(min=self.min)(left))
-            right = cast(int, Integer(max=self.max)(right))
+            left = cast(int, self._check_min(left))
+            right = cast(int, self._check_max(right))
             step = 1
         else:
-            left = cast(int, Integer(max=self.max)(left))
-            right = cast(int, Integer(min=self.min)(right))
+            left = cast(int, self._check_max(left))
+            right = cast(int, self._check_min(right))
             step = -1
         if self.inclusive:
             right += step
@@ -686,9 +854,17 @@ class Dict(ConfigType):
     Type of dictionary key is always string, but dictionary value
     type can be customized.
 
+    Like :class:`List`, if a value fails validation the next comma separated
+    part is appended to it until validation succeeds. With *strict* enabled,
+    pairs are only separated by commas which are neither quoted nor
+    bracketed, and each value is validated exactly once.
+
     :param value_type: type of values in dictionary
     :param bounds: if True, value should be inside "{" and "}" pair
     :param type_name: Type name to be used in the sample config file.
+    :param key_value_separator: the separator between keys and values
+    :param min_length: the minimum number of pairs
+    :param strict: if True, split pairs on unquoted, unbracketed commas only
 
     .. versionchanged:: 2.7
 
@@ -701,6 +877,10 @@ class Dict(ConfigType):
     .. versionchanged:: 10.2.0
 
        Added *min_length* parameter.
+
+    .. versionchanged:: 10.4.0
+
+       Added *strict* parameter.
     """
 
     def __init__(
@@ -710,6 +890,7 @@ class Dict(ConfigType):
         type_name: str = 'dict value',
         key_value_separator: str = ':',
         min_length: int = 0,
+        strict: bool = False,
     ) -> None:
         super().__init__(type_name=type_name)
 
@@ -726,6 +907,10 @@ class Dict(ConfigType):
         self.bounds = bounds
         self.key_value_separator = key_value_separator
         self.min_length = min_length
+        self.strict = strict
+        self._delimiters = re.compile(
+            re.escape(key_value_separator) + '|' + _ITEM_DELIMITERS.pattern
+        )
 
     def __call__(self, value: Any) -> dict[str, Any]:
         if isinstance(value, dict):
@@ -749,43 +934,11 @@ class Dict(ConfigType):
                 )
             return result
 
-        pairs = s.split(',')
-        while pairs:
-            pair = pairs.pop(0)
-
-            while True:
-                first_error = None
-                try:
-                    key_value = pair.split(self.key_value_separator, 1)
-
-                    if len(key_value) < 2:
-                        raise ValueError(
-                            f'Value should be '
-                            f'NAME{self.key_value_separator}VALUE pairs '
-                            'separated by ","'
-                        )
-
-                    key, value = key_value
-                    key = key.strip()
-                    value = value.strip()
-
-                    value = self.value_type(value)
-                    break
-                except ValueError as e:
-                    if not first_error:
-                        first_error = e
-                    if not pairs:
-                        raise first_error
-
-                pair += ',' + pairs.pop(0)
-
-            if key == '':
-                raise ValueError('Key name should not be empty')
-
-            if key in result:
-                raise ValueError(f'Duplicate key {key}')
-
-            result[key] = value
+        if self.strict:
+            for key, value in self._split_pairs(s):
+                self._add_pair(result, key, self.value_type(value))
+        else:
+            self._join_and_convert(s, result)
 
         if self.min_length and len(result) < self.min_length:
             raise ValueError(
@@ -794,6 +947,63 @@ class Dict(ConfigType):
 
         return result
 
+    def _invalid_pair(self) -> ValueError:
+        return ValueError(
+            f'Value should be NAME{self.key_value_separator}VALUE pairs '
+            'separated by ","'
+        )
+
+    def _add_pair(self, result: dict[str, Any], key: str, value: Any) -> None:
+        if key == '':
+            raise ValueError('Key name should not be empty')
+
+        if key in result:
+            raise ValueError(f'Duplicate key {key}')
+
+        result[key] = value
+
+    def _split_pairs(self, s: str) -> Iterator[tuple[str, str]]:
+        for pair in _split_items(s, self._delimiters):
+            key, sep, value = pair.partition(self.key_value_separator)
+            if not sep:
+                raise self._invalid_pair()
+            yield key.strip(), value.strip()
+
+    def _join_and_convert(self, s: str, result: dict[str, Any]) -> None:
+        # Scan *s* once, tracking the current pair by its offsets. A pair
+        # which has no separator yet is extended up to the first separator;
+        # a value which fails validation is extended one comma separated
+        # part at a time, as it would be by rejoining s.split(',').
+        sep = self.key_value_separator
+        length = len(s)
+        start = 0
+        while True:
+            sep_start = s.find(sep, start)
+            if sep_start == -1:
+                raise self._invalid_pair()
+            value_start = sep_start + len(sep)
+            end = s.find(',', start)
+            while end != -1 and end < value_start:
+                end = s.find(',', end + 1)
+            if end == -1:
+                end = length
+
+            while True:
+                try:
+                    value = self.value_type(s[value_start:end].strip())
+                    break
+                except ValueError:
+                    if end == length:
+                        raise
+                end = s.find(',', end + 1)
+                if end == -1:
+                    end = length
+
+            self._add_pair(result, s[start:sep_start].strip(), value)
+            if end == length:
+                return
+            start = end + 1
+
     def __repr__(self) -> str:
         return f'Dict of {repr(self.value_type)}'
 
@@ -841,6 +1051,11 @@ class IPAddress(ConfigType):
         if version_checker is None:
             raise TypeError(f"{version} is not a valid IP version.")
         self.version_checker = version_checker
+        self._is_valid: Callable[[str], bool] = {
+            None: self._is_ipv4_or_ipv6,
+            4: self._is_ipv4,
+            6: self._is_ipv6,
+        }[version]
 
     def __call__(self, value: Any) -> str:
         str_value: str = str(value)
@@ -855,25 +1070,59 @@ class IPAddress(ConfigType):
     def __eq__(self, other: object) -> bool:
         return self.__class__ == other.__class__
 
+    # Only these characters can appear in an address accepted by
+    # inet_pton(), which lets host names be rejected without calling into
+    # netaddr.
+    _ADDRESS_CHARS = re.compile('[0-9a-fA-F.:]+')
+
+    @classmethod
+    def _is_ipv4(cls, address: str) -> bool:
+        if not cls._ADDRESS_CHARS.fullmatch(address):
+            return False
+        import netaddr
+
+        return bool(netaddr.valid_ipv4(address, netaddr.core.INET_PTON))
+
+    @classmethod
+    def _is_ipv6(cls, address: str) -> bool:
+        if not cls._ADDRESS_CHARS.fullmatch(address):
+            return False
+        import netaddr
+
+        return bool(netaddr.valid_ipv6(address, netaddr.core.INET_PTON))
+
+    @classmethod
+    def _is_ipv4_or_ipv6(cls, address: str) -> bool:
+        if not cls._ADDRESS_CHARS.fullmatch(address):
+            return False
+        import netaddr
+
+        return bool(
+            netaddr.valid_ipv4(address, netaddr.core.INET_PTON)
+            or netaddr.valid_ipv6(address, netaddr.core.INET_PTON)
+        )
+
     def _check_ipv4(self, address: str) -> None:
-        if not netaddr.valid_ipv4(address, netaddr.core.INET_PTON):
+        if not self._is_ipv4(address):
             raise ValueError(f"{address} is not an IPv4 address")
 
     def _check_ipv6(self, address: str) -> None:
-        if not netaddr.valid_ipv6(address, netaddr.core.INET_PTON):
+        if not self._is_ipv6(address):
             raise ValueError(f"{address} is not an IPv6 address")
 
     def _check_both_versions(self, address: str) -> None:
-        if not (
-            netaddr.valid_ipv4(address, netaddr.core.INET_PTON)
-            or netaddr.valid_ipv6(address, netaddr.core.INET_PTON)
-        ):
+        if not self._is_ipv4_or_ipv6(address):
             raise ValueError(f"{address} is not IPv4 or IPv6 address")
 
     def _formatter(self, value: Any) -> str:
         return cast(str, value)
 
 
+@functools.cache
+def _compile_label_regex(regex: str) -> re.Pattern[str]:
+    return re.compile(regex, re.IGNORECASE)
+
+
 class Hostname(ConfigType):
     """Host domain name type.
 
@@ -887,6 +1136,8 @@ class Hostname(ConfigType):
 
     HOSTNAME_REGEX = '(?!-)[A-Z0-9-]{1,63}(?<!-)$'
 
+    _TLD_REGEX = re.compile('[a-zA-Z-]')
+
     def __init__(self, type_name: str = 'hostname value') -> None:
         super().__init__(type_name=type_name)
 
@@ -906,25 +1157,33 @@ class Hostname(ConfigType):
         https://www.ietf.org/rfc/rfc1912, and
         https://tools.ietf.org/html/rfc1123
         """
+        hostname, error = self._check(value, regex)
+        if error is not None:
+            raise ValueError(error)
+        return hostname
 
+    def _check(self, value: str, regex: str) -> tuple[str, str | None]:
+        """Validate a hostname without raising.
+
+        :returns: the hostname without any trailing dot, and None or a
+                  message explaining why the hostname is invalid
+        """
         if len(value) == 0:
-            raise ValueError("Cannot have an empty hostname")
+            return value, "Cannot have an empty hostname"
         if len(value) > 253:
-            raise ValueError(
-                f"hostname is greater than 253 characters: {value}"
-            )
+            return value, f"hostname is greater than 253 characters: {value}"
         if value.endswith("."):
             value = value[:-1]
-        allowed = re.compile(regex, re.IGNORECASE)
-        if not re.search('[a-zA-Z-]', value.split(".")[-1]):
-            raise ValueError(
+        labels = value.split(".")
+        if not self._TLD_REGEX.search(labels[-1]):
+            return value, (
                 f'{value} contains no non-numeric characters in the '
                 'top-level domain part of the host name and is '
                 'invalid'
             )
-        if any((not allowed.match(x)) for x in value.split(".")):
-            raise ValueError(f"{value} is an invalid hostname")
-        return cast(str, value)
+        if not all(map(_compile_label_regex(regex).match, labels)):
+            return value, f"{value} is an invalid hostname"
+        return value, None
 
     def __repr__(self) -> str:
         return 'Hostname'
@@ -949,6 +1208,8 @@ class HostAddress(ConfigType):
     :param type_name: Type name to be used in the sample config file.
     """
 
+    _HOSTNAME_REGEX = Hostname.HOSTNAME_REGEX
+
     def __init__(
         self,
         version: int | None = None,
@@ -967,15 +1228,13 @@ class HostAddress(ConfigType):
         performing checks for it as a hostname.
 
         """
-
-        try:
-            value = self.ip_address(value)
-        except ValueError:
-            try:
-                value = self.hostname(value)
-            except ValueError:
-                raise ValueError(f"{value} is not a valid host address")
-        return cast(str, value)
+        str_value = str(value)
+        if str_value and self.ip_address._is_valid(str_value):
+            return str_value
+        hostname, error = self.hostname._check(value, self._HOSTNAME_REGEX)
+        if error is not None:
+            raise ValueError(f"{value} is not a valid host address")
+        return hostname
 
     def __repr__(self) -> str:
         return 'HostAddress'
@@ -998,8 +1257,16 @@ class HostDomain(HostAddress):
     """
 
     # DOMAIN_REGEX is HOSTNAME_REGEX with the _ character added
+    # Check if domain is valid
+    # Add support of underscore
+    # https://www.ietf.org/rfc/rfc1912,
+    # http://domainkeys.sourceforge.net/underscore.html
+    # https://bugs.launchpad.net/oslo.config/+bug/1892044
     DOMAIN_REGEX = '(?!-)[A-Z0-9-_]{1,63}(?<!-)$'
 
+    # DOMAIN_REGEX accepts every name HOSTNAME_REGEX does.
+    _HOSTNAME_REGEX = DOMAIN_REGEX
+
     def __init__(
         self,
         version: int | None = None,
@@ -1009,28 +1276,6 @@ class HostDomain(HostAddress):
 
         super().__init__(version=version, type_name=type_name)
 
-    def __call__(self, value: Any) -> str:
-        """Checks if is a valid IP/hostname.
-
-        If not a valid IP, makes sure it is not a mistyped IP before
-        performing checks for it as a hostname.
-
-        """
-
-        try:
-            value = super().__call__(value)
-        except ValueError:
-            # Check if domain is valid
-            # Add support of underscore
-            # https://www.ietf.org/rfc/rfc1912,
-            # http://domainkeys.sourceforge.net/underscore.html
-            # https://bugs.launchpad.net/oslo.config/+bug/1892044
-            try:
-                value = self.hostname(value, regex=self.DOMAIN_REGEX)
-            except ValueError:
-                raise ValueError(f"{value} is not a valid host address")
-        return cast(str, value)
-
     def __repr__(self) -> str:
         return 'HostDomain'
 
@@ -1053,6 +1298,9 @@ class URI(ConfigType):
        Added *schemes* parameter.
     """
 
+    # The number of recently validated URIs remembered by each instance.
+    VALIDATED_CACHE_SIZE: int = 256
+
     def __init__(
         self,
         max_length: int | None = None,
@@ -1063,26 +1311,20 @@ class URI(ConfigType):
         self.max_length = max_length
         self.schemes = schemes
 
+        # Built on first use, see _get_validator().
+        self._validator: rfc3986.validators.Validator | None = None
+        self._validated: dict[str, None] = {}
+
     def __call__(self, value: Any) -> str:
-        uri = rfc3986.uri_reference(value)
-        validator = (
-            rfc3986.validators.Validator()
-            .require_presence_of(
-                'scheme',
-                'host',
-            )
-            .check_validity_of(
-                'scheme',
-                'host',
-                'path',
-            )
-        )
-        if self.schemes:
-            validator = validator.allow_schemes(*self.schemes)
-        try:
-            validator.validate(uri)
-        except rfc3986.exceptions.RFC3986Exception as exc:
-            raise ValueError(exc)
+        if value not in self._validated:
+            import rfc3986
+
+            uri = rfc3986.uri_reference(value)
+            try:
+                self._get_validator().validate(uri)
+            except rfc3986.exceptions.RFC3986Exception as exc:
+                raise ValueError(exc)
+            self._remember(value)
 
         if self.max_length is not None and len(value) > self.max_length:
             raise ValueError(
@@ -1091,6 +1333,38 @@ class URI(ConfigType):
 
         return cast(str, value)
 
+    def _get_validator(self) -> 'rfc3986.validators.Validator':
+        if self._validator is None:
+            import rfc3986
+
+            validator = (
+                rfc3986.validators.Validator()
+                .require_presence_of(
+                    'scheme',
+                    'host',
+                )
+                .check_validity_of(
+                    'scheme',
+                    'host',
+                    'path',
+                )
+            )
+            if self.schemes:
+                validator = validator.allow_schemes(*self.schemes)
+            self._validator = validator
+        return self._validator
+
+    def _remember(self, value: str) -> None:
+        """Remember a valid URI, evicting the oldest one when full."""
+        validated = self._validated
+        validated[value] = None
+        if len(validated) > self.VALIDATED_CACHE_SIZE:
+            try:
+                del validated[next(iter(validated))]
+            except (KeyError, RuntimeError, StopIteration):
+                # Another thread got there first.
+                pass
+
     def __repr__(self) -> str:
         return 'URI'
 
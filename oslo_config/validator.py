@@ -205,8 +205,20 @@ def load_opt_data(conf: cfg.ConfigOpts) -> dict[str, Any]:
 
 def _validate(conf: cfg.ConfigOpts) -> int:
     conf.register_opts(_validator_opts)
+    errors = False
     if conf.namespace:
-        groups = generator._get_groups(generator._list_opts(conf.namespace))
+        opts = generator._list_opts(conf.namespace)
+        try:
+            cfg.check_default_values(
+                opt
+                for namespace, groups in opts
+                for group, group_opts in groups
+                for opt in group_opts
+            )
+        except cfg.DefaultValueError as e:
+            LOG.error('%s', e)
+            errors = True
+        groups = generator._get_groups(opts)
         opt_data = generator._generate_machine_readable_data(groups, conf)
     elif conf.opt_data:
         opt_data = load_opt_data(conf)
@@ -217,7 +229,6 @@ def _validate(conf: cfg.ConfigOpts) -> int:
     parser = cfg.ConfigParser(conf.input_file, sections)
     parser.parse()
     warnings = False
-    errors = False
     if conf.check_defaults:
         warnings = _validate_defaults(sections, opt_data, conf)
     for section, options in sections.items():